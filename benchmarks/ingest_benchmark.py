@@ -0,0 +1,76 @@
+"""
+Micro-benchmark for statement ingestion: parses a synthetic Discover export with
+plain per-row strptime and with the memoizing DateParser, and reports the speedup.
+
+Usage:
+    python benchmarks/ingest_benchmark.py [rows]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from budgeting.bank_schemas import DISCOVER
+from budgeting.csv_ingestion import DateParser, ingest_statement
+
+CATEGORIES = ['Supermarkets', 'Restaurants', 'Gasoline', 'Merchandise', 'Services', 'Travel/ Entertainment']
+
+
+def write_synthetic_discover_csv(path, rows, seed=0):
+    """
+    Writes a Discover-style export with `rows` transactions spread over five years.
+
+    Args:
+        path (str): Destination file path.
+        rows (int): Number of transactions to write.
+        seed (int): Random seed for reproducible output.
+    """
+    rng = random.Random(seed)
+    start = date(2019, 1, 1)
+    with open(path, 'w', newline='') as f:
+        f.write('Trans. Date,Post Date,Description,Amount,Category\n')
+        for _ in range(rows):
+            trans_date = start + timedelta(days=rng.randrange(5 * 365))
+            post_date = trans_date + timedelta(days=1)
+            f.write(f'{trans_date:%m/%d/%Y},{post_date:%m/%d/%Y},"STORE #{rng.randrange(1000)}",'
+                    f'{rng.uniform(-20, 200):.2f},{rng.choice(CATEGORIES)}\n')
+
+
+def strptime_per_row(text):
+    """Baseline parser: one datetime.strptime call per row."""
+    return datetime.strptime(text, '%m/%d/%Y').toordinal()
+
+
+def time_ingest(path, date_parser):
+    """
+    Returns:
+        tuple[float, int]: Seconds taken and number of rows loaded.
+    """
+    with open(path, 'r', newline='') as f:
+        started = time.perf_counter()
+        result = ingest_statement(f, DISCOVER, date_parser=date_parser)
+        return time.perf_counter() - started, len(result.store)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'synthetic_discover.csv')
+        print(f"Writing {rows:,} synthetic rows...")
+        write_synthetic_discover_csv(path, rows)
+
+        baseline, loaded = time_ingest(path, strptime_per_row)
+        cached, cached_loaded = time_ingest(path, DateParser())
+        assert loaded == cached_loaded
+
+        print(f"strptime per row:   {baseline:7.2f}s")
+        print(f"memoized parser:    {cached:7.2f}s")
+        print(f"speedup:            {baseline / cached:7.1f}x ({loaded:,} transactions loaded)")
+
+
+if __name__ == '__main__':
+    main()
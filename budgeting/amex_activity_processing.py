@@ -0,0 +1,13 @@
+from .bank_schemas import AMEX
+from .schema_activity_processing import SchemaActProc
+
+
+class AmexActProc(SchemaActProc):
+    """
+    Processes American Express CSV exports.
+
+    Basic exports without a Category column load every row as "Uncategorized".
+    Attributes are the same as DiscoverActProc.
+    """
+
+    SCHEMA = AMEX
@@ -0,0 +1,175 @@
+from collections import OrderedDict
+import threading
+from types import MappingProxyType
+import numpy as np
+from .transaction_store import from_ordinal
+
+# Rough per-entry overhead of the dict views, used to estimate result size.
+_DICT_ENTRY_BYTES = 200
+
+
+class AnalysisResult:
+    """
+    Immutable outcome of analyzing one processor over one date window.
+
+    Attributes:
+        start_date (datetime): Analysis start date.
+        end_date (datetime): Analysis end date.
+        aggregate (WeeklyAggregate): The underlying weekly matrices (read-only arrays).
+        weekly_spending (Mapping): Week start date -> total spending for that week.
+        weekly_spending_by_category (Mapping): Week start date -> {category: spending}.
+        category_series (Mapping): Category -> {week start date: spending}.
+        max_spending_week (tuple or None): The week with the highest spending.
+        min_spending_week (tuple or None): The week ending on a Sunday with the lowest spending.
+        average_spending (float): Average spending per week.
+        average_spending_by_category (Mapping): Category -> average spending over weeks it was active.
+        nbytes (int): Approximate memory footprint, used for cache accounting.
+    """
+
+    __slots__ = (
+        'start_date', 'end_date', 'aggregate', 'weekly_spending', 'weekly_spending_by_category',
+        'category_series', 'max_spending_week', 'min_spending_week', 'average_spending',
+        'average_spending_by_category', 'nbytes',
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError("AnalysisResult is immutable")
+
+    @classmethod
+    def from_aggregate(cls, aggregate, start_date, end_date):
+        """
+        Builds the dict-shaped views the UI consumes from a weekly aggregate.
+
+        Args:
+            aggregate (WeeklyAggregate): Output of aggregate_weekly for the window.
+            start_date (datetime): Analysis start date; used as the key of the first week.
+            end_date (datetime): Analysis end date.
+
+        Returns:
+            AnalysisResult: The frozen result.
+        """
+        for array in (aggregate.weekly_totals, aggregate.category_totals, aggregate.category_counts):
+            array.flags.writeable = False
+
+        week_starts = [from_ordinal(day) for day in aggregate.week_start_days()]
+        if week_starts:
+            week_starts[0] = start_date
+
+        categories = aggregate.categories
+        weekly_totals = aggregate.weekly_totals.tolist()
+        weekly_spending = dict(zip(week_starts, weekly_totals))
+        weekly_spending_by_category = {week_start: {} for week_start in week_starts}
+        category_series = {}
+
+        active_weeks, active_codes = np.nonzero(aggregate.category_counts)
+        cell_totals = aggregate.category_totals[active_weeks, active_codes].tolist()
+        for week, code, amount in zip(active_weeks.tolist(), active_codes.tolist(), cell_totals):
+            category = categories[code]
+            week_start = week_starts[week]
+            weekly_spending_by_category[week_start][category] = amount
+            category_series.setdefault(category, {})[week_start] = amount
+
+        max_week = aggregate.max_week()
+        min_week = aggregate.min_full_week()
+        nbytes = (
+            aggregate.weekly_totals.nbytes + aggregate.category_totals.nbytes + aggregate.category_counts.nbytes
+            + _DICT_ENTRY_BYTES * (2 * len(week_starts) + 2 * len(cell_totals))
+        )
+        return cls(
+            start_date=start_date,
+            end_date=end_date,
+            aggregate=aggregate,
+            weekly_spending=MappingProxyType(weekly_spending),
+            weekly_spending_by_category=MappingProxyType(
+                {week: MappingProxyType(totals) for week, totals in weekly_spending_by_category.items()}
+            ),
+            category_series=MappingProxyType(
+                {category: MappingProxyType(series) for category, series in category_series.items()}
+            ),
+            max_spending_week=(week_starts[max_week], weekly_totals[max_week]) if max_week is not None else None,
+            min_spending_week=(week_starts[min_week], weekly_totals[min_week]) if min_week is not None else None,
+            average_spending=aggregate.average_weekly_spending(),
+            average_spending_by_category=MappingProxyType(aggregate.average_spending_by_category()),
+            nbytes=nbytes,
+        )
+
+
+class AnalysisCache:
+    """
+    Least-recently-used cache of AnalysisResult objects bounded by an approximate memory cap.
+
+    Keys are (processor content hash, start date, end date, category-group version),
+    so identical inputs always map to the same immutable result. Lookups and
+    inserts are guarded by a lock, so analysis workers can share the cache.
+
+    Attributes:
+        max_bytes (int): Memory budget; least recently used entries are evicted beyond it.
+        current_bytes (int): Estimated size of the cached results.
+        hits (int): Number of successful lookups.
+        misses (int): Number of failed lookups.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        """
+        Args:
+            max_bytes (int): Approximate memory cap for cached results. Defaults to 64 MiB.
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """
+        Looks up a result and marks it as most recently used.
+
+        Args:
+            key (tuple): The cache key.
+
+        Returns:
+            AnalysisResult or None: The cached result, if present.
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, result):
+        """
+        Stores a result, evicting least recently used entries to stay under the memory cap.
+
+        Args:
+            key (tuple): The cache key.
+            result (AnalysisResult): The result to cache.
+        """
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous.nbytes
+            self._entries[key] = result
+            self.current_bytes += result.nbytes
+            while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+
+    def clear(self):
+        """Removes every cached result."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
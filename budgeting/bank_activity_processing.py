@@ -1,18 +1,50 @@
-import csv
-from datetime import datetime, timedelta
+import os
+import numpy as np
+from .csv_ingestion import hash_file_prefix, merge_ingest_results
+from .transaction_store import TransactionStore, from_ordinal, to_ordinal
+from .weekly_aggregation import aggregate_weekly, extend_weekly
+from .analysis_cache import AnalysisResult
+
+
+class StatementUpdate:
+    """
+    Changes to a statement file, read by BankActProc.read_refresh and installed
+    by BankActProc.apply_refresh.
+
+    Attributes:
+        base (IngestResult or None): The processor's parse the update was read against.
+        result (IngestResult): The whole file's parse after the update, with the source
+            position it covers.
+        appended (IngestResult or None): Just the appended rows, or None if the file was fully re-parsed.
+    """
+
+    def __init__(self, base, result, appended):
+        self.base = base
+        self.result = result
+        self.appended = appended
+
 
 class BankActProc:
     """
     Abstract base class for processing and analyzing bank transaction data.
-    Subclasses must implement _open_file to parse their specific CSV format.
+    Subclasses must implement _open_file to parse their specific CSV format,
+    and parse_file and _parse_appended to support refresh().
     """
 
-    def __init__(self, file_name, bls_comparator=None):
+    def __init__(self, file_name, bls_comparator=None, ingest_result=None):
+        """
+        Args:
+            file_name (str): Path to the statement file.
+            bls_comparator (optional): An object for comparing spending with BLS data.
+            ingest_result (IngestResult, optional): Already parsed contents of the file
+                (e.g., from a worker process); when given, the file is not re-read.
+        """
         self.file_name = file_name
         self.bls_comparator = bls_comparator
         self.earliest_year = float('inf')
         self.latest_year = float('-inf')
-        self.transactions_dict = {}
+        self.store = TransactionStore.empty()
+        self._transactions_dict = None
         self.weekly_spending = {}
         self.weekly_spending_by_category = {}
         self.category_series = {}
@@ -22,80 +54,378 @@ class BankActProc:
         self.end_date = None
         self.average_spending = 0
         self.average_spending_by_category = {}
+        self.analysis = None
 
-        self._open_file()
+        self.diagnostics = None
+        self.ingest_result = None
+        self.parsed_bytes = None
+        self._prefix_checksum = None
+        self._ends_with_newline = True
+        self._keep_mask = None
+        self.duplicates_dropped = 0
+
+        if ingest_result is None:
+            self._open_file()
+        else:
+            self._load_ingest_result(ingest_result)
 
     def _open_file(self):
         """
         Abstract method to open and parse the CSV file.
-        Should populate self.transactions_dict and set earliest/latest year.
+        Should populate self.store and set earliest/latest year.
         """
         raise NotImplementedError("Subclasses must implement _open_file()")
 
-    def analyze_spending(self, start_date=None, end_date=None):
-        all_dates = sorted(self.transactions_dict.keys())
-        if not all_dates:
+    @classmethod
+    def parse_file(cls, file_name, on_chunk=None):
+        """
+        Abstract method to parse a statement file without constructing a processor.
+
+        Returns:
+            IngestResult: The parsed store, date range and diagnostics.
+        """
+        raise NotImplementedError("Subclasses must implement parse_file()")
+
+    def _load_ingest_result(self, result):
+        """
+        Adopts parsed statement data as this processor's transactions.
+
+        The result's source_position, describing exactly the bytes it was parsed
+        from, is where refresh() resumes; a result without one is fully re-parsed
+        on the next refresh.
+
+        Args:
+            result (IngestResult): The parsed store, date range, diagnostics and source position.
+        """
+        self.ingest_result = result
+        self.store = result.store
+        self._transactions_dict = None
+        self.earliest_year = result.earliest_year
+        self.latest_year = result.latest_year
+        self.diagnostics = result.diagnostics
+        self._keep_mask = None
+        self.duplicates_dropped = 0
+        if result.source_position is None:
+            self.parsed_bytes = None
+            self._prefix_checksum = None
+        else:
+            self.parsed_bytes, self._prefix_checksum, self._ends_with_newline = result.source_position
+
+    @property
+    def source_store(self):
+        """
+        TransactionStore: Every parsed transaction of the file, before duplicates
+        of other statements are excluded.
+        """
+        return self.ingest_result.store if self.ingest_result is not None else self.store
+
+    def exclude_duplicates(self, keep):
+        """
+        Restricts the processor to the rows kept by cross-statement de-duplication
+        (see find_duplicates), rebuilding the view only when the mask changed.
+
+        Args:
+            keep (np.ndarray or None): Boolean mask over source_store rows; None keeps every row.
+        """
+        if not self.view_matches(keep):
+            self.set_view(keep, self.duplicate_view(keep))
+
+    def view_matches(self, keep):
+        """
+        Args:
+            keep (np.ndarray or None): Boolean mask over source_store rows; None keeps every row.
+
+        Returns:
+            bool: True if the processor already shows exactly the rows selected by `keep`.
+        """
+        if keep is None or self._keep_mask is None:
+            return keep is None and self._keep_mask is None
+        return np.array_equal(keep, self._keep_mask)
+
+    def duplicate_view(self, keep):
+        """
+        Builds the store for a de-duplication mask without changing the processor,
+        so the work can run off the GUI thread.
+
+        Args:
+            keep (np.ndarray or None): Boolean mask over source_store rows; None keeps every row.
+
+        Returns:
+            TransactionStore: The filtered store.
+        """
+        source = self.source_store
+        return source if keep is None else source.take(keep)
+
+    def set_view(self, keep, store):
+        """
+        Installs a view built by duplicate_view.
+
+        Args:
+            keep (np.ndarray or None): The mask the view was built from.
+            store (TransactionStore): The filtered store.
+        """
+        self.store = store
+        self._keep_mask = keep
+        self.duplicates_dropped = 0 if keep is None else int(keep.size - np.count_nonzero(keep))
+        self._transactions_dict = None
+
+    def _parse_appended(self, data):
+        """
+        Abstract method to parse records appended to the file since the last parse.
+
+        Args:
+            data (bytes): Complete CSV records (no header).
+
+        Returns:
+            IngestResult: The parsed rows, with diagnostics row numbers counted from 2
+            (merge_ingest_results shifts them past the records parsed earlier).
+        """
+        raise NotImplementedError("Subclasses must implement _parse_appended()")
+
+    def _read_appended(self):
+        """
+        Reads the complete records appended since the last parse.
+
+        Returns:
+            tuple or None: The appended records (possibly empty) and the source position
+            after them; None when the previously parsed part of the file changed and a
+            full re-parse is needed.
+        """
+        if self.parsed_bytes is None:
+            return None
+        try:
+            with open(self.file_name, 'rb') as file:
+                size = file.seek(0, os.SEEK_END)
+                if size < self.parsed_bytes:
+                    return None
+                digest, _ = hash_file_prefix(file, self.parsed_bytes)
+                if digest.hexdigest() != self._prefix_checksum:
+                    return None
+                data = file.read(size - self.parsed_bytes)
+        except OSError:
+            return None
+        if data and not self._ends_with_newline and not data.startswith((b'\n', b'\r')):
+            # The last parsed line had no newline and has since been continued.
+            return None
+        # A final line without a newline may still be mid-write, so stop at the last complete line.
+        data = data[:data.rfind(b'\n') + 1]
+        if not data:
+            return data, (self.parsed_bytes, self._prefix_checksum, self._ends_with_newline)
+        digest.update(data)
+        return data, (self.parsed_bytes + len(data), digest.hexdigest(), True)
+
+    def refresh(self, cache=None, group_version=0):
+        """
+        Picks up transactions appended to the statement file since it was parsed.
+
+        Equivalent to apply_refresh(read_refresh()); the GUI runs the two steps on
+        different threads.
+
+        Args:
+            cache (AnalysisCache, optional): Receives the updated analysis result.
+            group_version (int, optional): Version of the category grouping, part of the cache key.
+
+        Returns:
+            int: Number of transactions added, or -1 if the file was fully re-parsed.
+        """
+        return self.apply_refresh(self.read_refresh(), cache=cache, group_version=group_version)
+
+    def read_refresh(self, on_chunk=None):
+        """
+        Reads and parses what changed in the statement file without changing the
+        processor, so the work can run off the GUI thread.
+
+        Only the new tail of the file is parsed. If the previously parsed part of
+        the file changed (rewritten, truncated or edited anywhere, as detected by
+        a checksum of the parsed bytes), the whole file is parsed again instead.
+
+        Args:
+            on_chunk (callable, optional): Progress callback of a full re-parse, as for parse_file.
+
+        Returns:
+            StatementUpdate or None: The update for apply_refresh, or None if nothing was appended.
+        """
+        base = self.ingest_result
+        appended = self._read_appended()
+        if appended is None:
+            return StatementUpdate(base, self.parse_file(self.file_name, on_chunk=on_chunk), None)
+        data, position = appended
+        if not data:
+            return None
+        rows = self._parse_appended(data)
+        result = merge_ingest_results([base, rows])
+        result.source_position = position
+        return StatementUpdate(base, result, rows)
+
+    def apply_refresh(self, update, cache=None, group_version=0):
+        """
+        Installs an update read by read_refresh.
+
+        After appended rows, the latest analysis is updated incrementally,
+        re-bucketing only the weeks on or after the earliest new transaction; an
+        analysis that ran up to the last transaction is extended to cover the new
+        ones. After a full re-parse, or when the processor excludes duplicates of
+        other statements, the analysis is left as it was and the caller must re-run
+        de-duplication and analyze_spending.
+
+        Args:
+            update (StatementUpdate or None): The update, or None if nothing changed.
+            cache (AnalysisCache, optional): Receives the updated analysis result, so a
+                following analyze_spending over the same window is a cache hit.
+            group_version (int, optional): Version of the category grouping, part of the cache key.
+
+        Returns:
+            int: Number of transactions added, or -1 if the file was fully re-parsed.
+
+        Raises:
+            ValueError: If the processor was reloaded since the update was read.
+        """
+        if update is None:
+            return 0
+        if update.base is not self.ingest_result:
+            raise ValueError(f"{self.file_name} changed since the refresh was read")
+        if update.appended is None:
+            self._load_ingest_result(update.result)
+            return -1
+
+        previous_max_day = self.store.max_day
+        keep = self._keep_mask
+        self._load_ingest_result(update.result)
+        added = len(update.appended.store)
+        if not added:
+            self.exclude_duplicates(keep)
+            return 0
+        if keep is not None:
+            return added
+
+        since_day = update.appended.store.min_day
+        if self.analysis is not None:
+            end_day = to_ordinal(self.end_date)
+            if end_day == previous_max_day:
+                end_day = max(end_day, self.store.max_day)
+            end_date = from_ordinal(end_day)
+            aggregate = extend_weekly(self.analysis.aggregate, self.store, end_day, since_day)
+            result = AnalysisResult.from_aggregate(aggregate, self.start_date, end_date)
+            if cache is not None:
+                cache.put((self.store.content_hash(), self.start_date, end_date, group_version), result)
+            self.apply_analysis(result)
+        return added
+
+    @property
+    def transactions_dict(self):
+        """
+        Legacy view of the transaction store, built lazily on first access.
+
+        Returns:
+            dict: A mapping of transaction dates to a list of (category, amount) tuples.
+        """
+        if self._transactions_dict is None:
+            self._transactions_dict = self.store.to_dict()
+        return self._transactions_dict
+
+    def analyze_spending(self, start_date=None, end_date=None, cache=None, group_version=0):
+        """
+        Analyzes weekly spending patterns between start and end dates.
+
+        Computes:
+            - Total and average weekly spending.
+            - Weekly spending by category.
+            - Time series per category.
+            - Weeks with maximum and minimum spending.
+
+        Each run replaces the previous results rather than adding to them. When a cache
+        is given, results are looked up by (content hash, start, end, group version) and
+        only computed on a miss.
+
+        If a BLS comparator is provided, estimates a baseline average from comparable BLS categories.
+
+        Args:
+            start_date (datetime, optional): Start date for analysis. Defaults to earliest transaction date.
+            end_date (datetime, optional): End date for analysis. Defaults to latest transaction date.
+            cache (AnalysisCache, optional): Shared cache of immutable analysis results.
+            group_version (int, optional): Version of the category grouping, part of the cache key.
+        """
+        result = self.compute_analysis(start_date, end_date, cache, group_version)
+        if result is None:
             print("No transactions available for analysis.")
             return
+        self.apply_analysis(result)
+        self.estimate_bls_baseline()
+
+    def compute_analysis(self, start_date=None, end_date=None, cache=None, group_version=0, store=None):
+        """
+        Computes the weekly analysis of a store without changing the processor, so it
+        can run on a worker thread; apply the result with apply_analysis.
+
+        Args:
+            start_date (datetime, optional): Start date for analysis. Defaults to earliest transaction date.
+            end_date (datetime, optional): End date for analysis. Defaults to latest transaction date.
+            cache (AnalysisCache, optional): Shared cache of immutable analysis results.
+            group_version (int, optional): Version of the category grouping, part of the cache key.
+            store (TransactionStore, optional): The store to analyze. Defaults to self.store.
+
+        Returns:
+            AnalysisResult or None: The result, or None if the store is empty.
+        """
+        store = self.store if store is None else store
+        if not len(store):
+            return None
 
-        self.start_date = start_date or all_dates[0]
-        self.end_date = end_date or all_dates[-1]
-
-        total_spent = 0
-        num_weeks = 0
-        current_week_start = self.start_date
-        category_totals_accum = {}
-        category_counts = {}
-
-        while current_week_start <= self.end_date:
-            next_sunday = current_week_start + timedelta(days=(6 - current_week_start.weekday() + 7) % 7)
-            current_week_end = min(next_sunday, self.end_date)
-
-            week_spending = 0
-            category_totals = {}
-            current_day = current_week_start
-            while current_day <= current_week_end:
-                for category, amount in self.transactions_dict.get(current_day, []):
-                    week_spending += amount
-                    category_totals[category] = category_totals.get(category, 0) + amount
-                current_day += timedelta(days=1)
-
-            self.weekly_spending[current_week_start] = week_spending
-            self.weekly_spending_by_category[current_week_start] = category_totals
-
-            for category, amount in category_totals.items():
-                if category not in self.category_series:
-                    self.category_series[category] = {}
-                self.category_series[category][current_week_start] = amount
-                category_totals_accum[category] = category_totals_accum.get(category, 0) + amount
-                category_counts[category] = category_counts.get(category, 0) + 1
-
-            if self.max_spending_week is None or week_spending > self.max_spending_week[1]:
-                self.max_spending_week = (current_week_start, week_spending)
-            if (self.min_spending_week is None or week_spending < self.min_spending_week[1]) and current_week_end.weekday() == 6:
-                self.min_spending_week = (current_week_start, week_spending)
-
-            total_spent += week_spending
-            num_weeks += 1
-            current_week_start = current_week_end + timedelta(days=1)
-
-        self.average_spending = total_spent / num_weeks
-        for category in category_totals_accum:
-            self.average_spending_by_category[category] = category_totals_accum[category] / category_counts[category]
-
-        if self.bls_comparator:
-            self.bls_comparator.get_bls_example_data()
+        start_date = start_date or from_ordinal(store.min_day)
+        end_date = end_date or from_ordinal(store.max_day)
+
+        key = (store.content_hash(), start_date, end_date, group_version)
+        result = cache.get(key) if cache is not None else None
+        if result is None:
+            aggregate = aggregate_weekly(store, to_ordinal(start_date), to_ordinal(end_date))
+            result = AnalysisResult.from_aggregate(aggregate, start_date, end_date)
+            if cache is not None:
+                cache.put(key, result)
+        return result
+
+    def estimate_bls_baseline(self):
+        """
+        Estimates a weekly BLS baseline from the BLS categories mapped to the
+        categories of the current analysis, if a BLS comparator is set.
+        """
+        result = self.analysis
+        if self.bls_comparator and result is not None:
+            self.bls_comparator.ensure_bls_data()
             used_bls_categories = set()
-            for user_category in category_totals_accum:
-                mapped = self.bls_comparator.category_mapping.get(user_category, [])
-                used_bls_categories.update(mapped)
+            for user_category in result.average_spending_by_category:
+                used_bls_categories.update(self.bls_comparator.resolve(user_category).bls_categories)
             self.bls_weekly_avg = sum(
                 self.bls_comparator.bls_data.get(cat, 0) for cat in used_bls_categories
             ) / 52
 
+    def apply_analysis(self, result):
+        """
+        Exposes an analysis result through the processor's attributes, replacing any earlier run.
+
+        Args:
+            result (AnalysisResult): The result to expose.
+        """
+        self.analysis = result
+        self.weekly_aggregate = result.aggregate
+        self.start_date = result.start_date
+        self.end_date = result.end_date
+        self.weekly_spending = result.weekly_spending
+        self.weekly_spending_by_category = result.weekly_spending_by_category
+        self.category_series = result.category_series
+        self.max_spending_week = result.max_spending_week
+        self.min_spending_week = result.min_spending_week
+        self.average_spending = result.average_spending
+        self.average_spending_by_category = result.average_spending_by_category
+
     def get_total_spending_by_category(self):
+        """
+        Computes total spending by category over the entire time span.
+
+        Returns:
+            dict: A mapping of category names to total spending amounts.
+        """
         totals = {}
         for week in self.weekly_spending_by_category.values():
             for category, amount in week.items():
                 totals[category] = totals.get(category, 0) + amount
-        return totals
\ No newline at end of file
+        return totals
@@ -0,0 +1,162 @@
+from .csv_ingestion import RowDecoder, read_header, resolve_columns
+
+
+def _header_names(header):
+    """
+    Returns:
+        set[str]: Header fields with whitespace and a byte-order mark stripped.
+    """
+    return {name.strip().lstrip('\ufeff') for name in header}
+
+
+class BankSchema:
+    """
+    Declarative description of one bank's statement CSV export.
+
+    A schema names the columns to read and the conventions of the export;
+    compile() turns it into a positional RowDecoder for a concrete header, so
+    every bank goes through the same typed ingestion path.
+
+    Attributes:
+        name (str): Bank type shown in the UI (e.g., "Discover").
+        date_column (str): Name of the transaction date column.
+        amount_column (str): Name of the amount column.
+        category_column (str or None): Name of the category column; files without it
+            (or schemas that set None) load every row as `default_category`.
+        date_format (str): strptime format of the date column.
+        spending_sign (int): 1 if purchases are exported as positive amounts, -1 if negative.
+        signature (tuple[str]): Header columns that identify this bank's export.
+        default_category (str): Category for rows without a category field.
+    """
+
+    def __init__(self, name, date_column, amount_column, category_column, date_format='%m/%d/%Y',
+                 spending_sign=1, signature=None, default_category='Uncategorized'):
+        self.name = name
+        self.date_column = date_column
+        self.amount_column = amount_column
+        self.category_column = category_column
+        self.date_format = date_format
+        self.spending_sign = spending_sign
+        self.signature = tuple(signature or (date_column, amount_column))
+        self.default_category = default_category
+
+    def matches(self, header):
+        """
+        Args:
+            header (list[str]): The header fields of a CSV file.
+
+        Returns:
+            bool: True if every signature column is present in the header.
+        """
+        names = _header_names(header)
+        return all(column in names for column in self.signature)
+
+    def compile(self, header):
+        """
+        Compiles the schema against a header row into a positional decoder.
+
+        Args:
+            header (list[str]): The header fields of the file.
+
+        Returns:
+            RowDecoder: Field positions and conventions for the file's data rows.
+
+        Raises:
+            KeyError: If the date or amount column is missing from the header.
+        """
+        date_index, amount_index = resolve_columns(header, [self.date_column, self.amount_column])
+        category_index = None
+        if self.category_column is not None and self.category_column in _header_names(header):
+            category_index = resolve_columns(header, [self.category_column])[0]
+        return RowDecoder(
+            date_index, amount_index, category_index,
+            date_format=self.date_format, sign=self.spending_sign, default_category=self.default_category,
+        )
+
+
+DISCOVER = BankSchema(
+    'Discover', 'Trans. Date', 'Amount', 'Category',
+    signature=('Trans. Date', 'Post Date', 'Description', 'Amount', 'Category'),
+)
+# Chase credit card exports list purchases as negative amounts and payments as positive ones.
+CHASE = BankSchema(
+    'Chase', 'Transaction Date', 'Amount', 'Category', spending_sign=-1,
+    signature=('Transaction Date', 'Post Date', 'Description', 'Category', 'Type', 'Amount'),
+)
+# The basic Amex export has no category column; the extended export appends one.
+AMEX = BankSchema(
+    'Amex', 'Date', 'Amount', 'Category',
+    signature=('Date', 'Description', 'Amount'),
+)
+# CSV produced from an OFX/QFX download: ISO dates, debits negative.
+OFX_CSV = BankSchema(
+    'OFX CSV', 'Date', 'Amount', 'Category', date_format='%Y-%m-%d', spending_sign=-1,
+    signature=('Date', 'Payee', 'Amount'),
+)
+
+# Registered schemas in sniffing order, most specific first
+BANK_SCHEMAS = {}
+
+
+def register_schema(schema):
+    """
+    Adds a schema to the registry, replacing any schema with the same name.
+
+    Args:
+        schema (BankSchema): The schema to register.
+    """
+    BANK_SCHEMAS[schema.name] = schema
+
+
+for _schema in (DISCOVER, CHASE, AMEX, OFX_CSV):
+    register_schema(_schema)
+
+
+def get_schema(name):
+    """
+    Args:
+        name (str): A registered bank type.
+
+    Returns:
+        BankSchema: The schema registered under that name.
+
+    Raises:
+        KeyError: If no schema has that name.
+    """
+    return BANK_SCHEMAS[name]
+
+
+def sniff_schema(header):
+    """
+    Picks the schema of a statement from its header row.
+
+    Args:
+        header (list[str]): The header fields.
+
+    Returns:
+        BankSchema or None: The first registered schema whose signature matches, or None.
+    """
+    for schema in BANK_SCHEMAS.values():
+        if schema.matches(header):
+            return schema
+    return None
+
+
+def sniff_file(path):
+    """
+    Picks the schema of a statement file from its first line.
+
+    Args:
+        path (str): Path to the CSV file.
+
+    Returns:
+        BankSchema: The matching schema.
+
+    Raises:
+        ValueError: If no registered schema matches the header.
+    """
+    header = read_header(path)
+    schema = sniff_schema(header)
+    if schema is None:
+        raise ValueError(f"Unrecognized statement format: {header}")
+    return schema
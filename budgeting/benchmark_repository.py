@@ -0,0 +1,131 @@
+import json
+import os
+import threading
+from types import MappingProxyType
+from .ces_workbook import CESTableCache
+
+DEFAULT_BENCHMARK_PATH = os.path.join("data", "ces_2022_benchmarks.json")
+
+
+class BenchmarkSnapshot:
+    """
+    Read-only contents of a benchmark file as of one load.
+
+    Attributes:
+        path (str): Absolute path of the file.
+        size (int): File size when loaded.
+        mtime_ns (int): Modification time when loaded, in nanoseconds.
+        data (Mapping or None): BLS category -> annual amount, as a read-only view,
+            for a JSON file.
+        table (CESTable or None): The indexed table, for a CES workbook.
+    """
+
+    def __init__(self, path, size, mtime_ns, data=None, table=None):
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.data = MappingProxyType(data) if data is not None else None
+        self.table = table
+
+    def benchmarks(self, year=None, column=None):
+        """
+        Args:
+            year (int, optional): Survey year of a workbook. Defaults to its latest year.
+            column (str, optional): Demographic column of a workbook. Defaults to its first column.
+
+        Returns:
+            Mapping: Read-only {BLS category: annual amount}, shared by every caller.
+
+        Raises:
+            KeyError: If the workbook has no such year or column.
+            ValueError: If a year or column is given for a JSON file.
+        """
+        if self.table is not None:
+            return self.table.benchmarks(year, column)
+        if year is not None or column is not None:
+            raise ValueError(f"{self.path} holds a single year and column of benchmarks")
+        return self.data
+
+    def matches(self, stat):
+        """
+        Returns:
+            bool: True if the file still has the size and mtime it was loaded with.
+        """
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+
+class BenchmarkRepository:
+    """
+    Process-wide store of parsed benchmark files.
+
+    Each file is parsed once and handed out as a shared, read-only snapshot.
+    Later requests only stat the file, and re-parse it when its size or mtime
+    changed, so every comparator reading the same file shares one dict and no
+    analysis re-reads an unchanged file. Access is guarded by a lock, so workers
+    can share the repository.
+
+    Sources are flat JSON files of {BLS category: annual amount} or CES table
+    workbooks (.xlsx), which are compiled once into the CES table cache and
+    memory-mapped from it afterwards.
+    """
+
+    def __init__(self, table_cache=None):
+        """
+        Args:
+            table_cache (CESTableCache, optional): Cache of compiled workbooks.
+                Defaults to one rooted at the default CES cache directory.
+        """
+        self.table_cache = table_cache or CESTableCache()
+        self._snapshots = {}
+        self._lock = threading.Lock()
+
+    def load(self, path=DEFAULT_BENCHMARK_PATH):
+        """
+        Returns the current snapshot of a benchmark file, parsing it only if it changed.
+
+        Args:
+            path (str): Path to a JSON file of {BLS category: annual amount} or a CES workbook.
+
+        Returns:
+            BenchmarkSnapshot: The file's contents.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the file is not valid JSON or not a CES table workbook.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                self._snapshots.pop(path, None)
+                raise
+            snapshot = self._snapshots.get(path)
+            if snapshot is None or not snapshot.matches(stat):
+                if path.lower().endswith('.xlsx'):
+                    snapshot = BenchmarkSnapshot(path, stat.st_size, stat.st_mtime_ns, table=self.table_cache.get(path))
+                else:
+                    with open(path, "r") as f:
+                        data = json.load(f)
+                    snapshot = BenchmarkSnapshot(path, stat.st_size, stat.st_mtime_ns, data)
+                self._snapshots[path] = snapshot
+            return snapshot
+
+    def clear(self):
+        """Forgets every snapshot, so the next load of each file re-parses it."""
+        with self._lock:
+            self._snapshots.clear()
+
+
+_default_repository = None
+
+
+def get_benchmark_repository():
+    """
+    Returns:
+        BenchmarkRepository: The process-wide benchmark repository.
+    """
+    global _default_repository
+    if _default_repository is None:
+        _default_repository = BenchmarkRepository()
+    return _default_repository
@@ -1,15 +1,51 @@
 from budgeting.bls_mappings import CATEGORY_MAPPING, SERIES_MAPPING
-import os
-import json
+from budgeting.benchmark_repository import DEFAULT_BENCHMARK_PATH, get_benchmark_repository
+from budgeting.bls_matcher import BLSItemIndex, DEFAULT_MAX_CANDIDATES, DEFAULT_MIN_SCORE, get_bulk_map_cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+WEEKS_PER_YEAR = 52
+
+
+class ResolvedBLSCategory:
+    """
+    A user category's BLS benchmark, resolved once per benchmark/mapping version.
+
+    Attributes:
+        bls_categories (tuple[str]): BLS categories the user category maps to.
+        annual_average (float or None): Average annual benchmark of the mapped categories
+            that have data, or None if none do.
+        weekly_average (float or None): annual_average converted to weekly.
+    """
+
+    def __init__(self, bls_categories, annual_average):
+        self.bls_categories = tuple(bls_categories)
+        self.annual_average = annual_average
+        self.weekly_average = annual_average / WEEKS_PER_YEAR if annual_average is not None else None
+
+
+UNMAPPED = ResolvedBLSCategory((), None)
+
 
 class BLSComparator:
     """
     A class to compare user spending categories against benchmark data from the BLS (Bureau of Labor Statistics).
 
+    Benchmarks are looked up through a resolved table that maps every user
+    category to its BLS categories and averages. The table is built on first
+    use and rebuilt only after `bls_data` or `category_mapping` is replaced, so
+    repeated lookups (e.g. on every replot) are dictionary hits. Assign a new
+    dict rather than mutating the current one to invalidate it.
+
     Attributes:
         bls_api_key (str): API key for future expansion (currently unused).
         bls_data (dict): Dictionary mapping BLS category codes to annual benchmark amounts.
         category_mapping (dict): Mapping from user-defined categories to BLS categories.
+        version (int): Incremented whenever bls_data or category_mapping is replaced.
+        benchmark_path (str or None): File bls_data was loaded from, if it came from one.
+        benchmark_year (int or None): Survey year selected from a CES workbook.
+        benchmark_column (str or None): Demographic column selected from a CES workbook.
     """
     def __init__(self, bls_api_key):
         """
@@ -19,9 +55,66 @@ class BLSComparator:
             bls_api_key (str): The API key to use for future BLS API requests.
         """
         self.bls_api_key = bls_api_key
+        self.version = 0
+        self._resolved = None
+        self._item_index = None
         self.bls_data = {}  # {bls_category: annual amount}
         self.category_mapping = CATEGORY_MAPPING
 
+    @property
+    def bls_data(self):
+        return self._bls_data
+
+    @bls_data.setter
+    def bls_data(self, bls_data):
+        self._bls_data = bls_data
+        self.benchmark_path = None
+        self.benchmark_year = None
+        self.benchmark_column = None
+        self._invalidate_resolved()
+
+    @property
+    def category_mapping(self):
+        return self._category_mapping
+
+    @category_mapping.setter
+    def category_mapping(self, category_mapping):
+        self._category_mapping = category_mapping
+        self._invalidate_resolved()
+
+    def _invalidate_resolved(self):
+        self.version += 1
+        self._resolved = None
+        self._item_index = None
+
+    def resolved_table(self):
+        """
+        Returns the resolved benchmark of every mapped user category, building it if needed.
+
+        Returns:
+            dict: User category -> ResolvedBLSCategory.
+        """
+        if self._resolved is None:
+            self._resolved = {}
+            for user_category, bls_categories in self.category_mapping.items():
+                values = [self.bls_data[cat] for cat in bls_categories if self.bls_data.get(cat) is not None]
+                average = sum(values) / len(values) if values else None
+                if bls_categories and average is None:
+                    logger.debug("No valid BLS data for any mapped categories of '%s': %s", user_category, bls_categories)
+                self._resolved[user_category] = ResolvedBLSCategory(bls_categories, average)
+            logger.debug("Resolved BLS benchmarks for %d user categories.", len(self._resolved))
+        return self._resolved
+
+    def resolve(self, user_category):
+        """
+        Args:
+            user_category (str): The user-defined spending category.
+
+        Returns:
+            ResolvedBLSCategory: Its benchmark; UNMAPPED if the category has no mapping.
+        """
+        return self.resolved_table().get(user_category, UNMAPPED)
+
     def fetch_bls_series_metadata(self):
         """
         Returns static BLS series metadata.
@@ -31,34 +124,120 @@ class BLSComparator:
         """
         return SERIES_MAPPING
 
-    def get_bls_example_data(self):
+    def get_bls_example_data(self, path=DEFAULT_BENCHMARK_PATH):
         """
-        Loads example BLS CES (Consumer Expenditure Survey) benchmark data from a local JSON file.
+        Loads BLS CES (Consumer Expenditure Survey) benchmark data from a local JSON file
+        through the shared benchmark repository, which only re-parses the file if it changed.
+
+        Args:
+            path (str, optional): Benchmark file. Defaults to the bundled 2022 benchmarks.
 
         Returns:
-            dict: A dictionary of BLS categories and their benchmark annual values.
+            Mapping: A read-only mapping of BLS categories to their benchmark annual values.
         """
-        path = os.path.join("data", "ces_2022_benchmarks.json")
         try:
-            with open(path, "r") as f:
-                self.bls_data = json.load(f)
-            print(f"[BLS] Loaded {len(self.bls_data)} CES benchmark categories.")
+            self.load_benchmarks(path)
         except FileNotFoundError:
-            print(f"[BLS] CES benchmark file not found at: {path}")
+            logger.warning("CES benchmark file not found at: %s", path)
+        return self.bls_data
+
+    def load_benchmarks(self, path, year=None, column=None):
+        """
+        Uses a benchmark file as bls_data and remembers it as the benchmark source.
+
+        Args:
+            path (str): JSON file of {BLS category: annual amount}, or a CES table workbook.
+            year (int, optional): Survey year to use from a workbook. Defaults to its latest year.
+            column (str, optional): Demographic column to use from a workbook (e.g. an income
+                or age group). Defaults to its first column.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the file cannot be parsed, or a year or column is given for a JSON file.
+            KeyError: If the workbook has no such year or column.
+        """
+        data = get_benchmark_repository().load(path).benchmarks(year, column)
+        # An unchanged source returns the same mapping; keep the resolved table then
+        if data is not self.bls_data:
+            self.bls_data = data
+            logger.info("Loaded %d CES benchmark categories from %s.", len(self.bls_data), path)
+        self.benchmark_path = path
+        self.benchmark_year = year
+        self.benchmark_column = column
+
+    def benchmark_table(self):
+        """
+        Returns:
+            CESTable or None: The indexed table behind bls_data, if it came from a CES workbook;
+                lists the years and columns available to load_benchmarks.
+        """
+        if self.benchmark_path is None:
+            return None
+        return get_benchmark_repository().load(self.benchmark_path).table
+
+    def ensure_bls_data(self):
+        """
+        Brings bls_data up to date before an analysis: revalidates the benchmark file it
+        came from (a stat unless the file changed), or loads the default benchmarks if
+        no data is set. Data assigned directly to bls_data is left as is.
+
+        Returns:
+            Mapping: The benchmark data in use.
+        """
+        if self.benchmark_path is not None:
+            try:
+                self.load_benchmarks(self.benchmark_path, self.benchmark_year, self.benchmark_column)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("Keeping loaded benchmarks; could not reload %s: %s", self.benchmark_path, e)
+        elif not self.bls_data:
+            self.get_bls_example_data()
         return self.bls_data
 
-    def bulk_map(self, user_categories):
+    def item_index(self):
         """
-        Stub method for future batch category mapping logic. Currently a no-op.
+        Returns the inverted index over the benchmark items and the known mapping,
+        built once per benchmark/mapping version.
+
+        Returns:
+            BLSItemIndex: The index.
+        """
+        if self._item_index is None:
+            self._item_index = BLSItemIndex(self.bls_data.keys(), self.category_mapping)
+        return self._item_index
+
+    def bulk_map(self, user_categories, max_candidates=DEFAULT_MAX_CANDIDATES, min_score=DEFAULT_MIN_SCORE, cache=None):
+        """
+        Suggests BLS categories for a batch of user categories in one pass over the item index.
+
+        Suggestions are looked up in, and added to, a persistent cache keyed by the
+        index, so only categories never seen with the current benchmarks are scored.
+        Nothing is added to category_mapping; assign a new mapping to adopt suggestions.
 
         Args:
-            user_categories (list[str]): List of user-defined category names.
+            user_categories (Iterable[str]): User-defined category names.
+            max_candidates (int, optional): Most suggestions per category.
+            min_score (float, optional): Smallest score worth suggesting, in [0, 1].
+            cache (BulkMapCache, optional): Suggestion cache. Defaults to the process-wide cache.
+
+        Returns:
+            dict: User category -> list of (BLS category, score), best first; empty if nothing matched.
         """
-        pass
+        self.ensure_bls_data()
+        index = self.item_index()
+        cache = cache if cache is not None else get_bulk_map_cache()
+        settings = (max_candidates, min_score)
+        categories = list(dict.fromkeys(user_categories))
+        matches = cache.get(index.key, settings, categories)
+        missing = {category: index.match(category, max_candidates, min_score) for category in categories if category not in matches}
+        if missing:
+            cache.put(index.key, settings, missing)
+            matches.update(missing)
+        logger.debug("Mapped %d user categories (%d scored).", len(categories), len(missing))
+        return {category: matches[category] for category in categories}
 
     def get_bls_avg_for_user_category(self, user_category):
         """
-        Computes the average BLS benchmark spending for a given user-defined category.
+        Returns the average BLS benchmark spending for a given user-defined category.
 
         Args:
             user_category (str): The user-defined spending category.
@@ -66,17 +245,7 @@ class BLSComparator:
         Returns:
             float or None: The average BLS value if mapping is successful; otherwise None.
         """
-        bls_categories = self.category_mapping.get(user_category, [])
-        print(f"Mapping for '{user_category}': {bls_categories}")
-        if not bls_categories:
-            return None
-        values = [self.bls_data.get(cat) for cat in bls_categories if self.bls_data.get(cat) is not None]
-        if not values:
-            print(f"No valid BLS data for any mapped categories: {bls_categories}")
-            return None
-        avg_value = sum(values) / len(values)
-        print(f"BLS average for '{user_category}' (via {bls_categories}): {avg_value}")
-        return avg_value
+        return self.resolve(user_category).annual_average
     
     def compare_spending(self, user_spending_by_category):
         """
@@ -91,8 +260,7 @@ class BLSComparator:
                   - bls_avg: BLS average value
                   - difference: user spending minus BLS average
         """
-        if not self.bls_data:
-            self.get_bls_example_data()
+        self.ensure_bls_data()
 
         results = {}
         for ucat, amt in user_spending_by_category.items():
@@ -0,0 +1,257 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join("data", "cache", "bls_bulk_map.json")
+# Bump when tokenization or scoring changes, so cached suggestions are recomputed
+MATCHER_VERSION = 1
+DEFAULT_MAX_CANDIDATES = 3
+DEFAULT_MIN_SCORE = 0.3
+# Share of a candidate's score that comes from whole-word overlap; the rest is trigram overlap
+TOKEN_WEIGHT = 0.6
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset({'and', 'or', 'of', 'the', 'for', 'by', 'to', 'in', 'on', 'at', 'a', 'an', 'other', 'misc'})
+
+
+def tokenize(text):
+    """
+    Splits a category or item name into normalized words.
+
+    Words are lowercased, stop words dropped and plurals singularized, so
+    "Pets, Toys & Hobbies" and "pet toy hobbies" share every token.
+
+    Args:
+        text (str): The name.
+
+    Returns:
+        list[str]: The tokens, in order.
+    """
+    tokens = []
+    for word in _WORD.findall(text.lower()):
+        if word in _STOPWORDS:
+            continue
+        if len(word) > 4 and word.endswith('ies'):
+            word = word[:-3] + 'y'
+        elif len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def trigrams(tokens):
+    """
+    Args:
+        tokens (list[str]): Tokens from tokenize().
+
+    Returns:
+        set[str]: Character trigrams of the tokens, each padded with spaces.
+    """
+    grams = set()
+    for token in tokens:
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class BLSItemIndex:
+    """
+    Inverted index over BLS item names for matching many user categories at once.
+
+    Every item name is a document, and so is every user category label of the
+    known category mapping, pointing at the items it maps to, so labels close
+    to a known one ("Supermarket/Grocery") inherit its mapping. Postings map
+    each token and each character trigram to the documents containing it; a
+    query only scores the documents sharing at least one of its tokens or
+    trigrams. A candidate's score blends IDF-weighted token overlap with
+    trigram overlap, both as Dice coefficients in [0, 1], and an item takes the
+    best score of the documents pointing at it.
+
+    Attributes:
+        items (list[str]): BLS item names that can be suggested.
+        key (str): Hash of the indexed items and aliases, identifying cached suggestions.
+    """
+
+    def __init__(self, items, aliases=None):
+        """
+        Args:
+            items (Iterable[str]): BLS item names.
+            aliases (dict, optional): User category -> BLS items, e.g. CATEGORY_MAPPING.
+        """
+        self.items = list(items)
+        item_index = {name: index for index, name in enumerate(self.items)}
+        documents = [(name, [index]) for index, name in enumerate(self.items)]
+        for label, mapped in sorted((aliases or {}).items()):
+            targets = [item_index[name] for name in mapped if name in item_index]
+            if targets:
+                documents.append((label, targets))
+
+        key = hashlib.blake2b(digest_size=16)
+        for text, targets in documents:
+            key.update(f"{text}\0{targets}\0".encode('utf-8'))
+        self.key = key.hexdigest()
+
+        self._exact = {}
+        self._token_postings = {}
+        self._trigram_postings = {}
+        token_sets = []
+        trigram_counts = []
+        for doc, (text, _) in enumerate(documents):
+            tokens = tokenize(text)
+            self._exact.setdefault(" ".join(tokens), doc)
+            token_sets.append(set(tokens))
+            grams = trigrams(tokens)
+            trigram_counts.append(len(grams))
+            for token in set(tokens):
+                self._token_postings.setdefault(token, []).append(doc)
+            for gram in grams:
+                self._trigram_postings.setdefault(gram, []).append(doc)
+        num_docs = len(documents)
+        self._idf = {token: math.log(1 + num_docs / len(docs)) for token, docs in self._token_postings.items()}
+        self._unseen_idf = math.log(1 + num_docs) if num_docs else 1.0
+        self._token_postings = {token: np.array(docs) for token, docs in self._token_postings.items()}
+        self._trigram_postings = {gram: np.array(docs) for gram, docs in self._trigram_postings.items()}
+        self._doc_token_weight = np.array([sum(self._idf[token] for token in tokens) for tokens in token_sets])
+        self._doc_trigram_count = np.array(trigram_counts, dtype=np.float64)
+        # (document, item) pairs, for taking each item's best document score
+        self._pair_docs = np.array([doc for doc, (_, targets) in enumerate(documents) for _ in targets], dtype=np.intp)
+        self._pair_items = np.array([item for _, targets in documents for item in targets], dtype=np.intp)
+        self._documents = documents
+
+    def match(self, category, max_candidates=DEFAULT_MAX_CANDIDATES, min_score=DEFAULT_MIN_SCORE):
+        """
+        Scores the BLS items against one user category.
+
+        Args:
+            category (str): User category label.
+            max_candidates (int): Most candidates to return.
+            min_score (float): Smallest score worth suggesting.
+
+        Returns:
+            list[tuple[str, float]]: (BLS item, score in [0, 1]), best first.
+        """
+        tokens = tokenize(category)
+        if not tokens or not self.items:
+            return []
+        exact = self._exact.get(" ".join(tokens))
+        if exact is not None:
+            targets = self._documents[exact][1]
+            return [(self.items[item], 1.0) for item in targets[:max_candidates]]
+
+        num_docs = len(self._documents)
+        shared_weight = np.zeros(num_docs)
+        query_weight = 0.0
+        for token in set(tokens):
+            query_weight += self._idf.get(token, self._unseen_idf)
+            docs = self._token_postings.get(token)
+            if docs is not None:
+                shared_weight[docs] += self._idf[token]
+        grams = trigrams(tokens)
+        shared_grams = np.zeros(num_docs)
+        for gram in grams:
+            docs = self._trigram_postings.get(gram)
+            if docs is not None:
+                shared_grams[docs] += 1
+        doc_scores = (
+            TOKEN_WEIGHT * 2 * shared_weight / (query_weight + self._doc_token_weight)
+            + (1 - TOKEN_WEIGHT) * 2 * shared_grams / (len(grams) + self._doc_trigram_count)
+        )
+
+        item_scores = np.zeros(len(self.items))
+        np.maximum.at(item_scores, self._pair_items, doc_scores[self._pair_docs])
+        candidates = np.flatnonzero(item_scores >= min_score)
+        best = candidates[np.argsort(-item_scores[candidates], kind='stable')[:max_candidates]]
+        return [(self.items[item], round(float(item_scores[item]), 4)) for item in best]
+
+
+class BulkMapCache:
+    """
+    Persistent cache of bulk_map suggestions, stored as one JSON file.
+
+    Suggestions are kept per index key, so they are reused for as long as the
+    benchmark items and the known mapping they were computed from are the same,
+    across app starts. Access is guarded by a lock.
+
+    Attributes:
+        path (str): JSON file holding the cache.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = path
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.path, 'r') as f:
+                    cached = json.load(f)
+                if cached.get('matcher_version') == MATCHER_VERSION:
+                    self._entries = cached.get('entries', {})
+            except (OSError, ValueError):
+                pass
+        return self._entries
+
+    def get(self, index_key, settings, categories):
+        """
+        Args:
+            index_key (str): BLSItemIndex.key of the index the suggestions came from.
+            settings (tuple): (max_candidates, min_score) the suggestions were computed with.
+            categories (Iterable[str]): User categories to look up.
+
+        Returns:
+            dict: Category -> list of (item, score), for the cached categories only.
+        """
+        with self._lock:
+            entry = self._load().get(f"{index_key}:{settings[0]}:{settings[1]}", {})
+            return {
+                category: [tuple(match) for match in entry[category]]
+                for category in categories if category in entry
+            }
+
+    def put(self, index_key, settings, matches):
+        """
+        Adds suggestions and writes the cache file.
+
+        Args:
+            index_key (str): BLSItemIndex.key of the index the suggestions came from.
+            settings (tuple): (max_candidates, min_score) the suggestions were computed with.
+            matches (dict): Category -> list of (item, score).
+        """
+        with self._lock:
+            entries = self._load()
+            # Suggestions of an older index will never be asked for again
+            name = f"{index_key}:{settings[0]}:{settings[1]}"
+            for stale in [key for key in entries if not key.startswith(index_key)]:
+                del entries[stale]
+            entries.setdefault(name, {}).update({category: [list(match) for match in found] for category, found in matches.items()})
+            staging = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(staging, 'w') as f:
+                    json.dump({'matcher_version': MATCHER_VERSION, 'entries': entries}, f)
+                os.replace(staging, self.path)
+            except OSError as e:
+                logger.warning("Could not write BLS mapping suggestions to %s: %s", self.path, e)
+
+
+_default_cache = None
+
+
+def get_bulk_map_cache():
+    """
+    Returns:
+        BulkMapCache: The process-wide cache at DEFAULT_CACHE_PATH.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = BulkMapCache()
+    return _default_cache
@@ -8,10 +8,12 @@ class CategoryManager:
     def __init__(self, config_path: str = "data/category_groups.json"):
         self.config_path = config_path
         self.category_groups = {}
+        self.version = 0  # Bumped whenever the groups change; used in analysis cache keys
         self.load_groups()
         
     def load_groups(self):
         """Load category groups from file"""
+        self.version += 1
         if os.path.exists(self.config_path):
             try:
                 with open(self.config_path, 'r') as f:
@@ -34,6 +36,7 @@ class CategoryManager:
     def set_groups(self, groups: Dict[str, List[str]]):
         """Set category groups and save to file"""
         self.category_groups = groups.copy()
+        self.version += 1
         self.save_groups()
         
     def get_groups(self) -> Dict[str, List[str]]:
@@ -0,0 +1,363 @@
+import hashlib
+import json
+import logging
+import os
+import posixpath
+import re
+import shutil
+import zipfile
+import xml.etree.ElementTree as ET
+from types import MappingProxyType
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKBOOK_PATH = os.path.join("data", "cu-all-multi-year-2021-2023.xlsx")
+DEFAULT_CACHE_DIR = os.path.join("data", "cache", "ces")
+# Bump when the compiled format or the parsing rules change
+IMPORTER_VERSION = 1
+# Column name of multi-year tables, whose header row holds years instead of demographic columns
+ALL_CONSUMER_UNITS = "All consumer units"
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_RELATIONSHIP_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PACKAGE_RELATIONSHIP_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_WORKBOOK_PATH = "xl/workbook.xml"
+_WORKBOOK_RELS_PATH = "xl/_rels/workbook.xml.rels"
+# Where spreadsheet writers put the first sheet, for workbooks without relationship parts
+_DEFAULT_SHEET_PATH = "xl/worksheets/sheet1.xml"
+_SHARED_STRINGS_PATH = "xl/sharedStrings.xml"
+# Trailing footnote markers such as "Income after taxes b/"
+_FOOTNOTE = re.compile(r"\s+[a-z]/\s*$")
+_YEAR = re.compile(r"\b(19|20)\d{2}\b")
+
+
+def _column_index(cell_ref):
+    """
+    Args:
+        cell_ref (str): A cell reference such as "B12".
+
+    Returns:
+        int: Zero-based column index (A -> 0).
+    """
+    index = 0
+    for char in cell_ref:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - ord('A') + 1
+    return index - 1
+
+
+def _read_shared_strings(archive):
+    """
+    Streams the shared string table of a workbook.
+
+    Returns:
+        list[str]: The strings, in index order; rich-text runs are concatenated.
+    """
+    if _SHARED_STRINGS_PATH not in archive.namelist():
+        return []
+    strings = []
+    with archive.open(_SHARED_STRINGS_PATH) as f:
+        for _, elem in ET.iterparse(f, events=('end',)):
+            if elem.tag == f"{_NS}si":
+                strings.append("".join(text.text or "" for text in elem.iter(f"{_NS}t")))
+                elem.clear()
+    return strings
+
+
+def _first_sheet_path(archive):
+    """
+    Resolves the part holding a workbook's first sheet through xl/workbook.xml
+    and its relationships, since sheet parts need not be named sheet1.xml.
+
+    Returns:
+        str: The sheet's path inside the archive.
+    """
+    names = archive.namelist()
+    if _WORKBOOK_PATH not in names or _WORKBOOK_RELS_PATH not in names:
+        return _DEFAULT_SHEET_PATH
+    sheet = ET.fromstring(archive.read(_WORKBOOK_PATH)).find(f"{_NS}sheets/{_NS}sheet")
+    if sheet is None:
+        return _DEFAULT_SHEET_PATH
+    rel_id = sheet.get(f"{_RELATIONSHIP_NS}id")
+    for rel in ET.fromstring(archive.read(_WORKBOOK_RELS_PATH)).iter(f"{_PACKAGE_RELATIONSHIP_NS}Relationship"):
+        if rel.get('Id') == rel_id:
+            target = rel.get('Target', '')
+            # Targets are relative to xl/ unless they start at the package root
+            if target.startswith('/'):
+                return target.lstrip('/')
+            return posixpath.normpath(posixpath.join(posixpath.dirname(_WORKBOOK_PATH), target))
+    return _DEFAULT_SHEET_PATH
+
+
+def iter_sheet_rows(path):
+    """
+    Streams the rows of a workbook's first sheet without loading the sheet.
+
+    Args:
+        path (str): Path to an .xlsx file.
+
+    Yields:
+        list: The row's cell values by column index, as str, float or None.
+    """
+    with zipfile.ZipFile(path) as archive:
+        strings = _read_shared_strings(archive)
+        with archive.open(_first_sheet_path(archive)) as f:
+            for _, elem in ET.iterparse(f, events=('end',)):
+                if elem.tag != f"{_NS}row":
+                    continue
+                row = []
+                for cell in elem.iter(f"{_NS}c"):
+                    column = _column_index(cell.get('r', ''))
+                    cell_type = cell.get('t', 'n')
+                    if cell_type == 'inlineStr':
+                        value = "".join(text.text or "" for text in cell.iter(f"{_NS}t"))
+                    else:
+                        raw = cell.findtext(f"{_NS}v")
+                        if raw is None:
+                            value = None
+                        elif cell_type == 's':
+                            value = strings[int(raw)]
+                        elif cell_type in ('str', 'e'):
+                            value = raw
+                        else:
+                            value = float(raw)
+                    if column >= len(row):
+                        row.extend([None] * (column + 1 - len(row)))
+                    row[column] = value
+                yield row
+                elem.clear()
+
+
+class CESTable:
+    """
+    A Consumer Expenditure Survey table indexed by (item, year, demographic column).
+
+    Values live in one float array of shape (items, years, columns) with NaN for
+    cells that are suppressed or not reported; the name -> index dicts make any
+    lookup O(1). Tables loaded from the compiled cache memory-map the array.
+
+    Attributes:
+        title (str): Title of the source table.
+        items (list[str]): Item names in table order, footnote markers removed. An item
+            name repeated under another section is qualified as "Section: item".
+        years (list[int]): Survey years.
+        columns (list[str]): Demographic columns (e.g. income or age groups).
+        values (np.ndarray): Annual values, shape (len(items), len(years), len(columns)).
+    """
+
+    def __init__(self, title, items, years, columns, values):
+        self.title = title
+        self.items = items
+        self.years = years
+        self.columns = columns
+        self.values = values
+        self._item_index = {name: index for index, name in enumerate(items)}
+        self._year_index = {year: index for index, year in enumerate(years)}
+        self._column_index = {name: index for index, name in enumerate(columns)}
+        self._benchmarks = {}
+
+    def _indices(self, year, column):
+        year = self.years[-1] if year is None else year
+        column = self.columns[0] if column is None else column
+        if year not in self._year_index:
+            raise KeyError(f"Year {year} not in table; available: {self.years}")
+        if column not in self._column_index:
+            raise KeyError(f"Column '{column}' not in table; available: {self.columns}")
+        return self._year_index[year], self._column_index[column]
+
+    def value(self, item, year=None, column=None):
+        """
+        Args:
+            item (str): Item name.
+            year (int, optional): Survey year. Defaults to the latest.
+            column (str, optional): Demographic column. Defaults to the first.
+
+        Returns:
+            float or None: The annual value, or None if the item is unknown or has no value.
+        """
+        row = self._item_index.get(item)
+        if row is None:
+            return None
+        year_index, column_index = self._indices(year, column)
+        value = float(self.values[row, year_index, column_index])
+        return None if np.isnan(value) else value
+
+    def benchmarks(self, year=None, column=None):
+        """
+        Returns every item's value for one year and column, in the form of BLSComparator.bls_data.
+        The mapping is built once per (year, column) and shared.
+
+        Args:
+            year (int, optional): Survey year. Defaults to the latest.
+            column (str, optional): Demographic column. Defaults to the first.
+
+        Returns:
+            Mapping: Read-only {item: annual value} for the items that have a value.
+        """
+        key = self._indices(year, column)
+        if key not in self._benchmarks:
+            values = np.asarray(self.values[:, key[0], key[1]]).tolist()
+            self._benchmarks[key] = MappingProxyType({
+                item: value for item, value in zip(self.items, values) if not np.isnan(value)
+            })
+        return self._benchmarks[key]
+
+
+def import_workbook(path):
+    """
+    Parses a CES table workbook in one pass over its rows.
+
+    The header row is the one whose first cell is "Item". Numeric headers are
+    years (a multi-year table of one demographic column); text headers are
+    demographic columns of the single year named in the title. Rows without
+    any value are section headings or notes and are skipped; suppressed cells
+    become NaN.
+
+    Args:
+        path (str): Path to the .xlsx file.
+
+    Returns:
+        CESTable: The parsed table.
+
+    Raises:
+        ValueError: If the file is not a workbook or its sheet has no header row.
+    """
+    title = ""
+    headers = None
+    items = []
+    rows = []
+    seen = set()
+    section = ""
+    try:
+        for row in iter_sheet_rows(path):
+            label = row[0] if row and isinstance(row[0], str) else None
+            if headers is None:
+                if label is not None and label.strip() == "Item":
+                    headers = row[1:]
+                elif label and not title:
+                    title = label.strip()
+                continue
+            if not label or not label.strip():
+                continue
+            name = _FOOTNOTE.sub("", label).strip()
+            cells = row[1:len(headers) + 1]
+            values = [cell if isinstance(cell, float) else np.nan for cell in cells]
+            values.extend([np.nan] * (len(headers) - len(values)))
+            # A row with neither values nor footnote markers ("c/", "d/") is a heading or a note
+            if all(np.isnan(value) for value in values) and not any(isinstance(cell, str) and cell.strip() for cell in cells):
+                section = name.rstrip(':')
+                continue
+            if name in seen:
+                name = f"{section}: {name}"
+            seen.add(name)
+            items.append(name)
+            rows.append(values)
+    except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+        raise ValueError(f"{path} is not a readable CES table workbook: {e}") from e
+    if headers is None:
+        raise ValueError(f"No 'Item' header row found in {path}")
+
+    values = np.array(rows, dtype=np.float64).reshape(len(rows), len(headers))
+    if all(isinstance(header, float) for header in headers):
+        years = [int(header) for header in headers]
+        columns = [ALL_CONSUMER_UNITS]
+        values = values[:, :, np.newaxis]
+    else:
+        match = list(_YEAR.finditer(title))
+        years = [int(match[-1].group(0))] if match else [0]
+        columns = [_FOOTNOTE.sub("", str(header or "")).strip() for header in headers]
+        values = values[:, np.newaxis, :]
+    return CESTable(title, items, years, columns, np.ascontiguousarray(values))
+
+
+class CESTableCache:
+    """
+    On-disk cache of compiled CES tables, so each workbook is parsed only once.
+
+    Each entry is a directory holding values.npy, memory-mapped on load, and a
+    meta.json with the title and the item, year and column names. Entries are
+    keyed by the workbook's path, size and mtime together with IMPORTER_VERSION.
+
+    Attributes:
+        cache_dir (str): Directory holding the cache entries.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def fingerprint(self, path):
+        """
+        Returns:
+            str: A hex key covering the workbook's path, size, mtime and the importer version.
+        """
+        stat = os.stat(path)
+        key = hashlib.blake2b(digest_size=16)
+        for part in (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, IMPORTER_VERSION):
+            key.update(str(part).encode('utf-8'))
+            key.update(b'\0')
+        return key.hexdigest()
+
+    def load(self, key):
+        """
+        Returns:
+            CESTable or None: The compiled table with its values memory-mapped, or None on a miss.
+        """
+        entry = os.path.join(self.cache_dir, key)
+        try:
+            with open(os.path.join(entry, 'meta.json'), 'r') as f:
+                meta = json.load(f)
+            if meta.get('importer_version') != IMPORTER_VERSION:
+                return None
+            values = np.load(os.path.join(entry, 'values.npy'), mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        return CESTable(meta['title'], meta['items'], meta['years'], meta['columns'], values)
+
+    def save(self, key, table):
+        """
+        Writes a compiled table to the cache.
+
+        Args:
+            key (str): Key from fingerprint().
+            table (CESTable): The parsed table.
+        """
+        entry = os.path.join(self.cache_dir, key)
+        if os.path.isdir(entry):
+            return
+        staging = f"{entry}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(staging, exist_ok=True)
+            np.save(os.path.join(staging, 'values.npy'), np.ascontiguousarray(table.values))
+            meta = {
+                'importer_version': IMPORTER_VERSION,
+                'title': table.title,
+                'items': table.items,
+                'years': table.years,
+                'columns': table.columns,
+            }
+            with open(os.path.join(staging, 'meta.json'), 'w') as f:
+                json.dump(meta, f)
+            os.replace(staging, entry)
+        except OSError as e:
+            logger.warning("Could not write CES table cache entry %s: %s", entry, e)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def get(self, path):
+        """
+        Returns a workbook's table, importing and compiling it only on a cache miss.
+
+        Args:
+            path (str): Path to the .xlsx file.
+
+        Returns:
+            CESTable: The table.
+        """
+        key = self.fingerprint(path)
+        table = self.load(key)
+        if table is None:
+            table = import_workbook(path)
+            self.save(key, table)
+        return table
@@ -0,0 +1,13 @@
+from .bank_schemas import CHASE
+from .schema_activity_processing import SchemaActProc
+
+
+class ChaseActProc(SchemaActProc):
+    """
+    Processes Chase credit card CSV exports.
+
+    Purchases are exported as negative amounts; the schema flips them so spending is positive.
+    Attributes are the same as DiscoverActProc.
+    """
+
+    SCHEMA = CHASE
@@ -0,0 +1,597 @@
+import csv
+import hashlib
+import io
+import mmap
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime
+from itertools import islice
+from .transaction_store import TransactionStore, TransactionStoreBuilder
+
+PARSER_VERSION = 2  # Bump whenever parsing output changes, to invalidate cached statements
+DEFAULT_CHUNK_ROWS = 50000
+MAX_CACHED_DATES = 100000
+PARALLEL_MIN_BYTES = 64 * 1024 * 1024  # Files smaller than this are parsed on one core
+PART_BYTES = 32 * 1024 * 1024  # Target size of each byte range handed to a worker
+HASH_BLOCK_BYTES = 1024 * 1024  # Block size for checksumming statement files
+# Pools are started from QThreadPool threads, and forking a threaded Qt process is unsafe
+POOL_CONTEXT = multiprocessing.get_context('spawn')
+
+
+class IngestCancelled(Exception):
+    """Raised from a progress callback to abort an ingestion in progress."""
+
+
+class DateParser:
+    """
+    Parses statement date strings to day ordinals, memoizing by the raw string.
+
+    Statement exports repeat the same date string for every transaction on that
+    day, so after the first occurrence a parse is a single dict lookup. Fixed
+    '%m/%d/%Y' strings also take a hand-rolled fast path; anything unusual falls
+    back to datetime.strptime, so the same inputs are accepted as before.
+
+    Attributes:
+        date_format (str): strptime format of the date strings.
+        memoize (bool): Whether parsed dates are cached by their raw string.
+    """
+
+    def __init__(self, date_format='%m/%d/%Y', memoize=True):
+        self.date_format = date_format
+        self.memoize = memoize
+        self._fixed_mdy = date_format == '%m/%d/%Y'
+        self._cache = {}
+
+    def __call__(self, text):
+        """
+        Args:
+            text (str): The raw date field.
+
+        Returns:
+            int: The day ordinal.
+
+        Raises:
+            ValueError: If the text does not match the date format.
+        """
+        day = self._cache.get(text)
+        if day is not None:
+            return day
+        day = self._parse(text)
+        if self.memoize:
+            if len(self._cache) >= MAX_CACHED_DATES:
+                self._cache.clear()
+            self._cache[text] = day
+        return day
+
+    def _parse(self, text):
+        if self._fixed_mdy and len(text) == 10 and text[2] == '/' and text[5] == '/':
+            month, day, year = text[:2], text[3:5], text[6:]
+            if month.isdigit() and day.isdigit() and year.isdigit():
+                return date(int(year), int(month), int(day)).toordinal()
+        return datetime.strptime(text, self.date_format).toordinal()
+
+
+class IngestDiagnostics:
+    """
+    Counts and samples problems found while ingesting a statement, instead of printing every bad row.
+
+    Attributes:
+        rows_read (int): Data rows read from the file (excluding the header).
+        rows_loaded (int): Rows stored as transactions.
+        rows_skipped (int): Valid rows intentionally dropped (e.g., negative amounts).
+        bad_rows (int): Rows that could not be parsed.
+        samples (list[tuple]): Up to `max_samples` (row number, raw row, error message) examples.
+        max_samples (int): How many bad rows to keep as examples.
+    """
+
+    def __init__(self, max_samples=20):
+        self.rows_read = 0
+        self.rows_loaded = 0
+        self.rows_skipped = 0
+        self.bad_rows = 0
+        self.samples = []
+        self.max_samples = max_samples
+
+    def record_error(self, row_number, row, error):
+        """
+        Counts a malformed row and keeps it as an example while there is room.
+
+        Args:
+            row_number (int): 1-based record number in the file, counting the header.
+            row (list[str]): The raw parsed fields.
+            error (Exception): The parsing error.
+        """
+        self.bad_rows += 1
+        if len(self.samples) < self.max_samples:
+            self.samples.append((row_number, row, str(error)))
+
+    def summary(self):
+        """
+        Returns:
+            str: A one-line description of the ingestion outcome.
+        """
+        return (f"{self.rows_loaded} loaded, {self.rows_skipped} skipped, "
+                f"{self.bad_rows} malformed out of {self.rows_read} rows")
+
+
+class IngestResult:
+    """
+    Output of ingest_statement.
+
+    Attributes:
+        store (TransactionStore): The parsed transactions.
+        first_day (int or None): Earliest valid transaction date seen, including skipped rows.
+        last_day (int or None): Latest valid transaction date seen, including skipped rows.
+        diagnostics (IngestDiagnostics): Counts and samples of problems.
+        records (int): CSV records consumed after the header, including blank lines.
+        source_position (tuple or None): (bytes consumed, checksum of those bytes, ends with
+            newline) of the file the result was parsed from, as from source_position(); None
+            if the result does not cover a whole file prefix.
+    """
+
+    def __init__(self, store, first_day, last_day, diagnostics, records=0, source_position=None):
+        self.store = store
+        self.first_day = first_day
+        self.last_day = last_day
+        self.diagnostics = diagnostics
+        self.records = records
+        self.source_position = source_position
+
+    @property
+    def earliest_year(self):
+        """int or float: Year of first_day, or +inf when no dates were parsed."""
+        return date.fromordinal(self.first_day).year if self.first_day is not None else float('inf')
+
+    @property
+    def latest_year(self):
+        """int or float: Year of last_day, or -inf when no dates were parsed."""
+        return date.fromordinal(self.last_day).year if self.last_day is not None else float('-inf')
+
+
+def record_fingerprint(row):
+    """
+    Hashes a raw CSV record to a stable 64-bit fingerprint.
+
+    Every field takes part (for Discover: transaction date, post date,
+    description, amount and category), so the same transaction exported in two
+    overlapping statements gets the same fingerprint. The hash is keyed on the
+    record text only, so it is identical across processes and cache reloads.
+
+    Args:
+        row (list[str]): The raw fields of the record.
+
+    Returns:
+        int: The fingerprint.
+    """
+    digest = hashlib.blake2b('\x1f'.join(row).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class RowDecoder:
+    """
+    Positional decoder compiled from a bank schema and a file's header row.
+
+    Plain attributes only, so it can be handed to worker processes.
+
+    Attributes:
+        date_index (int): Position of the transaction date field.
+        amount_index (int): Position of the amount field.
+        category_index (int or None): Position of the category field, or None if the file has none.
+        date_format (str): strptime format of the date field.
+        sign (int): Multiplier that makes spending positive (-1 for banks that export purchases as negatives).
+        default_category (str): Category used when the file has no category field.
+    """
+
+    def __init__(self, date_index, amount_index, category_index=None, date_format='%m/%d/%Y', sign=1,
+                 default_category='Uncategorized'):
+        self.date_index = date_index
+        self.amount_index = amount_index
+        self.category_index = category_index
+        self.date_format = date_format
+        self.sign = sign
+        self.default_category = default_category
+
+
+def resolve_columns(header, column_names):
+    """
+    Finds the positions of named columns in a header row.
+
+    Args:
+        header (list[str]): The header fields.
+        column_names (list[str]): Column names to look up.
+
+    Returns:
+        list[int]: The index of each requested column.
+
+    Raises:
+        KeyError: If any column is missing from the header.
+    """
+    positions = {name.strip().lstrip('\ufeff'): index for index, name in enumerate(header)}
+    missing = [name for name in column_names if name not in positions]
+    if missing:
+        raise KeyError(f"Missing column(s) {missing} in header {header}")
+    return [positions[name] for name in column_names]
+
+
+def ingest_rows(reader, decoder, parse_date=None, chunk_rows=DEFAULT_CHUNK_ROWS, diagnostics=None,
+                first_row_number=2, on_chunk=None):
+    """
+    Parses positional CSV rows into a TransactionStore.
+
+    Rows are streamed from the reader and appended into typed buffers.
+    Amounts are multiplied by the decoder's sign so spending is positive; rows
+    that are then negative (payments, refunds) are skipped, and malformed rows
+    are counted in the diagnostics. Each stored row keeps the
+    record_fingerprint of its raw record.
+
+    Args:
+        reader (iterator): A csv.reader positioned after the header.
+        decoder (RowDecoder): Field positions and conventions of the file.
+        parse_date (callable, optional): Maps a date string to a day ordinal.
+            Defaults to a DateParser for the decoder's date format.
+        chunk_rows (int): Rows parsed between progress callbacks.
+        diagnostics (IngestDiagnostics, optional): Collector to fill; a new one is created by default.
+        first_row_number (int): Record number of the first row, used in diagnostics samples.
+        on_chunk (callable, optional): Called with the number of rows read so far after
+            each chunk; raising IngestCancelled from it aborts the parse.
+
+    Returns:
+        IngestResult: The store, date range and diagnostics.
+    """
+    diagnostics = diagnostics if diagnostics is not None else IngestDiagnostics()
+    parse_date = parse_date if parse_date is not None else DateParser(decoder.date_format)
+    date_index, amount_index, category_index = decoder.date_index, decoder.amount_index, decoder.category_index
+    sign = decoder.sign
+    default_category = decoder.default_category
+    builder = TransactionStoreBuilder()
+    first_day = last_day = None
+
+    row_number = first_row_number - 1
+    while True:
+        chunk_start = row_number
+        # Rows are consumed straight off the reader, so each row list is freed as soon
+        # as it is decoded instead of piling up in a chunk for the garbage collector.
+        for row in islice(reader, chunk_rows):
+            row_number += 1
+            if not row:
+                continue
+            diagnostics.rows_read += 1
+            try:
+                day = parse_date(row[date_index])
+                if first_day is None or day < first_day:
+                    first_day = day
+                if last_day is None or day > last_day:
+                    last_day = day
+
+                amount = sign * float(row[amount_index])
+                if amount < 0:
+                    diagnostics.rows_skipped += 1
+                    continue
+
+                category = row[category_index] if category_index is not None else default_category
+                builder.append(day, category, amount, record_fingerprint(row))
+            except (ValueError, IndexError) as e:
+                diagnostics.record_error(row_number, row, e)
+        if row_number == chunk_start:
+            break
+        if on_chunk is not None:
+            on_chunk(diagnostics.rows_read)
+
+    diagnostics.rows_loaded = len(builder)
+    records = row_number - first_row_number + 1
+    return IngestResult(builder.build(), first_day, last_day, diagnostics, records)
+
+
+def ingest_statement(file, schema, chunk_rows=DEFAULT_CHUNK_ROWS, diagnostics=None, date_parser=None,
+                     on_chunk=None):
+    """
+    Streams a statement CSV into a TransactionStore.
+
+    The header is compiled into a positional RowDecoder once; rows are then
+    streamed through a csv.reader and appended into typed buffers, so memory
+    stays bounded by the output columns. Payments and refunds are skipped;
+    malformed rows are counted in the diagnostics.
+
+    Args:
+        file (file object): An open text file positioned at the header.
+        schema (BankSchema): Column names and conventions of the statement format.
+        chunk_rows (int): Rows parsed between progress callbacks.
+        diagnostics (IngestDiagnostics, optional): Collector to fill; a new one is created by default.
+        date_parser (callable, optional): Maps a date string to a day ordinal. Defaults to a DateParser for the schema.
+        on_chunk (callable, optional): Progress callback, see ingest_rows.
+
+    Returns:
+        IngestResult: The store, date range and diagnostics.
+
+    Raises:
+        KeyError: If a required column is missing from the header.
+    """
+    diagnostics = diagnostics if diagnostics is not None else IngestDiagnostics()
+
+    reader = csv.reader(file)
+    header = next(reader, None)
+    if header is None:
+        return IngestResult(TransactionStore.empty(), None, None, diagnostics)
+    return ingest_rows(reader, schema.compile(header), date_parser, chunk_rows, diagnostics, on_chunk=on_chunk)
+
+
+def merge_ingest_results(results):
+    """
+    Concatenates the results of parsing consecutive parts of one file, in order.
+
+    Category codes are re-assigned in first-seen order and rows are stably
+    re-sorted by day, so the merged store is identical to a serial parse.
+
+    Args:
+        results (list[IngestResult]): Per-part results in file order.
+
+    Returns:
+        IngestResult: The combined store, date range and diagnostics.
+    """
+    diagnostics = IngestDiagnostics()
+    first_days = [r.first_day for r in results if r.first_day is not None]
+    last_days = [r.last_day for r in results if r.last_day is not None]
+    records = 0
+    for result in results:
+        part = result.diagnostics
+        diagnostics.rows_read += part.rows_read
+        diagnostics.rows_loaded += part.rows_loaded
+        diagnostics.rows_skipped += part.rows_skipped
+        diagnostics.bad_rows += part.bad_rows
+        for row_number, row, error in part.samples:
+            if len(diagnostics.samples) < diagnostics.max_samples:
+                diagnostics.samples.append((row_number + records, row, error))
+        records += result.records
+    return IngestResult(
+        TransactionStore.concat([r.store for r in results]),
+        min(first_days) if first_days else None,
+        max(last_days) if last_days else None,
+        diagnostics,
+        records,
+    )
+
+
+def find_record_end(mm, position, in_quotes=False):
+    """
+    Finds the end of the CSV record containing `position`.
+
+    Assumes RFC 4180 quoting (quote characters only appear in quoted fields, with
+    embedded quotes doubled), so quote parity tells whether a newline is a record
+    separator or part of a quoted field.
+
+    Args:
+        mm (mmap.mmap or bytes): The file contents.
+        position (int): Byte offset to start searching from.
+        in_quotes (bool): Whether `position` lies inside a quoted field.
+
+    Returns:
+        int: Offset just past the record's terminating newline, or len(mm).
+    """
+    while True:
+        newline = mm.find(b'\n', position)
+        if newline == -1:
+            return len(mm)
+        if mm[position:newline].count(b'"') % 2:
+            in_quotes = not in_quotes
+        if not in_quotes:
+            return newline + 1
+        position = newline + 1
+
+
+def split_record_ranges(mm, data_start, part_bytes=PART_BYTES):
+    """
+    Splits the data section of a CSV into byte ranges that start and end on record boundaries.
+
+    Quote parity at each tentative split point is tracked with a running
+    count of quote characters (a C-speed bytes.count per block), then the split
+    is moved forward to the next newline that is outside a quoted field.
+
+    Args:
+        mm (mmap.mmap): The memory-mapped file.
+        data_start (int): Offset of the first data record (just past the header).
+        part_bytes (int): Approximate size of each range.
+
+    Returns:
+        list[tuple[int, int]]: (start, end) byte offsets covering [data_start, len(mm)).
+    """
+    size = len(mm)
+    ranges = []
+    start = data_start
+    scanned = data_start
+    in_quotes = False
+    while start < size:
+        target = start + part_bytes
+        if target >= size:
+            ranges.append((start, size))
+            break
+        in_quotes ^= bool(mm[scanned:target].count(b'"') % 2)
+        end = find_record_end(mm, target, in_quotes)
+        ranges.append((start, end))
+        # Everything before `end` has been accounted for and `end` is outside quotes.
+        start = scanned = end
+        in_quotes = False
+    return ranges
+
+
+def ingest_csv_bytes(data, decoder, first_row_number=1):
+    """
+    Parses raw CSV bytes holding complete data records (no header).
+
+    Args:
+        data (bytes): The records, decoded like a text-mode open() of the file.
+        decoder (RowDecoder): Field positions and conventions of the file.
+        first_row_number (int): Record number of the first row, used in diagnostics samples.
+
+    Returns:
+        IngestResult: The parsed rows.
+    """
+    text = io.TextIOWrapper(io.BytesIO(data), newline='')
+    return ingest_rows(csv.reader(text), decoder, first_row_number=first_row_number)
+
+
+def read_header(path):
+    """
+    Reads the header record of a CSV file.
+
+    Args:
+        path (str): Path to the CSV file.
+
+    Returns:
+        list[str]: The header fields, or an empty list for an empty file.
+    """
+    with open(path, 'r', newline='') as file:
+        return next(csv.reader(file), [])
+
+
+def hash_file_prefix(file, end):
+    """
+    Hashes the first `end` bytes of a binary file.
+
+    Returns:
+        tuple: The blake2b hash object, still open for further updates, and the last
+        byte hashed (empty if `end` is 0).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    file.seek(0)
+    remaining = end
+    block = b''
+    while remaining > 0:
+        block = file.read(min(HASH_BLOCK_BYTES, remaining))
+        if not block:
+            break
+        digest.update(block)
+        remaining -= len(block)
+    return digest, block[-1:]
+
+
+def source_position(path):
+    """
+    Measures and checksums a whole file, in the form of IngestResult.source_position.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        tuple[int, str, bool]: (size, checksum, whether the file is empty or ends with a newline).
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    with open(path, 'rb') as file:
+        end = file.seek(0, os.SEEK_END)
+        digest, last_byte = hash_file_prefix(file, end)
+    return end, digest.hexdigest(), last_byte in (b'', b'\n')
+
+
+class _HashingReader(io.RawIOBase):
+    """
+    Raw binary reader that checksums every byte it hands out, so a file is
+    hashed in the same pass that parses it.
+    """
+
+    def __init__(self, raw):
+        super().__init__()
+        self._raw = raw
+        self._digest = hashlib.blake2b(digest_size=16)
+        self._size = 0
+        self._last_byte = b''
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = self._raw.readinto(buffer)
+        if count:
+            data = memoryview(buffer)[:count]
+            self._digest.update(data)
+            self._size += count
+            self._last_byte = bytes(data[-1:])
+        return count
+
+    def position(self):
+        """
+        Returns:
+            tuple[int, str, bool]: The bytes read so far, as from source_position().
+        """
+        return self._size, self._digest.hexdigest(), self._last_byte in (b'', b'\n')
+
+
+def _ingest_byte_range(path, start, end, decoder):
+    """
+    Worker entry point: parses one record-aligned byte range of a CSV file.
+
+    Returns:
+        IngestResult: The parsed rows of the range.
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        data = mm[start:end]
+    return ingest_csv_bytes(data, decoder)
+
+
+def ingest_statement_file(path, schema, parallel=True, max_workers=None, min_parallel_bytes=PARALLEL_MIN_BYTES,
+                          part_bytes=PART_BYTES, on_chunk=None):
+    """
+    Parses a statement CSV file, splitting large files across worker processes.
+
+    Small files (or parallel=False) go through ingest_statement on one core.
+    Large files are memory-mapped, split into record-aligned byte ranges,
+    parsed by a process pool and merged in order, which yields the same store,
+    date range and diagnostics as a serial parse. Either way the bytes parsed
+    are checksummed in the same pass, so the result's source_position describes
+    exactly what was consumed even if the file grows meanwhile.
+
+    Args:
+        path (str): Path to the CSV file.
+        schema (BankSchema): Column names and conventions of the statement format.
+        parallel (bool): Allow multi-process parsing of large files.
+        max_workers (int, optional): Pool size. Defaults to the number of CPUs.
+        min_parallel_bytes (int): Smallest file size that is split across processes.
+        part_bytes (int): Approximate size of each byte range.
+        on_chunk (callable, optional): Called with the number of rows read so far, after
+            each chunk (serial) or each finished byte range (parallel); raising
+            IngestCancelled from it aborts the parse.
+
+    Returns:
+        IngestResult: The store, date range, diagnostics and source position.
+
+    Raises:
+        KeyError: If a required column is missing from the header.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if not parallel or workers < 2 or os.path.getsize(path) < min_parallel_bytes:
+        with open(path, 'rb', buffering=0) as raw:
+            source = _HashingReader(raw)
+            file = io.TextIOWrapper(io.BufferedReader(source, HASH_BLOCK_BYTES), newline='')
+            result = ingest_statement(file, schema, on_chunk=on_chunk)
+        result.source_position = source.position()
+        return result
+
+    # The mapping's length is fixed, so the workers and the checksum see the same bytes.
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header_end = find_record_end(mm, 0)
+        header_text = io.TextIOWrapper(io.BytesIO(mm[:header_end]), newline='')
+        header = next(csv.reader(header_text), [])
+        decoder = schema.compile(header)
+        ranges = split_record_ranges(mm, header_end, part_bytes)
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges)), mp_context=POOL_CONTEXT) as executor:
+            futures = [executor.submit(_ingest_byte_range, path, start, end, decoder) for start, end in ranges]
+            rows_read = 0
+            try:
+                # Checksum while the workers parse
+                digest, last_byte = hash_file_prefix(mm, len(mm))
+                position = (len(mm), digest.hexdigest(), last_byte in (b'', b'\n'))
+                for future in as_completed(futures):
+                    rows_read += future.result().diagnostics.rows_read
+                    if on_chunk is not None:
+                        on_chunk(rows_read)
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            results = [future.result() for future in futures]
+    merged = merge_ingest_results(results)
+    # Part row numbers are relative to their range; shift past the header.
+    merged.diagnostics.samples = [(row + 1, fields, error) for row, fields, error in merged.diagnostics.samples]
+    merged.source_position = position
+    return merged
@@ -0,0 +1,82 @@
+import os
+import numpy as np
+
+
+class DeduplicationReport:
+    """
+    Outcome of de-duplicating a set of statements.
+
+    Attributes:
+        keep_masks (list[np.ndarray or None]): Per store, a boolean mask of rows to keep,
+            or None when every row is kept.
+        dropped (list[int]): Per store, how many rows duplicated rows of an earlier store.
+    """
+
+    def __init__(self, keep_masks, dropped):
+        self.keep_masks = keep_masks
+        self.dropped = dropped
+
+    @property
+    def total_dropped(self):
+        """int: Duplicates dropped across all stores."""
+        return sum(self.dropped)
+
+    def summary(self, file_names):
+        """
+        Args:
+            file_names (list[str]): File of each store, in the same order.
+
+        Returns:
+            str: A one-line description of the duplicates dropped per file.
+        """
+        parts = [
+            f"{os.path.basename(name)}: {count}"
+            for name, count in zip(file_names, self.dropped) if count
+        ]
+        if not parts:
+            return "No duplicate transactions found."
+        return f"Dropped {self.total_dropped} duplicate transactions ({', '.join(parts)})."
+
+
+def find_duplicates(stores):
+    """
+    Finds transactions that appear in more than one statement, in a single pass.
+
+    A transaction is identified by its record fingerprint together with its
+    occurrence ordinal, i.e. how many identical records precede it in the same
+    file, so two genuine identical purchases on one day stay two transactions.
+    A hash index maps each fingerprint to the most occurrences any earlier
+    store contained; a row is a duplicate when an earlier store already holds
+    that occurrence. Earlier stores win, and the cost is linear in the total
+    number of rows. Stores without fingerprints are kept whole.
+
+    Args:
+        stores (list[TransactionStore]): Stores in priority order.
+
+    Returns:
+        DeduplicationReport: The rows to keep and the duplicates dropped per store.
+    """
+    seen = {}
+    keep_masks = []
+    dropped = []
+    for store in stores:
+        if store.fingerprints is None or not len(store):
+            keep_masks.append(None)
+            dropped.append(0)
+            continue
+
+        occurrences = {}
+        keep = []
+        for fingerprint in store.fingerprints.tolist():
+            ordinal = occurrences.get(fingerprint, 0)
+            occurrences[fingerprint] = ordinal + 1
+            keep.append(ordinal >= seen.get(fingerprint, 0))
+        for fingerprint, count in occurrences.items():
+            if count > seen.get(fingerprint, 0):
+                seen[fingerprint] = count
+
+        mask = np.array(keep, dtype=bool)
+        duplicates = len(keep) - int(mask.sum())
+        keep_masks.append(mask if duplicates else None)
+        dropped.append(duplicates)
+    return DeduplicationReport(keep_masks, dropped)
@@ -0,0 +1,143 @@
+import numpy as np
+
+# Day ordinal of 1970-01-01, the epoch of plot timestamps and numpy datetime64
+EPOCH_ORDINAL = 719163
+SECONDS_PER_DAY = 86400
+
+
+def to_timestamp(days):
+    """
+    Converts day ordinals to POSIX timestamps (UTC midnight), the x unit of date axes.
+
+    Args:
+        days (int or np.ndarray): Day ordinals.
+
+    Returns:
+        float or np.ndarray: Seconds since 1970-01-01.
+    """
+    return (np.asarray(days, dtype=np.float64) - EPOCH_ORDINAL) * SECONDS_PER_DAY
+
+
+def from_timestamp(seconds):
+    """
+    Args:
+        seconds (float): POSIX timestamp.
+
+    Returns:
+        int: Day ordinal containing the timestamp.
+    """
+    return int(np.floor(seconds / SECONDS_PER_DAY)) + EPOCH_ORDINAL
+
+
+class PyramidLevel:
+    """
+    Daily values decimated into buckets of one calendar unit.
+
+    Attributes:
+        name (str): 'day', 'week', 'month' or 'quarter'.
+        starts (np.ndarray): Day ordinal on which each bucket starts.
+        lengths (np.ndarray): Number of days in each bucket (the first and last may be partial).
+        sums (np.ndarray): Total of the daily values in each bucket.
+        mins (np.ndarray): Smallest daily value in each bucket.
+        maxs (np.ndarray): Largest daily value in each bucket.
+    """
+
+    def __init__(self, name, starts, lengths, sums, mins, maxs):
+        self.name = name
+        self.starts = starts
+        self.lengths = lengths
+        self.sums = sums
+        self.mins = mins
+        self.maxs = maxs
+
+    def __len__(self):
+        return int(self.starts.size)
+
+    def means(self):
+        """
+        Returns:
+            np.ndarray: Average daily value in each bucket, comparable across levels.
+        """
+        return self.sums / self.lengths
+
+    def bounds(self, start_day, end_day):
+        """
+        Finds the buckets overlapping an inclusive day range.
+
+        Args:
+            start_day (int): First day ordinal.
+            end_day (int): Last day ordinal.
+
+        Returns:
+            tuple[int, int]: Bucket bounds (lo, hi) such that buckets[lo:hi] overlap the range.
+        """
+        lo = max(int(np.searchsorted(self.starts, start_day, side='right')) - 1, 0)
+        hi = int(np.searchsorted(self.starts, end_day, side='right'))
+        return lo, max(lo, hi)
+
+
+class SpendingPyramid:
+    """
+    Level-of-detail pyramid of a daily spending series: day -> week -> month -> quarter.
+
+    Every level is computed once, with one reduceat per statistic over the
+    daily array, so a chart can pick the level that keeps the number of drawn
+    points bounded for whatever date range is in view.
+
+    Attributes:
+        start_day (int): Day ordinal of the first daily value.
+        levels (list[PyramidLevel]): Levels from finest to coarsest.
+    """
+
+    def __init__(self, start_day, daily):
+        """
+        Args:
+            start_day (int): Day ordinal of daily[0].
+            daily (np.ndarray): One value per consecutive day.
+        """
+        self.start_day = start_day
+        daily = np.asarray(daily, dtype=np.float64)
+        days = start_day + np.arange(daily.size)
+        dates = (days - EPOCH_ORDINAL).astype('datetime64[D]')
+        months = dates.astype('datetime64[M]').astype(np.int64)
+        boundaries = {
+            'day': np.ones(daily.size, dtype=bool),
+            # Ordinal 1 (0001-01-01) is a Monday, so Mondays satisfy (day - 1) % 7 == 0.
+            'week': (days - 1) % 7 == 0,
+            'month': np.diff(months, prepend=months[:1] - 1) != 0,
+            'quarter': np.diff(months // 3, prepend=months[:1] // 3 - 1) != 0,
+        }
+        self.levels = []
+        for name, is_start in boundaries.items():
+            if not daily.size:
+                empty = np.empty(0)
+                self.levels.append(PyramidLevel(name, empty.astype(np.int64), empty, empty, empty, empty))
+                continue
+            is_start[0] = True
+            index = np.flatnonzero(is_start)
+            self.levels.append(PyramidLevel(
+                name,
+                days[index],
+                np.diff(np.append(index, daily.size)),
+                np.add.reduceat(daily, index),
+                np.minimum.reduceat(daily, index),
+                np.maximum.reduceat(daily, index),
+            ))
+
+    def level_for(self, start_day, end_day, max_buckets):
+        """
+        Picks the finest level that shows a day range in at most `max_buckets` buckets.
+
+        Args:
+            start_day (int): First day ordinal in view.
+            end_day (int): Last day ordinal in view.
+            max_buckets (int): Bucket budget for the range.
+
+        Returns:
+            PyramidLevel: The chosen level, or the coarsest level if none fits.
+        """
+        for level in self.levels:
+            lo, hi = level.bounds(start_day, end_day)
+            if hi - lo <= max_buckets:
+                return level
+        return self.levels[-1]
@@ -0,0 +1,13 @@
+from .bank_schemas import OFX_CSV
+from .schema_activity_processing import SchemaActProc
+
+
+class OfxCsvActProc(SchemaActProc):
+    """
+    Processes bank statements converted from OFX/QFX downloads to CSV.
+
+    Dates are ISO formatted and debits are negative; the schema flips them so spending is positive.
+    Attributes are the same as DiscoverActProc.
+    """
+
+    SCHEMA = OFX_CSV
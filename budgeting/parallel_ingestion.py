@@ -0,0 +1,168 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .bank_schemas import sniff_file
+from .csv_ingestion import POOL_CONTEXT, IngestCancelled
+from .amex_activity_processing import AmexActProc
+from .chase_activity_processing import ChaseActProc
+from .discover_activity_processing import DiscoverActProc
+from .ofx_activity_processing import OfxCsvActProc
+
+# Processor class for each supported bank type, keyed by schema name
+PROCESSOR_TYPES = {
+    processor.SCHEMA.name: processor
+    for processor in (DiscoverActProc, ChaseActProc, AmexActProc, OfxCsvActProc)
+}
+
+
+def expand_statement_paths(paths):
+    """
+    Expands a directory or a list of files/directories into statement CSV paths.
+
+    Args:
+        paths (str or list[str]): A directory, a file, or a list of either.
+
+    Returns:
+        list[str]: CSV file paths, with directory contents in sorted order.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    expanded = []
+    for path in paths:
+        if os.path.isdir(path):
+            expanded.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if name.lower().endswith('.csv') and os.path.isfile(os.path.join(path, name))
+            )
+        else:
+            expanded.append(path)
+    return expanded
+
+
+def detect_bank_type(path):
+    """
+    Sniffs the bank type of a statement file from its header line.
+
+    Args:
+        path (str): Path to the statement CSV.
+
+    Returns:
+        str: A key into PROCESSOR_TYPES.
+
+    Raises:
+        ValueError: If the header matches no registered bank schema.
+    """
+    return sniff_file(path).name
+
+
+def parse_statement(path, bank_type='Discover'):
+    """
+    Worker entry point: parses one statement file into columnar data.
+
+    Runs in a child process, so it only returns picklable data (numpy columns,
+    category names and diagnostics), never a processor object.
+
+    Args:
+        path (str): Path to the statement CSV.
+        bank_type (str): Key into PROCESSOR_TYPES.
+
+    Returns:
+        IngestResult: The parsed store, date range and diagnostics.
+    """
+    # Files are already spread across processes, so don't split each one further.
+    return PROCESSOR_TYPES[bank_type].parse_file(path, parallel=False)
+
+
+def ingest_files(paths, bank_type=None, max_workers=None, progress=None):
+    """
+    Parses many statement files in parallel with a process pool.
+
+    Args:
+        paths (str or list[str]): Files and/or directories to import.
+        bank_type (str, optional): Bank type shared by every file. By default each
+            file's type is sniffed from its header line.
+        max_workers (int, optional): Pool size. Defaults to the number of CPUs.
+        progress (callable, optional): Called as progress(files_done, total_files, rows_read)
+            after every chunk (one process) or finished file (process pool); raising
+            IngestCancelled from it stops the import.
+
+    Returns:
+        list[tuple]: (path, bank type, IngestResult or None, error or None) for each file, in input order.
+    """
+    outcomes = []
+    jobs = []
+    for path in expand_statement_paths(paths):
+        try:
+            jobs.append((path, bank_type or detect_bank_type(path)))
+            outcomes.append(None)
+        except Exception as e:
+            outcomes.append((path, None, None, e))
+    if not jobs:
+        return outcomes
+    max_workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+
+    total = len(jobs)
+    rows_done = 0
+    parsed = []
+    if max_workers == 1:
+        for done, (path, job_type) in enumerate(jobs):
+            on_chunk = None
+            if progress is not None:
+                on_chunk = lambda rows, done=done: progress(done, total, rows_done + rows)
+            try:
+                # A single file may still be split across processes by parse_file.
+                result = PROCESSOR_TYPES[job_type].parse_file(path, parallel=total == 1, on_chunk=on_chunk)
+            except IngestCancelled:
+                raise
+            except Exception as e:
+                parsed.append((path, job_type, None, e))
+                continue
+            parsed.append((path, job_type, result, None))
+            rows_done += result.diagnostics.rows_read
+            if progress is not None:
+                progress(done + 1, total, rows_done)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=POOL_CONTEXT) as executor:
+            futures = [executor.submit(parse_statement, path, job_type) for path, job_type in jobs]
+            if progress is not None:
+                try:
+                    for done, future in enumerate(as_completed(futures), 1):
+                        if future.exception() is None:
+                            rows_done += future.result().diagnostics.rows_read
+                        progress(done, total, rows_done)
+                except BaseException:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+            for (path, job_type), future in zip(jobs, futures):
+                try:
+                    parsed.append((path, job_type, future.result(), None))
+                except Exception as e:
+                    parsed.append((path, job_type, None, e))
+
+    parsed = iter(parsed)
+    return [outcome if outcome is not None else next(parsed) for outcome in outcomes]
+
+
+def load_processors(paths, bank_type=None, bls_comparator=None, max_workers=None, progress=None):
+    """
+    Imports statement files in parallel and wraps each parsed file in a processor.
+
+    Args:
+        paths (str or list[str]): Files and/or directories to import.
+        bank_type (str, optional): Bank type shared by every file. By default each
+            file's type is sniffed from its header line.
+        bls_comparator (optional): Comparator handed to each processor.
+        max_workers (int, optional): Pool size. Defaults to the number of CPUs.
+        progress (callable, optional): Progress callback, see ingest_files.
+
+    Returns:
+        tuple[list, list]: (processors, failures) where failures holds (path, error) pairs.
+    """
+    processors = []
+    failures = []
+    for path, file_type, result, error in ingest_files(paths, bank_type, max_workers, progress):
+        if error is not None:
+            failures.append((path, error))
+            continue
+        processor_class = PROCESSOR_TYPES[file_type]
+        processors.append(processor_class(path, bls_comparator=bls_comparator, ingest_result=result))
+    return processors, failures
@@ -0,0 +1,240 @@
+import numpy as np
+from .lod_pyramid import SpendingPyramid
+from .transaction_store import TransactionStore, from_ordinal, to_ordinal
+
+
+class Portfolio:
+    """
+    Combined view of the transaction stores of several accounts.
+
+    The date range comes from each store's first and last day, so it costs
+    O(accounts). The merged chronological store is only built when asked for,
+    then reused. Each store is already sorted by day, and the stable sort in
+    TransactionStore.concat merges those k sorted runs in O(n log k).
+
+    Attributes:
+        stores (list[TransactionStore]): The non-empty stores, in account order.
+    """
+
+    def __init__(self, stores):
+        """
+        Args:
+            stores (list[TransactionStore]): Day-sorted stores, one per account.
+        """
+        self.stores = [store for store in stores if len(store)]
+        self._merged = None
+
+    def __len__(self):
+        return sum(len(store) for store in self.stores)
+
+    @property
+    def min_day(self):
+        """int or None: The earliest day ordinal across all accounts."""
+        return min(store.min_day for store in self.stores) if self.stores else None
+
+    @property
+    def max_day(self):
+        """int or None: The latest day ordinal across all accounts."""
+        return max(store.max_day for store in self.stores) if self.stores else None
+
+    def date_range(self):
+        """
+        Returns:
+            tuple: (first date, last date) as datetimes, or (None, None) if there are no transactions.
+        """
+        if not self.stores:
+            return None, None
+        return from_ordinal(self.min_day), from_ordinal(self.max_day)
+
+    def merged(self):
+        """
+        Returns:
+            TransactionStore: Every account's transactions in one chronological store.
+        """
+        if self._merged is None:
+            self._merged = self.stores[0] if len(self.stores) == 1 else TransactionStore.concat(self.stores)
+        return self._merged
+
+
+class PortfolioAggregate:
+    """
+    Weekly spending of several accounts merged into one model, built once per analysis.
+
+    Every view of the analysis (trend plot, budget table, BLS comparison) reads
+    from this object, so the per-account results are merged once and every
+    number has one definition: a category's weekly average is its total over
+    the analysis window divided by the number of weeks in the window.
+
+    Attributes:
+        start_date (datetime): First day of the analysis window.
+        end_date (datetime): Last day of the analysis window.
+        week_starts (list[datetime]): Start date of each week; the first is start_date.
+        num_weeks (int): Number of weekly buckets.
+        categories (list[str]): Category names indexing the matrix columns, in first-seen order.
+        weekly_totals (np.ndarray): Total spending per week, shape (num_weeks,).
+        category_totals (np.ndarray): Spending per week and category, shape (num_weeks, len(categories)).
+        category_counts (np.ndarray): Transaction counts per week and category, same shape.
+        average_by_category (dict): Category -> average weekly spending over the window,
+            for categories with at least one transaction in it.
+        groups (list[str]): Display names after category grouping, in first-seen order;
+            an ungrouped category is its own group.
+        group_members (dict): Group -> the categories it rolls up.
+        group_totals (np.ndarray): Spending per week and group, shape (num_weeks, len(groups)).
+        average_by_group (dict): Group -> average weekly spending over the window, for active groups.
+        start_day (int or None): Day ordinal of the first day of the window.
+        daily_group_totals (np.ndarray or None): Spending per day and group, shape
+            (days in window, len(groups)); None if the stores were not given.
+    """
+
+    def __init__(self, results, group_mapping=None, stores=None):
+        """
+        Args:
+            results (list[AnalysisResult]): Results of the accounts, all over the same window.
+            group_mapping (dict, optional): Category -> group name, as returned by
+                CategoryManager.get_category_mapping().
+            stores (list[TransactionStore], optional): The store each result was computed
+                from, aligned with `results`; enables the daily series.
+        """
+        if stores is not None:
+            stores = [store for store, result in zip(stores, results) if result is not None]
+        results = [result for result in results if result is not None]
+        group_mapping = group_mapping or {}
+        first = results[0] if results else None
+        self.start_date = first.start_date if first else None
+        self.end_date = first.end_date if first else None
+        self.week_starts = [from_ordinal(day) for day in first.aggregate.week_start_days()] if first else []
+        if self.week_starts:
+            self.week_starts[0] = self.start_date
+        self.num_weeks = len(self.week_starts)
+
+        self.categories = []
+        category_index = {}
+        for result in results:
+            for name in result.aggregate.categories:
+                if name not in category_index:
+                    category_index[name] = len(self.categories)
+                    self.categories.append(name)
+        shape = (self.num_weeks, len(self.categories))
+        self.category_totals = np.zeros(shape)
+        self.category_counts = np.zeros(shape, dtype=np.int64)
+        for result in results:
+            columns = [category_index[name] for name in result.aggregate.categories]
+            self.category_totals[:, columns] += result.aggregate.category_totals
+            self.category_counts[:, columns] += result.aggregate.category_counts
+        self.weekly_totals = self.category_totals.sum(axis=1)
+
+        self.groups = []
+        self.group_members = {}
+        self._group_index = {}
+        group_columns = np.empty(len(self.categories), dtype=np.intp)
+        for code, name in enumerate(self.categories):
+            group = group_mapping.get(name, name)
+            if group not in self._group_index:
+                self._group_index[group] = len(self.groups)
+                self.group_members[group] = []
+                self.groups.append(group)
+            self.group_members[group].append(name)
+            group_columns[code] = self._group_index[group]
+        self.group_totals = np.zeros((self.num_weeks, len(self.groups)))
+        group_counts = np.zeros((self.num_weeks, len(self.groups)), dtype=np.int64)
+        np.add.at(self.group_totals.T, group_columns, self.category_totals.T)
+        np.add.at(group_counts.T, group_columns, self.category_counts.T)
+
+        self.average_by_category = self._averages(self.categories, self.category_totals, self.category_counts)
+        self.average_by_group = self._averages(self.groups, self.group_totals, group_counts)
+
+        self.start_day = to_ordinal(self.start_date) if first else None
+        self.daily_group_totals = None
+        if stores is not None and first:
+            self.daily_group_totals = self._daily_group_totals(stores, category_index, group_columns)
+        self._pyramids = {}
+
+    def _daily_group_totals(self, stores, category_index, group_columns):
+        """
+        Buckets every store's rows in the window by (day, group) with one bincount per store.
+
+        Returns:
+            np.ndarray: Spending per day and group.
+        """
+        num_days = to_ordinal(self.end_date) - self.start_day + 1
+        num_groups = len(self.groups)
+        totals = np.zeros(num_days * num_groups)
+        for store in stores:
+            lo, hi = store.day_bounds(self.start_day, self.start_day + num_days - 1)
+            columns = group_columns[[category_index[name] for name in store.categories]]
+            cells = (store.days[lo:hi].astype(np.int64) - self.start_day) * num_groups + columns[store.category_codes[lo:hi]]
+            totals += np.bincount(cells, weights=store.amounts[lo:hi], minlength=totals.size)
+        return totals.reshape(num_days, num_groups)
+
+    def daily_series(self, group):
+        """
+        Args:
+            group (str): A group name, an ungrouped category name, or None for total spending.
+
+        Returns:
+            np.ndarray or None: Spending per day of the window, or None if unavailable.
+        """
+        if self.daily_group_totals is None:
+            return None
+        if group is None:
+            return self.daily_group_totals.sum(axis=1)
+        column = self._group_index.get(group)
+        return None if column is None else self.daily_group_totals[:, column]
+
+    def pyramid(self, group):
+        """
+        Returns the level-of-detail pyramid of a daily series, built on first use.
+
+        Args:
+            group (str or None): As for daily_series.
+
+        Returns:
+            SpendingPyramid or None: The pyramid, or None if the series is unavailable.
+        """
+        if group not in self._pyramids:
+            daily = self.daily_series(group)
+            self._pyramids[group] = None if daily is None else SpendingPyramid(self.start_day, daily)
+        return self._pyramids[group]
+
+    def _averages(self, names, totals, counts):
+        """
+        Returns:
+            dict: For each column with at least one transaction, its total divided by
+                the number of weeks in the window.
+        """
+        if not self.num_weeks:
+            return {}
+        averages = (totals.sum(axis=0) / self.num_weeks).tolist()
+        active = counts.sum(axis=0) > 0
+        return {name: average for name, average, is_active in zip(names, averages, active) if is_active}
+
+    @property
+    def total_spent(self):
+        """float: Total spending over the window."""
+        return float(self.weekly_totals.sum())
+
+    @property
+    def num_transactions(self):
+        """int: Number of transactions in the window."""
+        return int(self.category_counts.sum())
+
+    def active_categories(self):
+        """
+        Returns:
+            list[str]: Categories with at least one transaction in the window.
+        """
+        active = self.category_counts.sum(axis=0) > 0
+        return [name for name, is_active in zip(self.categories, active) if is_active]
+
+    def group_series(self, group):
+        """
+        Args:
+            group (str): A group name, or an ungrouped category name.
+
+        Returns:
+            np.ndarray or None: Spending per week for the group, or None if it is unknown.
+        """
+        column = self._group_index.get(group)
+        if column is None:
+            return None
+        return self.group_totals[:, column]
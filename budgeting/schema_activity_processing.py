@@ -0,0 +1,86 @@
+from .bank_activity_processing import BankActProc
+from .csv_ingestion import ingest_csv_bytes, ingest_statement_file, read_header
+from .statement_cache import get_statement_cache
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaActProc(BankActProc):
+    """
+    Processor for any statement format described by a BankSchema.
+
+    Subclasses only set SCHEMA; parsing, caching and refresh() are shared, so
+    every bank uses the same positional, typed ingestion path.
+
+    Attributes:
+        SCHEMA (BankSchema): Columns and conventions of the bank's CSV export.
+    """
+
+    SCHEMA = None
+
+    @classmethod
+    def parse_file(cls, file_name, parallel=True, use_cache=True, on_chunk=None):
+        """
+        Parses a statement export without constructing a processor. Safe to call
+        in a worker process; the result can be passed back as `ingest_result`.
+
+        Args:
+            file_name (str): Path to the CSV file.
+            parallel (bool): Allow splitting a very large file across worker processes.
+            use_cache (bool): Reuse (and store) parsed columns in the on-disk statement cache.
+            on_chunk (callable, optional): Progress callback receiving the rows read so far;
+                raising IngestCancelled from it aborts the parse.
+
+        Returns:
+            IngestResult: The parsed store, date range, diagnostics and source position.
+        """
+        cache = get_statement_cache() if use_cache else None
+        if cache is not None:
+            cached = cache.load(cache.fingerprint(file_name, cls.__name__))
+            if cached is not None:
+                return cached
+
+        result = ingest_statement_file(file_name, cls.SCHEMA, parallel=parallel, on_chunk=on_chunk)
+        if cache is not None:
+            # Keyed by the bytes actually parsed, in case the file grew since the lookup
+            cache.save(cache.fingerprint(file_name, cls.__name__, result.source_position), result)
+        return result
+
+    def _open_file(self):
+        """
+        Opens and reads the CSV file, storing transaction data.
+
+        Populates:
+            - store with valid transaction entries.
+            - earliest_year and latest_year with date range of transactions.
+
+        Skips:
+            - Payments and refunds (negative amounts once the schema's sign convention is applied).
+            - Rows with missing or malformed data, which are counted and sampled in self.diagnostics.
+        """
+        try:
+            result = self.parse_file(self.file_name)
+        except FileNotFoundError:
+            logger.error("File not found: %s", self.file_name)
+            return
+        except Exception as e:
+            logger.error("An error occurred while opening %s: %s", self.file_name, e)
+            return
+
+        self._load_ingest_result(result)
+        logger.info("[%s] %s", os.path.basename(self.file_name), self.diagnostics.summary())
+
+    def _parse_appended(self, data):
+        """
+        Parses records appended to the file since the last parse.
+
+        Args:
+            data (bytes): Complete CSV records (no header).
+
+        Returns:
+            IngestResult: The parsed rows.
+        """
+        decoder = self.SCHEMA.compile(read_header(self.file_name))
+        return ingest_csv_bytes(data, decoder, first_row_number=2)
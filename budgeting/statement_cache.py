@@ -0,0 +1,201 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import numpy as np
+from .csv_ingestion import PARSER_VERSION, IngestDiagnostics, IngestResult, source_position
+from .transaction_store import TransactionStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join("data", "cache", "statements")
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+_COLUMNS = ('days', 'amounts', 'category_codes', 'fingerprints')
+
+
+class StatementCache:
+    """
+    On-disk cache of parsed statements, so unchanged CSVs are never re-parsed.
+
+    Each entry is a directory holding one .npy file per store column plus a
+    meta.json with the category dictionary, date range, diagnostics and source
+    position. Entries are keyed by the file's path, size and content hash
+    together with the parser name and PARSER_VERSION; hits memory-map the
+    columns instead of reading them. The total size is capped, evicting least recently used
+    entries first.
+
+    Attributes:
+        cache_dir (str): Directory holding the cache entries.
+        max_bytes (int): Size cap for all entries together.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def fingerprint(self, path, parser_name, position=None):
+        """
+        Computes the cache key of a statement file.
+
+        Args:
+            path (str): Path to the statement file.
+            parser_name (str): Identifies the parser (e.g., the processor class).
+            position (tuple, optional): Size and checksum of the content to key, as from
+                source_position() or IngestResult.source_position. Defaults to the file as
+                it is now, which costs a read of the whole file.
+
+        Returns:
+            str: A hex key covering path, size, content and parser version.
+        """
+        if position is None:
+            position = source_position(path)
+        size, checksum, _ = position
+        key = hashlib.blake2b(digest_size=16)
+        for part in (os.path.abspath(path), size, checksum, parser_name, PARSER_VERSION):
+            key.update(str(part).encode('utf-8'))
+            key.update(b'\0')
+        return key.hexdigest()
+
+    def load(self, key):
+        """
+        Loads a cached statement, memory-mapping its columns.
+
+        Args:
+            key (str): Key from fingerprint().
+
+        Returns:
+            IngestResult or None: The cached result, or None on a miss.
+        """
+        entry = os.path.join(self.cache_dir, key)
+        try:
+            with open(os.path.join(entry, 'meta.json'), 'r') as f:
+                meta = json.load(f)
+            if meta.get('parser_version') != PARSER_VERSION or meta.get('source_position') is None:
+                return None
+            days, amounts, codes, fingerprints = (
+                np.load(os.path.join(entry, f"{name}.npy"), mmap_mode='r') for name in _COLUMNS
+            )
+        except (OSError, ValueError):
+            return None
+        os.utime(entry)
+
+        diagnostics = IngestDiagnostics()
+        for name, value in meta['diagnostics'].items():
+            setattr(diagnostics, name, value)
+        diagnostics.samples = [tuple(sample) for sample in diagnostics.samples]
+        store = TransactionStore(days, amounts, codes, meta['categories'], fingerprints)
+        return IngestResult(store, meta['first_day'], meta['last_day'], diagnostics, meta['records'],
+                            tuple(meta['source_position']))
+
+    def save(self, key, result):
+        """
+        Writes a parsed statement to the cache, then enforces the size cap.
+
+        Args:
+            key (str): Key from fingerprint().
+            result (IngestResult): The parsed statement.
+        """
+        entry = os.path.join(self.cache_dir, key)
+        if os.path.isdir(entry):
+            return
+        staging = f"{entry}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(staging, exist_ok=True)
+            store = result.store
+            for name in _COLUMNS:
+                np.save(os.path.join(staging, f"{name}.npy"), np.ascontiguousarray(getattr(store, name)))
+            diagnostics = result.diagnostics
+            meta = {
+                'parser_version': PARSER_VERSION,
+                'categories': store.categories,
+                'first_day': result.first_day,
+                'last_day': result.last_day,
+                'records': result.records,
+                'source_position': result.source_position,
+                'diagnostics': {
+                    'rows_read': diagnostics.rows_read,
+                    'rows_loaded': diagnostics.rows_loaded,
+                    'rows_skipped': diagnostics.rows_skipped,
+                    'bad_rows': diagnostics.bad_rows,
+                    'samples': diagnostics.samples,
+                    'max_samples': diagnostics.max_samples,
+                },
+            }
+            with open(os.path.join(staging, 'meta.json'), 'w') as f:
+                json.dump(meta, f)
+            os.replace(staging, entry)
+        except OSError as e:
+            logger.warning("Could not write statement cache entry %s: %s", entry, e)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        self.evict()
+
+    def _entries(self):
+        """
+        Returns:
+            list[tuple[float, int, str]]: (last used time, size in bytes, path) for every entry.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            entry = os.path.join(self.cache_dir, name)
+            if not os.path.isdir(entry) or name.endswith('.tmp'):
+                continue
+            size = sum(
+                os.path.getsize(os.path.join(entry, file_name)) for file_name in os.listdir(entry)
+            )
+            entries.append((os.path.getmtime(entry), size, entry))
+        return entries
+
+    def size(self):
+        """
+        Returns:
+            int: Total size of the cache entries in bytes.
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """
+        Removes the oldest entries until the cache fits under max_bytes.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        """
+        Deletes every cache entry.
+
+        Returns:
+            tuple[int, int]: Number of entries and bytes removed.
+        """
+        entries = self._entries()
+        for _, _, entry in entries:
+            shutil.rmtree(entry, ignore_errors=True)
+        return len(entries), sum(size for _, size, _ in entries)
+
+
+_default_cache = None
+
+
+def get_statement_cache():
+    """
+    Returns:
+        StatementCache: The process-wide cache rooted at DEFAULT_CACHE_DIR.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = StatementCache()
+    return _default_cache
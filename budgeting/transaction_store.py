@@ -0,0 +1,374 @@
+from array import array
+from datetime import datetime
+import hashlib
+import numpy as np
+
+DAY_DTYPE = np.int32
+AMOUNT_DTYPE = np.float64
+CATEGORY_DTYPE = np.int16
+FINGERPRINT_DTYPE = np.uint64
+# Number of distinct categories a store can encode in CATEGORY_DTYPE
+MAX_CATEGORIES = int(np.iinfo(CATEGORY_DTYPE).max) + 1
+
+# Columns a store can be ordered by; each sorts ties by the remaining columns
+SORT_KEYS = ('day', 'category', 'amount')
+
+
+def to_ordinal(date_value):
+    """
+    Converts a date or datetime to its proleptic Gregorian day ordinal.
+
+    Args:
+        date_value (date or datetime): The date to convert.
+
+    Returns:
+        int: The day ordinal (1 == 0001-01-01).
+    """
+    return date_value.toordinal()
+
+
+def from_ordinal(day):
+    """
+    Converts a day ordinal back to a midnight datetime, matching the keys
+    produced by parsing statement dates with strptime.
+
+    Args:
+        day (int): The day ordinal.
+
+    Returns:
+        datetime: Midnight of the given day.
+    """
+    return datetime.fromordinal(int(day))
+
+
+class TransactionStore:
+    """
+    Compact, column-oriented storage for parsed transactions.
+
+    Rows are kept sorted by day (stable with respect to file order), so any
+    date window maps to a contiguous slice of the columns.
+
+    Attributes:
+        days (np.ndarray): int32 day ordinals, one per transaction.
+        amounts (np.ndarray): float64 transaction amounts.
+        category_codes (np.ndarray): int16 codes indexing into `categories`.
+        categories (list[str]): Dictionary of category names, indexed by code.
+        fingerprints (np.ndarray or None): uint64 hashes of each source record, used to
+            recognise the same transaction in overlapping statements; None if unknown.
+    """
+
+    def __init__(self, days, amounts, category_codes, categories, fingerprints=None):
+        """
+        Initializes the store from parallel column arrays.
+
+        Args:
+            days (array-like): Day ordinals.
+            amounts (array-like): Transaction amounts.
+            category_codes (array-like): Category codes into `categories`.
+            categories (list[str]): Category names indexed by code.
+            fingerprints (array-like, optional): Record fingerprints.
+        """
+        days = np.asarray(days, dtype=DAY_DTYPE)
+        amounts = np.asarray(amounts, dtype=AMOUNT_DTYPE)
+        category_codes = np.asarray(category_codes, dtype=CATEGORY_DTYPE)
+        if fingerprints is not None:
+            fingerprints = np.asarray(fingerprints, dtype=FINGERPRINT_DTYPE)
+        if days.size and np.any(days[1:] < days[:-1]):
+            # The stable sort is a timsort for int32, so already-sorted runs
+            # (e.g. concatenated day-sorted stores) are merged, not re-sorted.
+            order = np.argsort(days, kind='stable')
+            days, amounts, category_codes = days[order], amounts[order], category_codes[order]
+            if fingerprints is not None:
+                fingerprints = fingerprints[order]
+        self.days = days
+        self.amounts = amounts
+        self.category_codes = category_codes
+        self.fingerprints = fingerprints
+        self.categories = list(categories)
+        self._category_index = {name: code for code, name in enumerate(self.categories)}
+        self._content_hash = None
+        self._permutations = {}
+
+    @classmethod
+    def empty(cls):
+        """
+        Returns:
+            TransactionStore: A store with no transactions.
+        """
+        return cls([], [], [], [], [])
+
+    @classmethod
+    def concat(cls, stores):
+        """
+        Concatenates several stores, re-encoding categories into one dictionary.
+
+        Categories keep their first-seen order across the inputs and rows are
+        stably re-sorted by day, so concatenating the parts of a file gives the
+        same store as parsing it in one go.
+
+        Args:
+            stores (list[TransactionStore]): Stores to combine, in order.
+
+        Returns:
+            TransactionStore: The combined store.
+
+        Raises:
+            ValueError: If the stores have more than MAX_CATEGORIES distinct categories together.
+        """
+        categories = []
+        category_index = {}
+        codes = []
+        for store in stores:
+            remap = np.empty(len(store.categories), dtype=CATEGORY_DTYPE)
+            for code, name in enumerate(store.categories):
+                if name not in category_index:
+                    if len(categories) >= MAX_CATEGORIES:
+                        raise ValueError(f"too many distinct categories (limit {MAX_CATEGORIES}): {name!r}")
+                    category_index[name] = len(categories)
+                    categories.append(name)
+                remap[code] = category_index[name]
+            codes.append(remap[store.category_codes])
+        if not stores:
+            return cls.empty()
+        fingerprints = None
+        if all(store.fingerprints is not None for store in stores):
+            fingerprints = np.concatenate([store.fingerprints for store in stores])
+        return cls(
+            np.concatenate([store.days for store in stores]),
+            np.concatenate([store.amounts for store in stores]),
+            np.concatenate(codes),
+            categories,
+            fingerprints,
+        )
+
+    def take(self, mask):
+        """
+        Selects a subset of rows, keeping the category dictionary.
+
+        Args:
+            mask (np.ndarray): Boolean array with one entry per row.
+
+        Returns:
+            TransactionStore: A store holding the rows where `mask` is True, in order.
+        """
+        return TransactionStore(
+            self.days[mask],
+            self.amounts[mask],
+            self.category_codes[mask],
+            self.categories,
+            None if self.fingerprints is None else self.fingerprints[mask],
+        )
+
+    def __len__(self):
+        return int(self.days.size)
+
+    @property
+    def min_day(self):
+        """int or None: The earliest day ordinal in the store."""
+        return int(self.days[0]) if self.days.size else None
+
+    @property
+    def max_day(self):
+        """int or None: The latest day ordinal in the store."""
+        return int(self.days[-1]) if self.days.size else None
+
+    def content_hash(self):
+        """
+        Fingerprints the stored transactions; computed once and then reused.
+
+        Returns:
+            str: A hex digest that changes whenever any column or category name changes.
+        """
+        if self._content_hash is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for column in (self.days, self.amounts, self.category_codes, self.fingerprints):
+                if column is not None:
+                    digest.update(np.ascontiguousarray(column).tobytes())
+            digest.update('\0'.join(map(str, self.categories)).encode('utf-8'))
+            self._content_hash = digest.hexdigest()
+        return self._content_hash
+
+    def category_code(self, category):
+        """
+        Looks up the code assigned to a category name.
+
+        Args:
+            category (str): The category name.
+
+        Returns:
+            int or None: The category code, or None if the category is unknown.
+        """
+        return self._category_index.get(category)
+
+    def day_bounds(self, start_day=None, end_day=None):
+        """
+        Finds the row slice covering an inclusive range of days.
+
+        Args:
+            start_day (int, optional): First day ordinal. Defaults to the start of the store.
+            end_day (int, optional): Last day ordinal. Defaults to the end of the store.
+
+        Returns:
+            tuple[int, int]: Row bounds (lo, hi) such that rows[lo:hi] fall in the range.
+        """
+        lo = 0 if start_day is None else int(np.searchsorted(self.days, start_day, side='left'))
+        hi = len(self) if end_day is None else int(np.searchsorted(self.days, end_day, side='right'))
+        return lo, max(lo, hi)
+
+    def category_ranks(self):
+        """
+        Returns:
+            np.ndarray: For each category code, the rank of its name in alphabetical order.
+        """
+        ranks = np.empty(len(self.categories), dtype=np.int32)
+        ranks[sorted(range(len(self.categories)), key=self.categories.__getitem__)] = np.arange(len(self.categories))
+        return ranks
+
+    def sort_permutation(self, key='day'):
+        """
+        Returns the row order that sorts the store by one column, ascending.
+
+        Ties are broken by the other columns (day, category name, amount), so
+        every order is deterministic. Each permutation is computed on first use
+        and cached; the store's columns never change after construction.
+
+        Args:
+            key (str): One of SORT_KEYS.
+
+        Returns:
+            np.ndarray: Row indices in sorted order. Reverse it for descending order.
+
+        Raises:
+            ValueError: If `key` is not a sortable column.
+        """
+        permutation = self._permutations.get(key)
+        if permutation is None:
+            ranks = self.category_ranks()[self.category_codes]
+            if key == 'day':
+                # np.lexsort sorts by its last key first
+                keys = (self.amounts, ranks, self.days)
+            elif key == 'category':
+                keys = (self.amounts, self.days, ranks)
+            elif key == 'amount':
+                keys = (ranks, self.days, self.amounts)
+            else:
+                raise ValueError(f"Cannot sort transactions by {key!r}; expected one of {SORT_KEYS}")
+            permutation = np.lexsort(keys)
+            self._permutations[key] = permutation
+        return permutation
+
+    def filter_mask(self, start_day=None, end_day=None, categories=None, min_amount=None, max_amount=None):
+        """
+        Selects rows by date window, category and amount range with vectorized comparisons.
+
+        Args:
+            start_day (int, optional): First day ordinal to keep.
+            end_day (int, optional): Last day ordinal to keep.
+            categories (iterable[str], optional): Category names to keep; None keeps all.
+            min_amount (float, optional): Smallest amount to keep.
+            max_amount (float, optional): Largest amount to keep.
+
+        Returns:
+            np.ndarray: Boolean array with one entry per row.
+        """
+        mask = np.zeros(len(self), dtype=bool)
+        lo, hi = self.day_bounds(start_day, end_day)
+        mask[lo:hi] = True
+        if categories is not None:
+            codes = [self.category_code(name) for name in categories]
+            mask &= np.isin(self.category_codes, [code for code in codes if code is not None])
+        if min_amount is not None:
+            mask &= self.amounts >= min_amount
+        if max_amount is not None:
+            mask &= self.amounts <= max_amount
+        return mask
+
+    def iter_rows(self, lo=0, hi=None):
+        """
+        Iterates over a slice of rows as Python values.
+
+        Args:
+            lo (int): First row index.
+            hi (int, optional): One past the last row index. Defaults to the end of the store.
+
+        Yields:
+            tuple[int, str, float]: (day ordinal, category, amount) for each row.
+        """
+        hi = len(self) if hi is None else hi
+        categories = self.categories
+        days = self.days[lo:hi].tolist()
+        codes = self.category_codes[lo:hi].tolist()
+        amounts = self.amounts[lo:hi].tolist()
+        for day, code, amount in zip(days, codes, amounts):
+            yield day, categories[code], amount
+
+    def to_dict(self):
+        """
+        Builds the legacy {datetime: [(category, amount), ...]} view of the store.
+
+        Returns:
+            dict: A mapping of transaction dates to lists of (category, amount) tuples.
+        """
+        transactions = {}
+        current_day = None
+        for day, category, amount in self.iter_rows():
+            if day != current_day:
+                current_day = day
+                entries = transactions.setdefault(from_ordinal(day), [])
+            entries.append((category, amount))
+        return transactions
+
+
+class TransactionStoreBuilder:
+    """
+    Accumulates parsed rows into growable typed buffers and freezes them into a TransactionStore.
+    """
+
+    def __init__(self):
+        self._days = array('i')
+        self._amounts = array('d')
+        self._codes = array('h')
+        self._fingerprints = array('Q')
+        self._categories = []
+        self._category_index = {}
+
+    def __len__(self):
+        return len(self._days)
+
+    def append(self, day, category, amount, fingerprint=0):
+        """
+        Appends a single transaction.
+
+        Args:
+            day (int): Day ordinal of the transaction.
+            category (str): Category name; encoded to a small integer code.
+            amount (float): Transaction amount.
+            fingerprint (int): 64-bit hash of the source record.
+
+        Raises:
+            ValueError: If `category` would be a new category beyond MAX_CATEGORIES.
+        """
+        code = self._category_index.get(category)
+        if code is None:
+            code = len(self._categories)
+            if code >= MAX_CATEGORIES:
+                raise ValueError(f"too many distinct categories (limit {MAX_CATEGORIES}): {category!r}")
+            self._category_index[category] = code
+            self._categories.append(category)
+        self._days.append(day)
+        self._amounts.append(amount)
+        self._codes.append(code)
+        self._fingerprints.append(fingerprint)
+
+    def build(self):
+        """
+        Returns:
+            TransactionStore: A store holding every appended row, sorted by day.
+        """
+        return TransactionStore(
+            np.frombuffer(self._days, dtype=np.intc).astype(DAY_DTYPE),
+            np.frombuffer(self._amounts, dtype=AMOUNT_DTYPE).copy(),
+            np.frombuffer(self._codes, dtype=np.short).astype(CATEGORY_DTYPE),
+            self._categories,
+            np.frombuffer(self._fingerprints, dtype=np.uint64).copy(),
+        )
@@ -0,0 +1,183 @@
+import numpy as np
+
+
+def week_anchor(day):
+    """
+    Returns the Monday on or before the given day.
+
+    Args:
+        day (int): Day ordinal.
+
+    Returns:
+        int: Day ordinal of the Monday starting that week.
+    """
+    # Ordinal 1 (0001-01-01) is a Monday, so weekday == (day - 1) % 7.
+    return day - (day - 1) % 7
+
+
+def count_weeks(start_day, end_day):
+    """
+    Counts the Monday-aligned weeks touched by an inclusive day range.
+
+    Args:
+        start_day (int): First day ordinal.
+        end_day (int): Last day ordinal.
+
+    Returns:
+        int: Number of weekly buckets, or 0 if the range is empty.
+    """
+    if end_day < start_day:
+        return 0
+    return (end_day - week_anchor(start_day)) // 7 + 1
+
+
+class WeeklyAggregate:
+    """
+    Spending bucketed into weeks that end on Sunday, as produced by aggregate_weekly.
+
+    The first week starts on `start_day` (which may be mid-week); every later
+    week starts on a Monday. The last week is truncated at `end_day`.
+
+    Attributes:
+        start_day (int): First day ordinal of the analysis window.
+        end_day (int): Last day ordinal of the analysis window.
+        anchor_day (int): Monday on or before `start_day`; week k spans anchor_day + 7k onwards.
+        num_weeks (int): Number of weekly buckets.
+        categories (list[str]): Category names indexing the columns of the matrices.
+        weekly_totals (np.ndarray): Total spending per week, shape (num_weeks,).
+        category_totals (np.ndarray): Spending per week and category, shape (num_weeks, len(categories)).
+        category_counts (np.ndarray): Transaction counts per week and category, same shape.
+    """
+
+    def __init__(self, start_day, end_day, categories, weekly_totals, category_totals, category_counts):
+        self.start_day = start_day
+        self.end_day = end_day
+        self.anchor_day = week_anchor(start_day)
+        self.num_weeks = int(weekly_totals.size)
+        self.categories = categories
+        self.weekly_totals = weekly_totals
+        self.category_totals = category_totals
+        self.category_counts = category_counts
+
+    def week_start_days(self):
+        """
+        Returns:
+            list[int]: Day ordinal on which each week starts.
+        """
+        starts = [self.anchor_day + 7 * week for week in range(self.num_weeks)]
+        if starts:
+            starts[0] = self.start_day
+        return starts
+
+    def max_week(self):
+        """
+        Returns:
+            int or None: Index of the first week with the highest spending.
+        """
+        if not self.num_weeks:
+            return None
+        return int(np.argmax(self.weekly_totals))
+
+    def min_full_week(self):
+        """
+        Finds the lowest-spending week among weeks that end on a Sunday,
+        which excludes a trailing partial week.
+
+        Returns:
+            int or None: Index of the first such week, or None if there is none.
+        """
+        complete_weeks = self.num_weeks
+        if complete_weeks and (self.end_day - self.anchor_day) % 7 != 6:
+            complete_weeks -= 1
+        if complete_weeks <= 0:
+            return None
+        return int(np.argmin(self.weekly_totals[:complete_weeks]))
+
+    def average_weekly_spending(self):
+        """
+        Returns:
+            float: Total spending divided by the number of weeks in the window.
+        """
+        if not self.num_weeks:
+            return 0
+        return float(self.weekly_totals.sum()) / self.num_weeks
+
+    def average_spending_by_category(self):
+        """
+        Averages each category over the weeks in which it had at least one transaction.
+
+        Returns:
+            dict: A mapping of category names to average weekly spending.
+        """
+        totals = self.category_totals.sum(axis=0)
+        active_weeks = (self.category_counts > 0).sum(axis=0)
+        return {
+            self.categories[code]: float(totals[code]) / int(active_weeks[code])
+            for code in np.flatnonzero(active_weeks)
+        }
+
+
+def aggregate_weekly(store, start_day, end_day):
+    """
+    Buckets the transactions of a store into weeks in a single vectorized pass.
+
+    Each row in [start_day, end_day] is keyed by (week index, category code)
+    and summed with one bincount, so the cost is linear in the number of
+    transactions rather than in the number of calendar days.
+
+    Args:
+        store (TransactionStore): The transactions to aggregate.
+        start_day (int): First day ordinal of the window.
+        end_day (int): Last day ordinal of the window.
+
+    Returns:
+        WeeklyAggregate: Weekly totals and the week x category matrices.
+    """
+    num_weeks = count_weeks(start_day, end_day)
+    num_categories = len(store.categories)
+    lo, hi = store.day_bounds(start_day, end_day)
+    weeks = (store.days[lo:hi] - week_anchor(start_day)) // 7
+    amounts = store.amounts[lo:hi]
+    cells = weeks.astype(np.int64) * num_categories + store.category_codes[lo:hi]
+    size = num_weeks * num_categories
+
+    category_totals = np.bincount(cells, weights=amounts, minlength=size).reshape(num_weeks, num_categories)
+    category_counts = np.bincount(cells, minlength=size).reshape(num_weeks, num_categories)
+    weekly_totals = np.bincount(weeks, weights=amounts, minlength=num_weeks)
+    return WeeklyAggregate(start_day, end_day, list(store.categories), weekly_totals, category_totals, category_counts)
+
+
+def extend_weekly(previous, store, end_day, since_day):
+    """
+    Updates a weekly aggregate after rows dated `since_day` or later were added to the store.
+
+    Weeks before the one containing `since_day` (and before the previous final,
+    possibly truncated, week) are reused; only the remaining weeks are
+    re-bucketed from the store. The result equals aggregate_weekly over the
+    same window.
+
+    Args:
+        previous (WeeklyAggregate): Aggregate computed before the new rows were added.
+        store (TransactionStore): The updated store; its category dictionary must
+            extend the one `previous` was built from.
+        end_day (int): Last day ordinal of the new window (not before previous.end_day).
+        since_day (int): Earliest day ordinal among the added rows.
+
+    Returns:
+        WeeklyAggregate: The aggregate for [previous.start_day, end_day].
+    """
+    first_week = min((since_day - previous.anchor_day) // 7, previous.num_weeks - 1)
+    if first_week <= 0 or end_day < previous.end_day or store.categories[:len(previous.categories)] != previous.categories:
+        return aggregate_weekly(store, previous.start_day, end_day)
+
+    tail = aggregate_weekly(store, previous.anchor_day + 7 * first_week, end_day)
+    num_categories = len(store.categories)
+    padding = ((0, 0), (0, num_categories - len(previous.categories)))
+    return WeeklyAggregate(
+        previous.start_day,
+        end_day,
+        list(store.categories),
+        np.concatenate([previous.weekly_totals[:first_week], tail.weekly_totals]),
+        np.concatenate([np.pad(previous.category_totals[:first_week], padding), tail.category_totals]),
+        np.concatenate([np.pad(previous.category_counts[:first_week], padding), tail.category_counts]),
+    )
@@ -9,11 +9,21 @@ from ui.theme_manager import apply_theme
 # Directly assign API keys for now (you can switch back to os.getenv if you prefer dotenv)
 
 import sys
+import argparse
 from PyQt6.QtWidgets import QApplication
 from ui.main_window import BudgetApp  # Adjust if your path is different
+from budgeting.statement_cache import get_statement_cache
 
 def main():
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Discovery Budgeting App")
+    parser.add_argument("--clear-cache", action="store_true", help="delete cached parsed statements and exit")
+    args, qt_args = parser.parse_known_args()
+    if args.clear_cache:
+        entries, freed = get_statement_cache().clear()
+        print(f"Cleared {entries} cached statements ({freed / (1024 * 1024):.1f} MB).")
+        return
+
+    app = QApplication(sys.argv[:1] + qt_args)
     apply_theme(app)
     window = BudgetApp()
     window.show()
@@ -0,0 +1,52 @@
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import budgeting.statement_cache as statement_cache
+from budgeting.statement_cache import StatementCache
+
+HEADER = 'Trans. Date,Post Date,Description,Amount,Category\n'
+CATEGORIES = ['Supermarkets', 'Restaurants', 'Gasoline', 'Merchandise', 'Travel/ Entertainment']
+
+
+def discover_rows(count, seed=0, start=date(2021, 1, 4), days=400):
+    """
+    Builds Discover-style CSV records: quoted descriptions with commas, some payments
+    (negative amounts) and the occasional malformed amount.
+
+    Returns:
+        list[str]: The records, each ending in a newline.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for index in range(count):
+        day = start + timedelta(days=rng.randrange(days))
+        amount = 'n/a' if rng.random() < 0.01 else f'{rng.uniform(-30, 250):.2f}'
+        rows.append(f'{day:%m/%d/%Y},{day + timedelta(days=1):%m/%d/%Y},"SHOP, #{index % 17}",'
+                    f'{amount},{rng.choice(CATEGORIES)}\n')
+    return rows
+
+
+@pytest.fixture
+def write_statement(tmp_path):
+    """Writes a Discover statement from CSV records and returns its path."""
+    def write(rows, name='statement.csv'):
+        path = tmp_path / name
+        with open(path, 'w', newline='') as f:
+            f.write(HEADER)
+            f.writelines(rows)
+        return str(path)
+    return write
+
+
+@pytest.fixture(autouse=True)
+def isolated_statement_cache(tmp_path, monkeypatch):
+    """Keeps parse_file's statement cache out of the repository's data directory."""
+    cache = StatementCache(str(tmp_path / 'statement-cache'))
+    monkeypatch.setattr(statement_cache, '_default_cache', cache)
+    return cache
@@ -0,0 +1,53 @@
+import mmap
+
+import pytest
+
+from budgeting.bank_schemas import DISCOVER
+from budgeting.csv_ingestion import (
+    find_record_end, ingest_statement_file, source_position, split_record_ranges,
+)
+from conftest import discover_rows
+
+
+def assert_same_result(serial, parallel):
+    assert serial.store.content_hash() == parallel.store.content_hash()
+    assert serial.store.categories == parallel.store.categories
+    assert (serial.first_day, serial.last_day) == (parallel.first_day, parallel.last_day)
+    assert serial.records == parallel.records
+    a, b = serial.diagnostics, parallel.diagnostics
+    assert (a.rows_read, a.rows_loaded, a.rows_skipped, a.bad_rows) == (b.rows_read, b.rows_loaded, b.rows_skipped, b.bad_rows)
+    assert a.samples == b.samples
+    assert serial.source_position == parallel.source_position
+
+
+@pytest.fixture
+def tricky_statement(write_statement):
+    rows = discover_rows(3000, seed=4)
+    # Quoted newlines and doubled quotes inside fields, CRLF endings and blank lines
+    rows[10] = '01/05/2021,01/06/2021,"multi\nline, ""quoted""",12.50,Restaurants\r\n'
+    rows[500] = '\r\n'
+    rows[1500] = '02/01/2021,02/02/2021,"split\n\nhere",7.25,Gasoline\n'
+    return write_statement(rows)
+
+
+def test_parallel_parse_matches_serial(tricky_statement):
+    serial = ingest_statement_file(tricky_statement, DISCOVER, parallel=False)
+    parallel = ingest_statement_file(tricky_statement, DISCOVER, max_workers=3, min_parallel_bytes=0,
+                                     part_bytes=8 * 1024)
+    assert serial.diagnostics.bad_rows > 0
+    assert_same_result(serial, parallel)
+
+
+def test_source_position_covers_the_parsed_file(tricky_statement):
+    result = ingest_statement_file(tricky_statement, DISCOVER, parallel=False)
+    assert result.source_position == source_position(tricky_statement)
+
+
+def test_byte_ranges_end_on_record_boundaries(tricky_statement):
+    with open(tricky_statement, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header_end = find_record_end(mm, 0)
+        ranges = split_record_ranges(mm, header_end, part_bytes=4096)
+        assert ranges[0][0] == header_end and ranges[-1][1] == len(mm)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start
+            assert mm[end - 1:end] == b'\n'
@@ -0,0 +1,43 @@
+import numpy as np
+
+from budgeting.deduplication import find_duplicates
+from budgeting.discover_activity_processing import DiscoverActProc
+from conftest import discover_rows
+
+
+def test_overlapping_statements_drop_shared_rows(write_statement):
+    rows = discover_rows(600, seed=11)
+    january = DiscoverActProc(write_statement(rows[:400], 'january.csv'))
+    # The second export overlaps the first by 150 records, in a different order
+    february = DiscoverActProc(write_statement(rows[250:][::-1], 'february.csv'))
+    whole = DiscoverActProc(write_statement(rows, 'whole.csv'))
+
+    report = find_duplicates([january.store, february.store])
+    assert report.keep_masks[0] is None
+    assert report.dropped[1] == len(january.store) + len(february.store) - len(whole.store)
+
+    february.exclude_duplicates(report.keep_masks[1])
+    assert len(january.store) + len(february.store) == len(whole.store)
+    combined = np.concatenate([january.store.amounts, february.store.amounts])
+    assert np.isclose(combined.sum(), whole.store.amounts.sum())
+
+
+def test_identical_purchases_in_one_statement_are_kept(write_statement):
+    purchase = '05/01/2021,05/02/2021,COFFEE,4.50,Restaurants\n'
+    first = DiscoverActProc(write_statement([purchase, purchase], 'first.csv'))
+    second = DiscoverActProc(write_statement([purchase, purchase, purchase], 'second.csv'))
+
+    report = find_duplicates([first.store, second.store])
+    assert report.keep_masks[0] is None
+    # Two of the three occurrences are already in the first statement
+    assert report.dropped == [0, 2]
+    assert report.keep_masks[1].tolist().count(True) == 1
+
+
+def test_disjoint_statements_keep_every_row(write_statement):
+    rows = discover_rows(200, seed=12)
+    a = DiscoverActProc(write_statement(rows[:100], 'a.csv'))
+    b = DiscoverActProc(write_statement(rows[100:], 'b.csv'))
+    report = find_duplicates([a.store, b.store])
+    assert report.keep_masks == [None, None]
+    assert report.total_dropped == 0
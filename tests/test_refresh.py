@@ -0,0 +1,85 @@
+from budgeting.discover_activity_processing import DiscoverActProc
+from conftest import discover_rows
+
+
+def append(path, text):
+    with open(path, 'a', newline='') as f:
+        f.write(text)
+
+
+def assert_matches_fresh_parse(proc):
+    fresh = DiscoverActProc.parse_file(proc.file_name, use_cache=False)
+    assert proc.store.content_hash() == fresh.store.content_hash()
+    assert proc.diagnostics.summary() == fresh.diagnostics.summary()
+    assert proc.diagnostics.samples == fresh.diagnostics.samples
+    assert (proc.earliest_year, proc.latest_year) == (fresh.earliest_year, fresh.latest_year)
+
+
+def test_unchanged_file_adds_nothing(write_statement):
+    proc = DiscoverActProc(write_statement(discover_rows(500)))
+    assert proc.refresh() == 0
+
+
+def test_append_equals_fresh_parse(write_statement):
+    path = write_statement(discover_rows(1000, seed=5))
+    proc = DiscoverActProc(path)
+    proc.analyze_spending()
+    # Later dates, a new category and a malformed row
+    append(path, '12/30/2022,12/31/2022,X,10.50,Supermarkets\n'
+                 '01/02/2023,01/03/2023,"Y, z",20,Pets\n'
+                 'bad,row,x,y,z\n')
+    assert proc.refresh() == 2
+    assert_matches_fresh_parse(proc)
+
+    expected = DiscoverActProc(path)
+    expected.analyze_spending()
+    assert dict(proc.weekly_spending) == dict(expected.weekly_spending)
+
+
+def test_line_being_written_waits_for_its_newline(write_statement):
+    path = write_statement(discover_rows(300, seed=6))
+    proc = DiscoverActProc(path)
+    append(path, '03/01/2022,03/02/2022,A,5,Gasoline\n03/02/2022,03/0')
+    assert proc.refresh() == 1
+    append(path, '3/2022,B,6,Gasoline\n')
+    assert proc.refresh() == 1
+    assert_matches_fresh_parse(proc)
+
+
+def test_truncated_file_is_fully_reparsed(write_statement):
+    rows = discover_rows(800, seed=7)
+    path = write_statement(rows)
+    proc = DiscoverActProc(path)
+    write_statement(rows[:400])
+    assert proc.refresh() == -1
+    assert_matches_fresh_parse(proc)
+
+
+def test_continued_last_line_forces_full_reparse(write_statement):
+    rows = discover_rows(300, seed=8)
+    rows[-1] = '03/05/2021,03/06/2021,Partial,4'
+    path = write_statement(rows)
+    proc = DiscoverActProc(path)
+    append(path, '2,Gasoline\n')
+    assert proc.refresh() == -1
+    assert_matches_fresh_parse(proc)
+
+
+def test_edit_inside_parsed_prefix_forces_full_reparse(write_statement):
+    rows = discover_rows(300, seed=9)
+    path = write_statement(rows)
+    proc = DiscoverActProc(path)
+    # Same length, so only the checksum can tell
+    rows[5] = rows[5].replace('SHOP', 'SHOQ')
+    write_statement(rows)
+    assert proc.refresh() == -1
+    assert_matches_fresh_parse(proc)
+
+
+def test_rows_appended_after_parse_are_picked_up(write_statement):
+    path = write_statement(discover_rows(300, seed=10))
+    result = DiscoverActProc.parse_file(path, use_cache=False)
+    append(path, '04/01/2022,04/02/2022,Late,8,Gasoline\n')
+    proc = DiscoverActProc(path, ingest_result=result)
+    assert proc.refresh() == 1
+    assert_matches_fresh_parse(proc)
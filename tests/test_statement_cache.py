@@ -0,0 +1,76 @@
+import os
+
+from budgeting import schema_activity_processing
+from budgeting.discover_activity_processing import DiscoverActProc
+from budgeting.statement_cache import StatementCache
+from conftest import discover_rows
+
+
+def test_round_trip_restores_the_parse(tmp_path, write_statement):
+    path = write_statement(discover_rows(500, seed=13))
+    result = DiscoverActProc.parse_file(path, use_cache=False)
+    cache = StatementCache(str(tmp_path / 'cache'))
+    key = cache.fingerprint(path, 'DiscoverActProc')
+    assert cache.load(key) is None
+
+    cache.save(key, result)
+    loaded = cache.load(key)
+    assert loaded.store.content_hash() == result.store.content_hash()
+    assert loaded.store.categories == result.store.categories
+    assert (loaded.first_day, loaded.last_day, loaded.records) == (result.first_day, result.last_day, result.records)
+    assert loaded.diagnostics.summary() == result.diagnostics.summary()
+    assert loaded.diagnostics.samples == result.diagnostics.samples
+    assert loaded.source_position == result.source_position
+
+
+def test_key_follows_content_and_parser(write_statement, tmp_path):
+    rows = discover_rows(100, seed=14)
+    path = write_statement(rows)
+    cache = StatementCache(str(tmp_path / 'cache'))
+    key = cache.fingerprint(path, 'DiscoverActProc')
+    assert cache.fingerprint(path, 'ChaseActProc') != key
+    os.utime(path, (0, 0))
+    assert cache.fingerprint(path, 'DiscoverActProc') == key
+    write_statement(rows[:-1])
+    assert cache.fingerprint(path, 'DiscoverActProc') != key
+
+
+def test_parse_file_hits_the_cache(write_statement, isolated_statement_cache, monkeypatch):
+    path = write_statement(discover_rows(200, seed=15))
+    first = DiscoverActProc.parse_file(path)
+    assert len(isolated_statement_cache._entries()) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("a cached statement was parsed again")
+    monkeypatch.setattr(schema_activity_processing, 'ingest_statement_file', fail)
+    second = DiscoverActProc.parse_file(path)
+    assert second.store.content_hash() == first.store.content_hash()
+    assert second.source_position == first.source_position
+
+
+def test_eviction_removes_least_recently_used_entries(tmp_path, write_statement):
+    cache = StatementCache(str(tmp_path / 'cache'))
+    keys = []
+    for index in range(3):
+        path = write_statement(discover_rows(200, seed=20 + index), f'statement{index}.csv')
+        key = cache.fingerprint(path, 'DiscoverActProc')
+        cache.save(key, DiscoverActProc.parse_file(path, use_cache=False))
+        os.utime(os.path.join(cache.cache_dir, key), (index, index))
+        keys.append(key)
+    # Loading the oldest entry makes it the most recently used
+    assert cache.load(keys[0]) is not None
+
+    entry_size = max(size for _, size, _ in cache._entries())
+    cache.max_bytes = 2 * entry_size
+    assert cache.evict() == 1
+    assert cache.load(keys[1]) is None
+    assert cache.load(keys[0]) is not None and cache.load(keys[2]) is not None
+
+
+def test_clear_removes_every_entry(tmp_path, write_statement):
+    cache = StatementCache(str(tmp_path / 'cache'))
+    path = write_statement(discover_rows(50, seed=16))
+    cache.save(cache.fingerprint(path, 'DiscoverActProc'), DiscoverActProc.parse_file(path, use_cache=False))
+    entries, freed = cache.clear()
+    assert entries == 1 and freed > 0
+    assert cache.size() == 0
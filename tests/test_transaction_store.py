@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from budgeting.transaction_store import MAX_CATEGORIES, TransactionStore, TransactionStoreBuilder
+
+
+def make_store(rows):
+    """Builds a store from (day, category, amount) rows, in file order."""
+    builder = TransactionStoreBuilder()
+    for index, (day, category, amount) in enumerate(rows):
+        builder.append(day, category, amount, fingerprint=index)
+    return builder.build()
+
+
+def rows_of(store):
+    return list(store.iter_rows())
+
+
+def test_build_sorts_by_day_keeping_file_order_for_ties():
+    store = make_store([(5, 'b', 1.0), (3, 'a', 2.0), (5, 'a', 3.0), (3, 'c', 4.0)])
+    assert rows_of(store) == [(3, 'a', 2.0), (3, 'c', 4.0), (5, 'b', 1.0), (5, 'a', 3.0)]
+    assert store.fingerprints.tolist() == [1, 3, 0, 2]
+
+
+def test_concat_equals_building_in_one_go():
+    first = [(10, 'Gas', 1.0), (12, 'Food', 2.0), (11, 'Gas', 3.0)]
+    second = [(11, 'Pets', 4.0), (9, 'Food', 5.0), (12, 'Gas', 6.0)]
+    combined = TransactionStore.concat([make_store(first), make_store(second)])
+    whole = make_store(first + second)
+
+    assert combined.categories == ['Gas', 'Food', 'Pets']
+    assert rows_of(combined) == rows_of(whole)
+    # Ties on a day keep the order of the inputs
+    assert rows_of(combined) == [
+        (9, 'Food', 5.0), (10, 'Gas', 1.0), (11, 'Gas', 3.0), (11, 'Pets', 4.0), (12, 'Food', 2.0), (12, 'Gas', 6.0),
+    ]
+
+
+def test_concat_of_nothing_is_empty():
+    assert len(TransactionStore.concat([])) == 0
+
+
+@pytest.mark.parametrize('key, sort_key', [
+    ('day', lambda row: (row[0], row[1], row[2])),
+    ('category', lambda row: (row[1], row[0], row[2])),
+    ('amount', lambda row: (row[2], row[0], row[1])),
+])
+def test_sort_permutation_orders_with_tie_breaks(key, sort_key):
+    rng = np.random.default_rng(0)
+    rows = [(int(day), category, float(amount)) for day, category, amount in zip(
+        rng.integers(1, 20, 200), rng.choice(['Zoo', 'Gas', 'Food', 'Art'], 200), rng.integers(1, 10, 200)
+    )]
+    store = make_store(rows)
+    permutation = store.sort_permutation(key)
+    ordered = [rows_of(store)[index] for index in permutation]
+    assert ordered == sorted(rows_of(store), key=sort_key)
+    assert store.sort_permutation(key) is permutation
+
+
+def test_sort_permutation_rejects_unknown_columns():
+    with pytest.raises(ValueError):
+        make_store([(1, 'a', 1.0)]).sort_permutation('description')
+
+
+def test_builder_rejects_categories_beyond_code_range():
+    builder = TransactionStoreBuilder()
+    for code in range(MAX_CATEGORIES):
+        builder.append(1, f'c{code}', 1.0)
+    builder.append(1, 'c0', 1.0)
+    with pytest.raises(ValueError):
+        builder.append(1, 'one too many', 1.0)
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from budgeting.discover_activity_processing import DiscoverActProc
+from budgeting.transaction_store import to_ordinal
+from budgeting.weekly_aggregation import aggregate_weekly, extend_weekly
+from conftest import discover_rows
+
+
+def per_row_analysis(transactions, start_date, end_date):
+    """The original day-by-day loop of analyze_spending, kept as the reference."""
+    weekly_spending = {}
+    by_category = {}
+    totals = {}
+    active_weeks = {}
+    max_week = min_week = None
+    current_week_start = start_date
+    while current_week_start <= end_date:
+        next_sunday = current_week_start + timedelta(days=(6 - current_week_start.weekday() + 7) % 7)
+        current_week_end = min(next_sunday, end_date)
+        week_spending = 0
+        category_totals = {}
+        current_day = current_week_start
+        while current_day <= current_week_end:
+            for category, amount in transactions.get(current_day, []):
+                week_spending += amount
+                category_totals[category] = category_totals.get(category, 0) + amount
+            current_day += timedelta(days=1)
+        weekly_spending[current_week_start] = week_spending
+        by_category[current_week_start] = category_totals
+        for category, amount in category_totals.items():
+            totals[category] = totals.get(category, 0) + amount
+            active_weeks[category] = active_weeks.get(category, 0) + 1
+        if max_week is None or week_spending > max_week[1]:
+            max_week = (current_week_start, week_spending)
+        if (min_week is None or week_spending < min_week[1]) and current_week_end.weekday() == 6:
+            min_week = (current_week_start, week_spending)
+        current_week_start = current_week_end + timedelta(days=1)
+    averages = {category: totals[category] / active_weeks[category] for category in totals}
+    average = sum(weekly_spending.values()) / len(weekly_spending)
+    return weekly_spending, by_category, max_week, min_week, average, averages
+
+
+@pytest.mark.parametrize('window', [
+    (None, None),
+    (datetime(2021, 2, 10), datetime(2021, 11, 3)),  # starts and ends mid-week
+    (datetime(2021, 3, 1), datetime(2021, 3, 28)),  # Monday to Sunday
+])
+def test_matches_per_row_loop(write_statement, window):
+    proc = DiscoverActProc(write_statement(discover_rows(3000, seed=1)))
+    proc.analyze_spending(*window)
+    expected = per_row_analysis(proc.transactions_dict, proc.start_date, proc.end_date)
+    weekly_spending, by_category, max_week, min_week, average, averages = expected
+
+    assert list(proc.weekly_spending) == list(weekly_spending)
+    assert list(proc.weekly_spending.values()) == pytest.approx(list(weekly_spending.values()))
+    for week, totals in by_category.items():
+        assert dict(proc.weekly_spending_by_category[week]) == pytest.approx(totals)
+    assert proc.max_spending_week[0] == max_week[0]
+    assert proc.min_spending_week[0] == min_week[0]
+    assert proc.average_spending == pytest.approx(average)
+    assert dict(proc.average_spending_by_category) == pytest.approx(averages)
+
+
+def test_extend_weekly_equals_full_aggregation(write_statement):
+    proc = DiscoverActProc(write_statement(discover_rows(2000, seed=2)))
+    store = proc.store
+    start_day, end_day = store.min_day, store.max_day
+    since_day = start_day + 200
+    before = store.take(store.days < since_day)
+    previous = aggregate_weekly(before, start_day, end_day)
+
+    extended = extend_weekly(previous, store, end_day, since_day)
+    full = aggregate_weekly(store, start_day, end_day)
+    assert extended.categories == full.categories
+    np.testing.assert_allclose(extended.category_totals, full.category_totals)
+    np.testing.assert_array_equal(extended.category_counts, full.category_counts)
+    np.testing.assert_allclose(extended.weekly_totals, full.weekly_totals)
+
+
+def test_empty_window_has_no_weeks(write_statement):
+    proc = DiscoverActProc(write_statement(discover_rows(50, seed=3)))
+    day = to_ordinal(datetime(2030, 1, 1))
+    aggregate = aggregate_weekly(proc.store, day, day - 1)
+    assert aggregate.num_weeks == 0
+    assert aggregate.average_weekly_spending() == 0
@@ -5,12 +5,14 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor
 from .category_grouping_widget import CategoryGroupingWidget
 from budgeting.category_manager import CategoryManager
+from .lazy_tab import LazyTabMixin
 
-class BLSTab(QWidget):
+class BLSTab(QWidget, LazyTabMixin):
     """BLS Comparison tab with category grouping functionality"""
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.main_window = parent
         self.category_manager = CategoryManager()
         self.current_data = {}
         self.bls_data = {}
@@ -18,6 +20,7 @@ class BLSTab(QWidget):
         
         # For backward compatibility with main window
         self.bls_table = self.comparison_table
+        self.init_lazy_refresh(parent.update_bls_table)
         
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -158,39 +161,16 @@ class BLSTab(QWidget):
         # Update the comparison
         self.update_comparison()
         
-    def populate_from_processors(self, processors):
-        """Populate category data from transaction processors"""
-        if not processors:
-            print("DEBUG: No processors provided")
-            return
-            
-        # Extract all categories from processors
-        all_categories = set()
-        category_totals = {}
-        
-        print(f"DEBUG: Processing {len(processors)} processors")
-        for proc_info in processors:
-            print(f"DEBUG: Processor info: {proc_info.keys()}")
-            if not proc_info.get('checked', False):
-                print(f"DEBUG: Processor not checked, skipping")
-                continue
-                
-            processor = proc_info['processor']
-            print(f"DEBUG: Processor has average_spending_by_category: {hasattr(processor, 'average_spending_by_category')}")
-            if hasattr(processor, 'average_spending_by_category'):
-                categories = processor.average_spending_by_category
-                print(f"DEBUG: Found {len(categories)} categories: {list(categories.keys())}")
-                for cat, amount in categories.items():
-                    all_categories.add(cat)
-                    if cat in category_totals:
-                        category_totals[cat] += amount
-                    else:
-                        category_totals[cat] = amount
-        
-        print(f"DEBUG: Total categories found: {len(all_categories)}")
-        print(f"DEBUG: Categories: {list(all_categories)}")
-        
+    def populate_from_portfolio(self, portfolio):
+        """
+        Populate category data from the merged analysis of the checked files.
+
+        Args:
+            portfolio (PortfolioAggregate): The current analysis.
+        """
+        category_totals = dict(portfolio.average_by_category)
+
         # Set categories for grouping widget
-        self.grouping_widget.set_categories(list(all_categories))
+        self.grouping_widget.set_categories(list(category_totals))
         self.current_data = category_totals
-        self.update_comparison()
\ No newline at end of file
+        self.update_comparison()
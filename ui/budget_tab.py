@@ -2,8 +2,9 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QPushButton, QHB
 from PyQt6.QtCore import Qt
 from .style_guide import spacing, fonts
 from budgeting.category_manager import CategoryManager
+from .lazy_tab import LazyTabMixin
 
-class BudgetTab(QWidget):
+class BudgetTab(QWidget, LazyTabMixin):
     """
     Tab for managing and editing the user's budget, including budget comparison and tips.
     """
@@ -17,6 +18,7 @@ class BudgetTab(QWidget):
         super().__init__()
         self.main_window = main_window
         self.category_manager = CategoryManager()
+        self.init_lazy_refresh(main_window.populate_budget_table)
 
         main_layout = QHBoxLayout()
         main_layout.setContentsMargins(spacing['lg'], spacing['lg'], spacing['lg'], spacing['lg'])
@@ -0,0 +1,46 @@
+class LazyTabMixin:
+    """
+    Defers rebuilding a tab's contents until the tab is on screen.
+
+    The tab's data_version is bumped whenever the data it shows changes, and
+    built_version records the version its widgets were last rebuilt for. A
+    hidden tab only marks itself dirty; the main window calls refresh() when
+    the tab becomes current, so switching back to an unchanged tab costs nothing.
+
+    Attributes:
+        data_version (int): Version of the data the tab should show.
+        built_version (int): Version the tab's widgets were last rebuilt for.
+    """
+
+    def init_lazy_refresh(self, rebuild):
+        """
+        Args:
+            rebuild (callable): Rebuilds the tab's widgets from the current data.
+        """
+        self._rebuild = rebuild
+        self.data_version = 0
+        self.built_version = 0
+
+    @property
+    def is_dirty(self):
+        """bool: True if the widgets are older than the data."""
+        return self.built_version != self.data_version
+
+    def is_current(self):
+        """
+        Returns:
+            bool: True if this is the tab shown by the main window.
+        """
+        return self.main_window.tabs.currentWidget() is self
+
+    def mark_dirty(self):
+        """Records that the tab's data changed, rebuilding now if the tab is shown."""
+        self.data_version += 1
+        if self.is_current():
+            self.refresh()
+
+    def refresh(self):
+        """Rebuilds the tab if its data changed since the last rebuild."""
+        if self.is_dirty:
+            self.built_version = self.data_version
+            self._rebuild()
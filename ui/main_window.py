@@ -7,20 +7,33 @@ from PyQt6.QtWidgets import (
     QTableWidget, QTableWidgetItem, QHBoxLayout, QLineEdit, QToolBar,
     QStatusBar, QDateEdit, QMessageBox, QCheckBox, QSizePolicy
 )
-from PyQt6.QtCore import Qt, QDate
-from budgeting.discover_activity_processing import DiscoverActProc
+from PyQt6.QtCore import QDate, QThreadPool
+from budgeting.statement_cache import get_statement_cache
 from budgeting.bls_comparator import BLSComparator
+from budgeting.transaction_store import to_ordinal
+from budgeting.analysis_cache import AnalysisCache
+from budgeting.portfolio import Portfolio
 from datetime import datetime
-import pyqtgraph as pg
 
 from .transactions_tab import TransactionsTab
-from .trends_tab import TrendsTab
+from .trends_tab import TrendsTab, TrendSeries
 from .bls_tab import BLSTab
 from .budget_tab import BudgetTab
 from .theme_manager import apply_theme
 from PyQt6.QtGui import QAction, QIcon
 from .style_guide import spacing, colors, fonts
 from .toolbar import ToolbarWidget
+from .workers import AnalysisWorker, IngestWorker, RefreshWorker
+from .refresh_scheduler import RefreshScheduler
+
+# Outputs kept up to date by the refresh scheduler, in the order they are rebuilt
+AGGREGATES = 'aggregates'
+TRANSACTION_TABLE = 'transaction_table'
+BUDGET_TABLE = 'budget_table'
+CATEGORY_SELECTOR = 'category_selector'
+TREND_PLOT = 'trend_plot'
+BLS_TABLE = 'bls_table'
+ANALYSIS_OUTPUTS = (TRANSACTION_TABLE, BUDGET_TABLE, CATEGORY_SELECTOR, TREND_PLOT, BLS_TABLE)
 
 class BudgetApp(QMainWindow):
     """
@@ -37,6 +50,20 @@ class BudgetApp(QMainWindow):
         self.resize(1200, 800)
         self.processors = []
         self.bls_comparator = None
+        self.analysis_start_day = None
+        self.analysis_end_day = None
+        self.analysis_cache = AnalysisCache()
+        self._dedup_key = None
+        self._dedup_report = None
+        self.thread_pool = QThreadPool.globalInstance()
+        self._import_worker = None
+        self._refresh_worker = None
+        self._analysis_worker = None
+        self._analysis_version = 0  # Bumped whenever new analysis results are installed
+        self.portfolio_aggregate = None  # Checked files' results merged, rebuilt by each analysis
+        self.budget_values = {}  # Category -> weekly budget parsed from the budget table
+        self._budget_version = 0  # Bumped whenever budget_values changes
+        self.refresh_scheduler = RefreshScheduler(self)
 
         # Use the new ToolbarWidget
         self.toolbar = ToolbarWidget(self)
@@ -59,6 +86,8 @@ class BudgetApp(QMainWindow):
         self.tabs.addTab(self.trends_tab, "Trends")
         self.tabs.addTab(self.bls_tab, "BLS Comparison")
         self.tabs.addTab(self.budget_tab, "Budget Management")
+        # Tabs rebuild lazily, when they are shown
+        self.tabs.currentChanged.connect(self.on_tab_changed)
 
         self.setStatusBar(QStatusBar())
 
@@ -72,6 +101,82 @@ class BudgetApp(QMainWindow):
         self.bls_table = self.bls_tab.bls_table
         self.budget_table = self.budget_tab.budget_table
 
+        self._add_refresh_stages()
+
+    def _add_refresh_stages(self):
+        """
+        Registers the outputs that event handlers invalidate. Each stage declares
+        the inputs it is rebuilt from, so a burst of events that ends where it
+        started (e.g. a file unchecked and checked again) rebuilds nothing.
+        Stages that feed a tab only mark the tab dirty; the tab rebuilds once it is shown.
+        """
+        scheduler = self.refresh_scheduler
+        group_version = lambda: self.bls_tab.category_manager.version
+        # The comparator and the version of its benchmarks and mapping
+        bls_version = lambda: (self.bls_comparator, self.bls_comparator.version if self.bls_comparator else None)
+        scheduler.add_stage(
+            AGGREGATES, self.analyze_spending,
+            inputs=lambda: (tuple(p['processor'] for p in self.processors if p['checked']), group_version()),
+        )
+        # The remaining stages read analysis results, so they wait for a running analysis
+        settled = lambda: self._analysis_worker is None
+        scheduler.add_stage(
+            TRANSACTION_TABLE, self.transactions_tab.mark_dirty,
+            inputs=lambda: self._analysis_version, ready=settled,
+        )
+        scheduler.add_stage(
+            BUDGET_TABLE, self.budget_tab.mark_dirty,
+            inputs=lambda: (self._analysis_version, group_version()), ready=settled,
+        )
+        scheduler.add_stage(
+            CATEGORY_SELECTOR, self.update_category_selector,
+            inputs=lambda: (self._analysis_version, group_version()), ready=settled,
+        )
+        scheduler.add_stage(
+            TREND_PLOT, self.trends_tab.mark_dirty,
+            inputs=lambda: (
+                self._analysis_version, group_version(), self.category_selector.currentText(),
+                tuple(self.trends_tab.overlay_categories()), self.trends_tab.is_daily(),
+                self.show_budget_checkbox.isChecked(), self.show_bls_checkbox.isChecked(),
+                self._budget_version, bls_version(),
+            ),
+            ready=settled,
+        )
+        scheduler.add_stage(
+            BLS_TABLE, self.bls_tab.mark_dirty,
+            inputs=lambda: (self._analysis_version, group_version(), bls_version()), ready=settled,
+        )
+
+    def _refresh_budget_values(self):
+        """
+        Re-parses the weekly budgets typed into the budget table into budget_values,
+        so plots read numbers instead of parsing every budget field on each redraw.
+        """
+        values = {}
+        for i in range(self.budget_table.rowCount()):
+            item = self.budget_table.item(i, 0)
+            budget_input = self.budget_table.cellWidget(i, 1)
+            if item is None or budget_input is None:
+                continue
+            try:
+                values[item.text()] = float(budget_input.text())
+            except ValueError:
+                continue
+        if values != self.budget_values:
+            self.budget_values = values
+            self._budget_version += 1
+            self.refresh_scheduler.invalidate(TREND_PLOT)
+
+    def on_tab_changed(self, index):
+        """Rebuilds the newly shown tab if its data changed while it was hidden."""
+        tab = self.tabs.widget(index)
+        if tab is not None:
+            tab.refresh()
+
+    def on_trend_controls_changed(self, *args):
+        """Schedules a replot after the category selector or a trend checkbox changed."""
+        self.refresh_scheduler.invalidate(TREND_PLOT)
+
     def show_help_dialog(self):
         QMessageBox.information(self, "Help", "Need help? Visit the documentation or contact support.")
 
@@ -79,84 +184,275 @@ class BudgetApp(QMainWindow):
         QMessageBox.information(self, "Documentation", "Open the user guide or documentation website.")
 
     def load_csv(self):
-        file_path, _ = QFileDialog.getOpenFileName(self, "Open Bank CSV", "resources/", "CSV Files (*.csv)")
-        if file_path:
-            # Prompt for bank type (for now, just Discover)
-            bank_type = "Discover"
-            processor = DiscoverActProc(file_path, bls_comparator=self.bls_comparator)
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "Open Bank CSV", "resources/", "CSV Files (*.csv)")
+        if file_paths:
+            self.import_statements(file_paths)
+
+    def load_csv_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Open Folder of Bank CSVs", "resources/")
+        if folder:
+            self.import_statements(folder)
+
+    def import_statements(self, paths):
+        """
+        Parses statement files on a background worker (and worker processes) and adds them
+        to the file selector in one batch when parsing finishes. Progress is shown in the
+        status bar and the import can be cancelled.
+
+        Args:
+            paths (str or list[str]): CSV files and/or a directory of CSV files.
+        """
+        if self._import_worker is not None:
+            self.statusBar().showMessage("An import is already in progress.")
+            return
+        # Each file's bank type is detected from its header line
+        worker = IngestWorker(paths, bls_comparator=self.bls_comparator)
+        worker.signals.progress.connect(self._show_worker_progress)
+        worker.signals.finished.connect(self._on_import_finished)
+        worker.signals.failed.connect(self._on_worker_failed)
+        worker.signals.cancelled.connect(self._on_worker_cancelled)
+        self._import_worker = worker
+        self.statusBar().showMessage("Importing...")
+        self.thread_pool.start(worker)
+
+    def _is_current_worker(self, signals):
+        """
+        Returns:
+            bool: True if `signals` belongs to the running import, refresh or analysis worker.
+        """
+        return any(
+            worker is not None and worker.signals is signals
+            for worker in (self._import_worker, self._refresh_worker, self._analysis_worker)
+        )
+
+    def _release_worker(self, signals):
+        """Forgets the worker that owns `signals` once it has finished."""
+        if self._import_worker is not None and self._import_worker.signals is signals:
+            self._import_worker = None
+        if self._refresh_worker is not None and self._refresh_worker.signals is signals:
+            self._refresh_worker = None
+        if self._analysis_worker is not None and self._analysis_worker.signals is signals:
+            self._analysis_worker = None
+
+    def _show_worker_progress(self, message):
+        if self._is_current_worker(self.sender()):
+            self.statusBar().showMessage(message)
+
+    def _on_worker_failed(self, message):
+        if not self._is_current_worker(self.sender()):
+            return
+        self._release_worker(self.sender())
+        QMessageBox.critical(self, "Error", message)
+
+    def _on_worker_cancelled(self):
+        if not self._is_current_worker(self.sender()):
+            return
+        self._release_worker(self.sender())
+        self.statusBar().showMessage("Cancelled.")
+
+    def cancel_background_work(self):
+        """Cancels the running import, refresh and analysis, if any."""
+        for worker in (self._import_worker, self._refresh_worker, self._analysis_worker):
+            if worker is not None:
+                worker.cancel()
+        self.statusBar().showMessage("Cancelling...")
+
+    def closeEvent(self, event):
+        for worker in (self._import_worker, self._refresh_worker, self._analysis_worker):
+            if worker is not None:
+                worker.cancel()
+        self.thread_pool.waitForDone()
+        super().closeEvent(event)
+
+    def _on_import_finished(self, result):
+        """
+        Adds the processors of a finished import to the file selector.
+
+        Args:
+            result (ImportResult): Processors and failures from the IngestWorker.
+        """
+        if not self._is_current_worker(self.sender()):
+            return
+        self._release_worker(self.sender())
+        processors, failures = result.processors, result.failures
+        for processor in processors:
             self.processors.append({
-                'file_path': file_path,
+                'file_path': processor.file_name,
                 'processor': processor,
-                'bank_type': bank_type,
+                'bank_type': processor.SCHEMA.name,
                 'checked': True
             })
-            self.update_file_selector()
-            self.statusBar().showMessage(f"CSV file loaded: {file_path}")
+        self.update_file_selector()
+        if failures:
+            failed = "\n".join(f"{os.path.basename(path)}: {error}" for path, error in failures)
+            QMessageBox.warning(self, "Import Errors", f"Failed to load:\n{failed}")
+        if len(processors) == 1:
+            diagnostics = processors[0].diagnostics
+            self.statusBar().showMessage(f"CSV file loaded: {processors[0].file_name} ({diagnostics.summary()})")
+        else:
+            bad_rows = sum(processor.diagnostics.bad_rows for processor in processors)
+            message = f"Loaded {len(processors)} CSV files."
+            if bad_rows:
+                message += f" {bad_rows} malformed rows skipped."
+            self.statusBar().showMessage(message)
+
+    def refresh_statements(self):
+        """
+        Re-reads every loaded statement file on a background worker, parsing only rows
+        appended since it was loaded, and re-runs the analysis if any file gained transactions.
+        """
+        if not self.processors:
+            return
+        if self._refresh_worker is not None:
+            self.statusBar().showMessage("A refresh is already in progress.")
+            return
+        worker = RefreshWorker([entry['processor'] for entry in self.processors])
+        worker.signals.progress.connect(self._show_worker_progress)
+        worker.signals.finished.connect(self._on_refresh_finished)
+        worker.signals.failed.connect(self._on_worker_failed)
+        worker.signals.cancelled.connect(self._on_worker_cancelled)
+        self._refresh_worker = worker
+        self.statusBar().showMessage("Refreshing...")
+        self.thread_pool.start(worker)
+
+    def _on_refresh_finished(self, result):
+        """
+        Installs the statement updates read by a RefreshWorker and re-analyzes if any changed.
+
+        Args:
+            result (RefreshResult): Updates and failures from the RefreshWorker.
+        """
+        if not self._is_current_worker(self.sender()):
+            return
+        self._release_worker(self.sender())
+        group_version = self.bls_tab.category_manager.version
+        added = 0
+        reparsed = 0
+        failures = list(result.failures)
+        for processor, update in result.updates:
+            try:
+                count = processor.apply_refresh(update, cache=self.analysis_cache, group_version=group_version)
+            except ValueError as e:
+                failures.append((processor.file_name, e))
+                continue
+            if count < 0:
+                reparsed += 1
+            else:
+                added += count
+        # A running analysis read the files before the update, so it is restarted too
+        if (added or reparsed) and (self.analysis_start_day is not None or self._analysis_worker is not None):
+            self.analyze_spending()
+        if failures:
+            failed = "\n".join(f"{os.path.basename(path)}: {error}" for path, error in failures)
+            QMessageBox.warning(self, "Refresh Errors", f"Failed to refresh:\n{failed}")
+        self.statusBar().showMessage(
+            f"Refreshed {len(result.updates)} files: {added} new transactions, {reparsed} files re-parsed."
+        )
+
+    def clear_statement_cache(self):
+        entries, freed = get_statement_cache().clear()
+        self.statusBar().showMessage(f"Cleared {entries} cached statements ({freed / (1024 * 1024):.1f} MB).")
 
     def load_bls(self):
-        file_path, _ = QFileDialog.getOpenFileName(self, "Select BLS JSON", "data/", "JSON Files (*.json)")
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Select BLS Benchmarks", "data/", "Benchmark Files (*.json *.xlsx);;JSON Files (*.json);;CES Workbooks (*.xlsx)"
+        )
         if file_path:
             self.bls_file_path = file_path
             try:
-                with open(file_path, "r") as f:
-                    bls_data = json.load(f)
                 self.bls_comparator = BLSComparator(bls_api_key="demo")
-                self.bls_comparator.bls_data = bls_data
+                self.bls_comparator.load_benchmarks(file_path)
+                self.refresh_scheduler.invalidate(TREND_PLOT, BLS_TABLE)
                 self.statusBar().showMessage(f"BLS file selected: {file_path}")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to load BLS file: {e}")
                 self.bls_comparator = None
     
     def analyze_spending(self):
+        """
+        Starts de-duplication and weekly analysis of the checked files on a background
+        worker. A newer request cancels an analysis still in progress; the UI is updated
+        when the worker's results arrive.
+        """
+        self.refresh_scheduler.mark_clean(AGGREGATES)
         checked_procs = [p['processor'] for p in self.processors if p['checked']]
         if not checked_procs:
             QMessageBox.warning(self, "No Files Selected", "Please select at least one file to analyze.")
             return
 
-        # Aggregate date range
-        all_dates = []
-        for proc in checked_procs:
-            all_dates += list(proc.transactions_dict.keys())
-        if not all_dates:
-            self.update_date_range_label(None, None)
-            return
-        first_date = min(all_dates)
-        last_date = max(all_dates)
+        # Aggregate date range (duplicates never change it, they also occur in another checked file)
+        first_date, last_date = Portfolio([proc.source_store for proc in checked_procs]).date_range()
         self.update_date_range_label(first_date, last_date)
+        if first_date is None:
+            return
 
         # Analyze each processor for the selected date range
         start = first_date
         end = last_date
-        for proc in checked_procs:
-            proc.analyze_spending(
-                start_date=datetime.combine(start, datetime.min.time()),
-                end_date=datetime.combine(end, datetime.min.time())
-            )        # Now aggregate for UI updates
-        self.update_transaction_table()
-        self.update_category_selector()
-        self.update_trend_plot()
-        self.populate_budget_table()
-        if self.bls_comparator:
-            self.update_bls_table()
-        self.statusBar().showMessage("Analysis complete.")
+        if self._analysis_worker is not None:
+            self._analysis_worker.cancel()
+        worker = AnalysisWorker(
+            checked_procs,
+            datetime.combine(start, datetime.min.time()),
+            datetime.combine(end, datetime.min.time()),
+            cache=self.analysis_cache,
+            group_version=self.bls_tab.category_manager.version,
+            report=self._dedup_report,
+            dedup_key=self._dedup_key,
+            group_mapping=self.bls_tab.category_manager.get_category_mapping(),
+        )
+        worker.signals.progress.connect(self._show_worker_progress)
+        worker.signals.finished.connect(self._on_analysis_finished)
+        worker.signals.failed.connect(self._on_worker_failed)
+        worker.signals.cancelled.connect(self._on_worker_cancelled)
+        self._analysis_worker = worker
+        self.thread_pool.start(worker)
+
+    def _on_analysis_finished(self, batch):
+        """
+        Installs the de-duplicated views and analysis results computed by an
+        AnalysisWorker, then refreshes the tabs.
+
+        Args:
+            batch (AnalysisBatch): The worker's results.
+        """
+        if not self._is_current_worker(self.sender()):
+            return
+        self._release_worker(self.sender())
+        checked_procs = batch.processors
+        report = batch.report
+        self._dedup_report = report
+        self._dedup_key = batch.dedup_key
+        for proc, view, result in zip(checked_procs, batch.views, batch.results):
+            if view is not None:
+                proc.set_view(*view)
+            if result is not None:
+                proc.apply_analysis(result)
+                proc.estimate_bls_baseline()
+        self.analysis_start_day = to_ordinal(batch.start_date)
+        self.analysis_end_day = to_ordinal(batch.end_date)
+        self.portfolio_aggregate = batch.portfolio
+        self._analysis_version += 1
+
+        # Rebuild the outputs now rather than after the debounce delay
+        self.refresh_scheduler.invalidate(*ANALYSIS_OUTPUTS)
+        self.refresh_scheduler.flush()
+        portfolio = batch.portfolio
+        message = f"Analysis complete: ${portfolio.total_spent:,.2f} across {portfolio.num_transactions} transactions."
+        if report.total_dropped:
+            message += " " + report.summary([proc.file_name for proc in checked_procs])
+        self.statusBar().showMessage(message)
 
     def update_bls_table(self):
-        checked_procs = [p['processor'] for p in self.processors if p['checked']]
-        if not checked_procs or not self.bls_comparator:
+        portfolio = self.portfolio_aggregate
+        if portfolio is None or not self.bls_comparator:
             return
 
-        # Aggregate weekly user averages by category
-        user_weekly_by_cat = {}
-        count_by_cat = {}
-        for proc in checked_procs:
-            for cat, avg in proc.average_spending_by_category.items():
-                user_weekly_by_cat[cat] = user_weekly_by_cat.get(cat, 0) + avg
-                count_by_cat[cat] = count_by_cat.get(cat, 0) + 1
-        for cat in user_weekly_by_cat:
-            user_weekly_by_cat[cat] /= count_by_cat[cat]
+        # Weekly user averages by category over the analysis window
+        user_weekly_by_cat = portfolio.average_by_category
 
         # Update the BLS tab with new methods
-        self.bls_tab.populate_from_processors(self.processors)
+        self.bls_tab.populate_from_portfolio(portfolio)
         if hasattr(self.bls_comparator, 'bls_data'):
             self.bls_tab.set_bls_data(self.bls_comparator.bls_data)
 
@@ -164,11 +460,7 @@ class BudgetApp(QMainWindow):
         self.bls_table.setRowCount(0)
         for cat in sorted(user_weekly_by_cat.keys()):
             user_weekly = user_weekly_by_cat[cat]
-            bls_weekly = None
-            if self.bls_comparator and hasattr(self.bls_comparator, 'get_bls_avg_for_user_category'):
-                bls_annual = self.bls_comparator.get_bls_avg_for_user_category(cat)
-                if bls_annual is not None:
-                    bls_weekly = bls_annual / 52
+            bls_weekly = self.bls_comparator.resolve(cat).weekly_average
             row = self.bls_table.rowCount()
             self.bls_table.insertRow(row)
             self.bls_table.setItem(row, 0, QTableWidgetItem(str(cat)))
@@ -182,19 +474,7 @@ class BudgetApp(QMainWindow):
 
     def update_transaction_table(self):
         checked_procs = [p['processor'] for p in self.processors if p['checked']]
-        self.trans_table.setRowCount(0)
-        all_transactions = []
-        for proc in checked_procs:
-            for date in sorted(proc.transactions_dict):
-                for category, amount in proc.transactions_dict[date]:
-                    all_transactions.append((date, category, amount))
-        all_transactions.sort()
-        for date, category, amount in all_transactions:
-            row = self.trans_table.rowCount()
-            self.trans_table.insertRow(row)
-            self.trans_table.setItem(row, 0, QTableWidgetItem(date.strftime("%Y-%m-%d")))
-            self.trans_table.setItem(row, 1, QTableWidgetItem(category))
-            self.trans_table.setItem(row, 2, QTableWidgetItem(f"${amount:.2f}"))
+        self.transactions_tab.set_transactions([proc.store for proc in checked_procs])
 
 
     def reload_with_dates(self):
@@ -237,137 +517,71 @@ class BudgetApp(QMainWindow):
                 if cat in budgets:
                     self.budget_table.cellWidget(i, 1).setText(str(budgets[cat]))
             self.update_budget_comparison()
+            self._refresh_budget_values()
             self.statusBar().showMessage(f"Loaded config from {file_path}")
 
     def update_trend_plot(self):
-        checked_procs = [p['processor'] for p in self.processors if p['checked']]
-        if not checked_procs:
-            self.plot_widget.clear()
-            self.plot_widget.setTitle("No data available.")
+        portfolio = self.portfolio_aggregate
+        if portfolio is None or not portfolio.num_weeks:
+            self.trends_tab.show_series([], [], "No data available.")
             return
 
-        self.plot_widget.clear()
-
         selected_category = self.category_selector.currentText()
         show_budget = self.show_budget_checkbox.isChecked()
         show_bls = self.show_bls_checkbox.isChecked()
+        daily = self.trends_tab.is_daily() and portfolio.daily_group_totals is not None
+
+        # Weekly series from the portfolio aggregate; groups roll up their member categories
+        names = [selected_category] + [
+            name for name in self.trends_tab.overlay_categories() if name != selected_category
+        ]
+        series = []
+        for name in names:
+            if name == "Total Spending":
+                values = portfolio.weekly_totals
+                bls_categories = portfolio.active_categories()
+                budget = sum(self.budget_values.values())
+            else:
+                values = portfolio.group_series(name)
+                bls_categories = [name]
+                budget = self.get_user_budget(name)
+            if values is None:
+                continue
+            bls_weekly = self.bls_weekly_average(bls_categories) if show_bls else None
+            pyramid = portfolio.pyramid(None if name == "Total Spending" else name) if daily else None
+            series.append(TrendSeries(name, values, bls_weekly, budget if show_budget else None, pyramid))
 
-        # Aggregate data
-        if selected_category == "Total Spending":
-            # Sum weekly spending across all checked processors
-            weekly_totals = {}
-            for proc in checked_procs:
-                for week, val in proc.weekly_spending.items():
-                    weekly_totals[week] = weekly_totals.get(week, 0) + val
-            if not weekly_totals:
-                self.plot_widget.setTitle("No data available.")
-                return
-            weeks = sorted(weekly_totals.keys())
-            values = [weekly_totals[wk] for wk in weeks]
-            # Convert weeks (datetime) to indices and labels for pyqtgraph
-            week_labels = [wk.strftime('%Y-%m-%d') for wk in weeks]
-            x_vals = list(range(len(weeks)))
-            self.plot_widget.plot(x_vals, values, pen='b', symbol='o', label='User Spending')
-            avg_actual = sum(values) / len(values) if values else 0
-
-            # --- BLS aggregation for Total Spending ---
-            bls_avg = None
-            if self.bls_comparator and hasattr(self.bls_comparator, 'get_bls_avg_for_user_category'):
-                # Aggregate all categories present in checked files
-                all_categories = set()
-                for proc in checked_procs:
-                    all_categories.update(proc.category_series.keys())
-                bls_avg = 0
-                for cat in all_categories:
-                    cat_bls = self.bls_comparator.get_bls_avg_for_user_category(cat)
-                    if cat_bls is not None:
-                        bls_avg += cat_bls / 52  # Convert annual to weekly
-                if bls_avg == 0:
-                    bls_avg = None
-            if show_bls and bls_avg is not None:
-                self.plot_widget.plot(x_vals, [bls_avg] * len(x_vals), pen=pg.mkPen('r', style=Qt.PenStyle.DashLine, width=2), label='BLS Avg')
-            if show_budget:
-                user_budget_total = 0
-                for i in range(self.budget_table.rowCount()):
-                    try:
-                        val = float(self.budget_table.cellWidget(i, 1).text())
-                        user_budget_total += val
-                    except ValueError:
-                        continue
-                self.plot_widget.plot(x_vals, [user_budget_total] * len(x_vals), pen=pg.mkPen('g', style=Qt.PenStyle.DashLine, width=2), label='Budget')
-        else:
-            # Aggregate category series with grouping support
-            category_series = {}
-            for proc in checked_procs:
-                # Check if this is a grouped category or original category
-                if selected_category in proc.category_series:
-                    # Direct match - use as is
-                    for week, val in proc.category_series[selected_category].items():
-                        category_series[week] = category_series.get(week, 0) + val
-                else:
-                    # Check if this is a grouped category by looking up original categories
-                    original_cats = self.trends_tab.category_manager.get_original_categories_for_group(selected_category)
-                    for orig_cat in original_cats:
-                        for week, val in proc.category_series.get(orig_cat, {}).items():
-                            category_series[week] = category_series.get(week, 0) + val
-            if not category_series:
-                self.plot_widget.setTitle("No data available.")
-                return
-            weeks = sorted(category_series.keys())
-            values = [category_series[wk] for wk in weeks]
-            week_labels = [wk.strftime('%Y-%m-%d') for wk in weeks]
-            x_vals = list(range(len(weeks)))
-            self.plot_widget.plot(x_vals, values, pen='b', symbol='o', label='User Spending')
-            avg_actual = sum(values) / len(values) if values else 0
-            bls_avg = None
-            if self.bls_comparator and hasattr(self.bls_comparator, 'get_bls_avg_for_user_category'):
-                bls_avg = self.bls_comparator.get_bls_avg_for_user_category(selected_category)
-                if bls_avg is not None:
-                    bls_avg = bls_avg / 52  # Convert annual to weekly
-            if show_bls and bls_avg is not None:
-                self.plot_widget.plot(x_vals, [bls_avg] * len(x_vals), pen=pg.mkPen('r', style=Qt.PenStyle.DashLine, width=2), label='BLS Avg')
-            if show_budget:
-                user_budget = self.get_user_budget(selected_category)
-                if user_budget is not None:
-                    self.plot_widget.plot(x_vals, [user_budget] * len(x_vals), pen=pg.mkPen('g', style=Qt.PenStyle.DashLine, width=2), label='Budget')
-
-        self.plot_widget.setTitle(f"Weekly Trend: {selected_category}")
-        self.plot_widget.setLabel('left', 'Amount ($)')
-        self.plot_widget.setLabel('bottom', 'Week Starting')
-        # Set custom x-axis ticks for week labels
-        ax = self.plot_widget.getAxis('bottom')
-        ax.setTicks([list(zip(x_vals, week_labels))])
-        self.plot_widget.addLegend()
-        self.plot_widget.setXRange(0, len(x_vals)-1, padding=0)
-        self.plot_widget.setYRange(0, max(values) * 1.1, padding=0)
+        week_days = [to_ordinal(wk) for wk in portfolio.week_starts]
+        title = f"{'Daily' if daily else 'Weekly'} Trend: {', '.join(entry.name for entry in series)}"
+        self.trends_tab.show_series(week_days, series, title, daily)
+
+    def bls_weekly_average(self, categories):
+        """
+        Args:
+            categories (list[str]): User categories or groups.
+
+        Returns:
+            float or None: Their combined weekly BLS average, or None if unknown.
+        """
+        if not self.bls_comparator:
+            return None
+        resolved = [self.bls_comparator.resolve(cat).weekly_average for cat in categories]
+        bls_weekly = [value for value in resolved if value is not None]
+        if not bls_weekly or not sum(bls_weekly):
+            return None
+        return sum(bls_weekly)
 
     def get_user_budget(self, category):
-        for i in range(self.budget_table.rowCount()):
-            if self.budget_table.item(i, 0).text() == category:
-                budget_input = self.budget_table.cellWidget(i, 1)
-                try:
-                    return float(budget_input.text())
-                except ValueError:
-                    return None
-        return None
+        return self.budget_values.get(category)
 
     def populate_budget_table(self):
-        checked_procs = [p['processor'] for p in self.processors if p['checked']]
-        if not checked_procs:
+        portfolio = self.portfolio_aggregate
+        if portfolio is None:
             return
 
-        # Aggregate average spending by category
-        avg_by_cat = {}
-        count_by_cat = {}
-        for proc in checked_procs:
-            for cat, avg in proc.average_spending_by_category.items():
-                avg_by_cat[cat] = avg_by_cat.get(cat, 0) + avg
-                count_by_cat[cat] = count_by_cat.get(cat, 0) + 1
-        
-        # Apply category grouping to budget data
-        grouped_avg_by_cat = self.budget_tab.apply_category_grouping_to_budget(avg_by_cat)
-        grouped_count_by_cat = self.budget_tab.apply_category_grouping_to_budget(count_by_cat)
-        
+        # Average weekly spending by category group over the analysis window
+        grouped_avg_by_cat = portfolio.average_by_group
+
         categories = sorted(grouped_avg_by_cat.keys())
         self.budget_table.setRowCount(len(categories))
 
@@ -381,11 +595,13 @@ class BudgetApp(QMainWindow):
             else:
                 budget_input = QLineEdit()
                 budget_input.setText("0")
+                budget_input.editingFinished.connect(self._refresh_budget_values)
                 self.budget_table.setCellWidget(i, 1, budget_input)
 
-            actual = grouped_avg_by_cat[cat] / grouped_count_by_cat[cat] if grouped_count_by_cat[cat] else 0
+            actual = grouped_avg_by_cat[cat]
             self.budget_table.setItem(i, 2, QTableWidgetItem(f"${actual:.2f}"))
             self.budget_table.setItem(i, 3, QTableWidgetItem("-"))
+        self._refresh_budget_values()
 
     def update_budget_comparison(self):
         for i in range(self.budget_table.rowCount()):
@@ -417,27 +633,23 @@ class BudgetApp(QMainWindow):
 
     def set_processor_checked(self, idx, state):
         self.processors[idx]['checked'] = bool(state)
-        self.analyze_spending()
+        self.refresh_scheduler.invalidate(AGGREGATES)
 
     def on_file_selector_changed(self, row, column):
         if column == 0:
             checked = self.file_selector_table.cellWidget(row, 0).isChecked()
             self.processors[row]['checked'] = checked
-            self.analyze_spending()
+            self.refresh_scheduler.invalidate(AGGREGATES)
 
     def update_category_selector(self):
-        checked_procs = [p['processor'] for p in self.processors if p['checked']]
-        categories = set()
-        for proc in checked_procs:
-            categories.update(proc.category_series.keys())
-        
-        # Apply category grouping to the category list
-        grouped_categories = self.trends_tab.get_grouped_categories(list(categories))
-        
+        # Categories after grouping, as rolled up by the portfolio aggregate
+        grouped_categories = self.portfolio_aggregate.groups if self.portfolio_aggregate is not None else []
+
         self.category_selector.clear()
         self.category_selector.addItem("Total Spending")
         for cat in sorted(grouped_categories):
             self.category_selector.addItem(cat)
+        self.trends_tab.set_overlay_categories(["Total Spending"] + sorted(grouped_categories))
 
     def compare_spending(self, user_spending_by_category):
         results = {}
@@ -0,0 +1,118 @@
+from PyQt6.QtCore import QObject, QTimer
+
+# Quiet period after the last invalidation before dirty stages run
+DEFAULT_DELAY_MS = 60
+
+
+class RefreshStage:
+    """
+    One output the scheduler keeps up to date.
+
+    Attributes:
+        name (str): Stage name used with invalidate().
+        callback (callable): Rebuilds the output.
+        inputs (callable or None): Returns a value describing everything the output
+            depends on. The stage is skipped while it equals the value seen at its
+            last run; None means the stage always runs when dirty.
+        ready (callable or None): Returns False while the stage's inputs are still
+            being produced (e.g. by a background worker). A stage that is not ready
+            stays dirty until a later flush.
+        last_inputs (object): Value of inputs() when the stage last ran.
+    """
+
+    _NEVER_RAN = object()
+
+    def __init__(self, name, callback, inputs=None, ready=None):
+        self.name = name
+        self.callback = callback
+        self.inputs = inputs
+        self.ready = ready
+        self.last_inputs = self._NEVER_RAN
+
+
+class RefreshScheduler(QObject):
+    """
+    Coalesces bursts of UI events into at most one run of each output stage.
+
+    Event handlers call invalidate() with the stages their change affects; the
+    scheduler (re)starts a single-shot timer, so a burst of events (clicking
+    through several file checkboxes, a combobox being repopulated) only runs
+    the dirty stages once, in registration order, after the burst settles.
+    Stages whose inputs did not actually change are skipped.
+    """
+
+    def __init__(self, parent=None, delay_ms=DEFAULT_DELAY_MS):
+        """
+        Args:
+            parent (QObject, optional): Owner of the scheduler and its timer.
+            delay_ms (int): Quiet period before dirty stages run.
+        """
+        super().__init__(parent)
+        self._stages = []
+        self._dirty = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def add_stage(self, name, callback, inputs=None, ready=None):
+        """
+        Registers an output stage. Stages run in the order they are added, so a
+        stage should be added after the stages it reads from.
+
+        Args:
+            name (str): Stage name.
+            callback (callable): Rebuilds the output.
+            inputs (callable, optional): Returns the stage's current inputs.
+            ready (callable, optional): Returns False while the inputs are still pending.
+        """
+        self._stages.append(RefreshStage(name, callback, inputs, ready))
+
+    def invalidate(self, *names):
+        """
+        Marks stages dirty and (re)starts the debounce timer.
+
+        Args:
+            *names (str): Stages whose inputs may have changed.
+        """
+        self._dirty.update(names)
+        self._timer.start()
+
+    def mark_clean(self, *names):
+        """
+        Records that stages were brought up to date outside the scheduler.
+
+        Args:
+            *names (str): Stages that just ran.
+        """
+        for stage in self._stages:
+            if stage.name in names:
+                self._dirty.discard(stage.name)
+                if stage.inputs is not None:
+                    stage.last_inputs = stage.inputs()
+
+    def is_dirty(self, name):
+        """
+        Returns:
+            bool: True if the stage is waiting to run.
+        """
+        return name in self._dirty
+
+    def flush(self):
+        """
+        Runs every dirty, ready stage whose inputs changed, in registration order.
+        Stages invalidated by an earlier stage in the same flush run in this pass.
+        """
+        self._timer.stop()
+        for stage in self._stages:
+            if stage.name not in self._dirty:
+                continue
+            if stage.ready is not None and not stage.ready():
+                continue
+            self._dirty.discard(stage.name)
+            if stage.inputs is not None:
+                inputs = stage.inputs()
+                if inputs == stage.last_inputs:
+                    continue
+                stage.last_inputs = inputs
+            stage.callback()
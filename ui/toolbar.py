@@ -24,10 +24,13 @@ class ToolbarWidget(QToolBar):
         toolbar_layout.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
         toolbar_widget.setLayout(toolbar_layout)
 
-        # Left: Load CSV and BLS
+        # Left: Load CSV, folder, refresh and BLS, clear cache
         for text, tip, slot in [
-            ("Load CSV", "Import a bank statement CSV file", self.main_window.load_csv),
-            ("Load BLS", "Import BLS benchmark data (JSON)", self.main_window.load_bls)
+            ("Load CSV", "Import one or more bank statement CSV files", self.main_window.load_csv),
+            ("Load Folder", "Import every bank statement CSV in a folder", self.main_window.load_csv_folder),
+            ("Refresh", "Pick up transactions appended to loaded statement files", self.main_window.refresh_statements),
+            ("Load BLS", "Import BLS/CES benchmark data (JSON or .xlsx workbook)", self.main_window.load_bls),
+            ("Clear Cache", "Delete cached parsed statements", self.main_window.clear_statement_cache)
         ]:
             btn = QPushButton(text)
             btn.setToolTip(tip)
@@ -38,7 +41,7 @@ class ToolbarWidget(QToolBar):
             btn.setSizePolicy(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed)
             toolbar_layout.addWidget(btn)
 
-        # Middle: Analyze button and date range
+        # Middle: Analyze and Cancel buttons and date range
         analyze_button = QPushButton("Analyze")
         analyze_button.setToolTip("Analyze spending for selected files and date range")
         analyze_button.clicked.connect(self.main_window.analyze_spending)
@@ -48,6 +51,14 @@ class ToolbarWidget(QToolBar):
         analyze_button.setSizePolicy(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed)
         toolbar_layout.addWidget(analyze_button)
 
+        cancel_button = QPushButton("Cancel")
+        cancel_button.setToolTip("Stop the import or analysis running in the background")
+        cancel_button.clicked.connect(self.main_window.cancel_background_work)
+        cancel_button.setMinimumHeight(int(fonts['base_size'] * 2.2))
+        cancel_button.setStyleSheet(f"font-size: {fonts['base_size'] + 2}px; padding: 6px 18px;")
+        cancel_button.setSizePolicy(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed)
+        toolbar_layout.addWidget(cancel_button)
+
         self.date_range_label = QLabel()
         self.date_range_label.setStyleSheet(f"font-size: {fonts['base_size']}px; font-weight: 500; margin: 0 {spacing['sm']}px;")
         self.date_range_label.setText("Date Range: Not loaded")
@@ -0,0 +1,102 @@
+import numpy as np
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from budgeting.portfolio import Portfolio
+from budgeting.transaction_store import TransactionStore, from_ordinal
+
+
+class TransactionTableModel(QAbstractTableModel):
+    """
+    Read-only table model over the columnar transaction store.
+
+    The model maps each visible row to a row of the store through an index
+    array and formats a cell only when the view asks for it in data(), so the
+    cost of showing a store does not grow with the number of rows the view
+    never scrolls to. Sorting uses the store's cached sort permutations and
+    filtering its boolean masks, so both are index remaps rather than sorts
+    of Python objects.
+    """
+
+    HEADERS = ["Date", "Category", "Amount"]
+    # Store column sorted by each table column
+    SORT_KEYS = ['day', 'category', 'amount']
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._store = TransactionStore.empty()
+        self._rows = np.empty(0, dtype=np.intp)
+        self._sort_column = 0
+        self._sort_order = Qt.SortOrder.AscendingOrder
+        self._filter = {}
+
+    @property
+    def store(self):
+        """TransactionStore: All transactions the model can show, before filtering."""
+        return self._store
+
+    def set_stores(self, stores):
+        """
+        Shows the transactions of several stores, keeping the current sort and filter.
+
+        Args:
+            stores (list[TransactionStore]): The stores to show.
+        """
+        self.beginResetModel()
+        self._store = Portfolio(stores).merged()
+        self._rows = self._visible_rows()
+        self.endResetModel()
+
+    def set_filter(self, start_day=None, end_day=None, categories=None, min_amount=None, max_amount=None):
+        """
+        Restricts the shown rows; arguments as in TransactionStore.filter_mask.
+        Calling it with no arguments shows every transaction.
+        """
+        self._filter = {
+            'start_day': start_day, 'end_day': end_day, 'categories': categories,
+            'min_amount': min_amount, 'max_amount': max_amount,
+        }
+        self.beginResetModel()
+        self._rows = self._visible_rows()
+        self.endResetModel()
+
+    def _visible_rows(self):
+        """
+        Returns:
+            np.ndarray: Store row of each table row, in sort order with the filter applied.
+        """
+        rows = self._store.sort_permutation(self.SORT_KEYS[self._sort_column])
+        if self._sort_order == Qt.SortOrder.DescendingOrder:
+            rows = rows[::-1]
+        if any(value is not None for value in self._filter.values()):
+            rows = rows[self._store.filter_mask(**self._filter)[rows]]
+        return rows
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.beginResetModel()
+        self._sort_column = column
+        self._sort_order = order
+        self._rows = self._visible_rows()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else int(self._rows.size)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+        if column == 0:
+            return from_ordinal(self._store.days[row]).strftime("%Y-%m-%d")
+        if column == 1:
+            return self._store.categories[self._store.category_codes[row]]
+        return f"${self._store.amounts[row]:.2f}"
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return str(section + 1)
@@ -1,12 +1,19 @@
-from PyQt6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QTableWidget, QGroupBox, QSizePolicy, QSplitter, QLabel
+from PyQt6.QtWidgets import (
+    QWidget, QHBoxLayout, QVBoxLayout, QTableWidget, QTableView, QGroupBox, QSizePolicy, QSplitter, QLabel,
+    QComboBox, QLineEdit
+)
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QHeaderView
 from .style_guide import spacing, fonts
+from .lazy_tab import LazyTabMixin
+from .transaction_table_model import TransactionTableModel
 
-class TransactionsTab(QWidget):
+class TransactionsTab(QWidget, LazyTabMixin):
     """
     Tab for managing and displaying transaction data and file selection in the budgeting app.
     """
+    ALL_CATEGORIES = "All Categories"
+
     def __init__(self, main_window):
         """
         Initialize the TransactionsTab with file selector and transactions tables.
@@ -15,6 +22,7 @@ class TransactionsTab(QWidget):
         """
         super().__init__()
         self.main_window = main_window
+        self.init_lazy_refresh(main_window.update_transaction_table)
 
         splitter = QSplitter(Qt.Orientation.Horizontal)
         splitter.setHandleWidth(8)
@@ -68,9 +76,32 @@ class TransactionsTab(QWidget):
         trans_table_layout = QVBoxLayout()
         trans_table_layout.setContentsMargins(0, 0, 0, 0)
         trans_table_layout.setSpacing(spacing['sm'])
-        self.trans_table = QTableWidget()
-        self.trans_table.setColumnCount(3)
-        self.trans_table.setHorizontalHeaderLabels(["Date", "Category", "Amount"])
+
+        # Filter controls for the transactions table
+        filter_layout = QHBoxLayout()
+        filter_layout.setSpacing(spacing['sm'])
+        self.category_filter = QComboBox()
+        self.category_filter.addItem(self.ALL_CATEGORIES)
+        self.category_filter.setToolTip("Show only transactions in this category")
+        self.category_filter.currentIndexChanged.connect(self.apply_filter)
+        filter_layout.addWidget(self.category_filter, stretch=1)
+        self.min_amount_filter = QLineEdit()
+        self.min_amount_filter.setPlaceholderText("Min amount")
+        self.min_amount_filter.editingFinished.connect(self.apply_filter)
+        filter_layout.addWidget(self.min_amount_filter)
+        self.max_amount_filter = QLineEdit()
+        self.max_amount_filter.setPlaceholderText("Max amount")
+        self.max_amount_filter.editingFinished.connect(self.apply_filter)
+        filter_layout.addWidget(self.max_amount_filter)
+        trans_table_layout.addLayout(filter_layout)
+
+        # Virtual table: cells are formatted on demand from the transaction store
+        self.trans_model = TransactionTableModel(self)
+        self.trans_table = QTableView()
+        self.trans_table.setModel(self.trans_model)
+        self.trans_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.trans_table.setSortingEnabled(True)
+        self.trans_table.sortByColumn(0, Qt.SortOrder.AscendingOrder)
         self.trans_table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.trans_table.setMinimumHeight(400)
         self.trans_table.setMinimumWidth(500)
@@ -80,7 +111,9 @@ class TransactionsTab(QWidget):
         self.trans_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
         self.trans_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
         self.trans_table.verticalHeader().setDefaultSectionSize(47)
-        self.trans_table.setStyleSheet("QTableWidget { border-bottom: 1.5px solid #4A90E2; } QTableWidget::item { padding: 8px 6px; }")
+        # Uniform row heights, so the view never measures individual rows
+        self.trans_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.trans_table.setStyleSheet("QTableView { border-bottom: 1.5px solid #4A90E2; } QTableView::item { padding: 8px 6px; }")
         trans_table_container = QWidget()
         trans_table_container_layout = QVBoxLayout()
         trans_table_container_layout.setContentsMargins(0, 0, 0, 0)
@@ -131,5 +164,43 @@ class TransactionsTab(QWidget):
         for col in range(self.file_selector_table.columnCount()):
             self.file_selector_table.horizontalHeader().setSectionResizeMode(col, self.file_selector_table.horizontalHeader().ResizeMode.Stretch)
         self.trans_table.horizontalHeader().setSectionResizeMode(self.trans_table.horizontalHeader().ResizeMode.Stretch)
-        for col in range(self.trans_table.columnCount()):
-            self.trans_table.horizontalHeader().setSectionResizeMode(col, self.trans_table.horizontalHeader().ResizeMode.Stretch)
\ No newline at end of file
+        for col in range(self.trans_model.columnCount()):
+            self.trans_table.horizontalHeader().setSectionResizeMode(col, self.trans_table.horizontalHeader().ResizeMode.Stretch)
+
+    def set_transactions(self, stores):
+        """
+        Shows the transactions of the given stores and offers their categories in the filter.
+
+        Args:
+            stores (list[TransactionStore]): Stores of the checked files.
+        """
+        self.trans_model.set_stores(stores)
+        selected = self.category_filter.currentText()
+        self.category_filter.blockSignals(True)
+        self.category_filter.clear()
+        self.category_filter.addItem(self.ALL_CATEGORIES)
+        self.category_filter.addItems(sorted(self.trans_model.store.categories))
+        index = self.category_filter.findText(selected)
+        self.category_filter.setCurrentIndex(max(index, 0))
+        self.category_filter.blockSignals(False)
+        self.apply_filter()
+
+    def apply_filter(self):
+        """Applies the category and amount filters to the transactions table."""
+        category = self.category_filter.currentText()
+        self.trans_model.set_filter(
+            categories=None if category == self.ALL_CATEGORIES else [category],
+            min_amount=self._parse_amount(self.min_amount_filter),
+            max_amount=self._parse_amount(self.max_amount_filter),
+        )
+
+    @staticmethod
+    def _parse_amount(line_edit):
+        """
+        Returns:
+            float or None: The amount typed in the field, or None if it is empty or invalid.
+        """
+        try:
+            return float(line_edit.text().replace("$", "").replace(",", ""))
+        except ValueError:
+            return None
\ No newline at end of file
@@ -1,11 +1,62 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QCheckBox, QSizePolicy
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QCheckBox, QSizePolicy, QToolButton, QMenu
+from PyQt6.QtCore import Qt
+import numpy as np
 import pyqtgraph as pg
 from .style_guide import spacing, fonts, colors
 from budgeting.category_manager import CategoryManager
+from budgeting.lod_pyramid import to_timestamp, from_timestamp
+from .lazy_tab import LazyTabMixin
 
-class TrendsTab(QWidget):
+# Colors of successive overlaid series; the first matches the original single-series plot
+SERIES_COLORS = ['b', 'm', 'c', (255, 140, 0), (128, 0, 128), (0, 128, 128)]
+# Series longer than this are drawn without per-point symbols
+MAX_SYMBOL_POINTS = 200
+# Most pyramid buckets drawn per series across the visible date range in daily mode
+MAX_DAILY_BUCKETS = 800
+WEEKLY = "Weekly"
+DAILY = "Daily"
+# Bottom axis label in daily mode for each pyramid level
+LEVEL_LABELS = {
+    'day': 'Date (daily spending)',
+    'week': 'Date (average per day, by week)',
+    'month': 'Date (average per day, by month)',
+    'quarter': 'Date (average per day, by quarter)',
+}
+
+
+class TrendSeries:
+    """
+    One category's spending and its reference lines, as drawn by TrendsTab.
+
+    Attributes:
+        name (str): Category or group name.
+        values (np.ndarray or list): Spending per week.
+        bls_weekly (float or None): Weekly BLS average to draw, or None to hide the line.
+        budget (float or None): Weekly budget to draw, or None to hide the line.
+        pyramid (SpendingPyramid or None): Daily spending, required in daily mode.
+    """
+
+    def __init__(self, name, values, bls_weekly=None, budget=None, pyramid=None):
+        self.name = name
+        self.values = values
+        self.bls_weekly = bls_weekly
+        self.budget = budget
+        self.pyramid = pyramid
+
+
+class TrendsTab(QWidget, LazyTabMixin):
     """
     Tab for displaying spending trends and controls for category and comparison toggles.
+
+    The plot keeps one set of PlotDataItems per displayed series and updates
+    them in place with setData, so changing the category or a toggle redraws
+    the existing curves instead of rebuilding the scene.
+
+    In daily mode each series is drawn from its level-of-detail pyramid: on
+    every pan or zoom the finest level that fits the visible date range in
+    MAX_DAILY_BUCKETS buckets is chosen, so the number of drawn points stays
+    bounded whether the view spans a month or ten years. Coarser levels show
+    the average per day and shade the daily min/max range of each bucket.
     """
     def __init__(self, main_window):
         """
@@ -17,6 +68,7 @@ class TrendsTab(QWidget):
         super().__init__()
         self.main_window = main_window
         self.category_manager = CategoryManager()
+        self.init_lazy_refresh(self.rebuild_plot)
         self.layout = QVBoxLayout()
         self.layout.setContentsMargins(spacing['md'], spacing['md'], spacing['md'], spacing['md'])
         self.layout.setSpacing(spacing['md'])
@@ -28,31 +80,223 @@ class TrendsTab(QWidget):
         self.category_selector.setToolTip("Select a category to view its trend")
         self.category_selector.setMinimumWidth(spacing['xl'] * 2)
         self.category_selector.setMinimumHeight(fonts['base_size'] * 2)
-        self.category_selector.currentIndexChanged.connect(self.main_window.update_trend_plot)
+        self.category_selector.currentIndexChanged.connect(self.main_window.on_trend_controls_changed)
         controls_layout.addWidget(self.category_selector)
+        self.overlay_button = QToolButton()
+        self.overlay_button.setText("Overlay")
+        self.overlay_button.setToolTip("Plot additional categories on top of the selected one")
+        self.overlay_button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
+        self.overlay_button.setMinimumHeight(fonts['base_size'] * 2)
+        self.overlay_menu = QMenu(self.overlay_button)
+        self.overlay_button.setMenu(self.overlay_menu)
+        controls_layout.addWidget(self.overlay_button)
+        self.resolution_selector = QComboBox()
+        self.resolution_selector.addItems([WEEKLY, DAILY])
+        self.resolution_selector.setToolTip("Plot weekly totals, or daily spending that adapts to the zoom level")
+        self.resolution_selector.setMinimumHeight(fonts['base_size'] * 2)
+        self.resolution_selector.currentIndexChanged.connect(self.main_window.on_trend_controls_changed)
+        controls_layout.addWidget(self.resolution_selector)
         self.show_budget_checkbox = QCheckBox("Show Budget")
         self.show_budget_checkbox.setChecked(True)
         self.show_budget_checkbox.setToolTip("Show your budget line on the plot")
         self.show_budget_checkbox.setMinimumHeight(fonts['base_size'] * 2)
-        self.show_budget_checkbox.stateChanged.connect(self.main_window.update_trend_plot)
+        self.show_budget_checkbox.stateChanged.connect(self.main_window.on_trend_controls_changed)
         controls_layout.addWidget(self.show_budget_checkbox)
         self.show_bls_checkbox = QCheckBox("Show BLS Avg")
         self.show_bls_checkbox.setChecked(True)
         self.show_bls_checkbox.setToolTip("Show BLS average line on the plot")
         self.show_bls_checkbox.setMinimumHeight(fonts['base_size'] * 2)
-        self.show_bls_checkbox.stateChanged.connect(self.main_window.update_trend_plot)
+        self.show_bls_checkbox.stateChanged.connect(self.main_window.on_trend_controls_changed)
         controls_layout.addWidget(self.show_bls_checkbox)
         controls_layout.addStretch(1)
         self.layout.addLayout(controls_layout)
 
-        self.plot_widget = pg.PlotWidget()
+        self.plot_widget = pg.PlotWidget(axisItems={'bottom': pg.DateAxisItem(orientation='bottom', utcOffset=0)})
         self.plot_widget.setBackground(colors['background'])
         self.plot_widget.showGrid(x=True, y=True)
         self.plot_widget.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.plot_widget.setMinimumHeight(spacing['xl'] * 2)
+        self.plot_widget.setLabel('left', 'Amount ($)')
+        self.plot_widget.setLabel('bottom', 'Week Starting')
+        # Only draw the visible part of long series, reduced to per-pixel peaks
+        plot_item = self.plot_widget.getPlotItem()
+        plot_item.setClipToView(True)
+        plot_item.setDownsampling(auto=True, mode='peak')
+        self.legend = self.plot_widget.addLegend()
+        self._series_items = []  # (curve, BLS line, budget line) per series slot
+        self._envelopes = []  # (lower, upper, fill) per series slot, daily mode only
+        self._daily_series = []
+        self._rendering = False
+        plot_item.getViewBox().sigXRangeChanged.connect(self._on_x_range_changed)
         self.layout.addWidget(self.plot_widget, stretch=1)
         self.setLayout(self.layout)
     
+    def rebuild_plot(self):
+        """Redraws the trend plot, first bringing the budget values it reads up to date."""
+        self.main_window.budget_tab.refresh()
+        self.main_window.update_trend_plot()
+
+    def set_overlay_categories(self, categories):
+        """
+        Offers categories in the overlay menu, keeping the ones still available checked.
+
+        Args:
+            categories (list[str]): Category or group names, in display order.
+        """
+        checked = set(self.overlay_categories())
+        self.overlay_menu.clear()
+        for category in categories:
+            action = self.overlay_menu.addAction(category)
+            action.setCheckable(True)
+            action.setChecked(category in checked)
+            action.toggled.connect(self.main_window.on_trend_controls_changed)
+
+    def is_daily(self):
+        """
+        Returns:
+            bool: True if the plot shows daily spending rather than weekly totals.
+        """
+        return self.resolution_selector.currentText() == DAILY
+
+    def overlay_categories(self):
+        """
+        Returns:
+            list[str]: Categories checked in the overlay menu.
+        """
+        return [action.text() for action in self.overlay_menu.actions() if action.isChecked()]
+
+    def _series_slot(self, index):
+        """
+        Returns the persistent plot items of a series slot, creating them on first use.
+
+        Returns:
+            tuple[PlotDataItem, PlotDataItem, PlotDataItem]: The curve, BLS line and budget line.
+        """
+        while len(self._series_items) <= index:
+            color = SERIES_COLORS[len(self._series_items) % len(SERIES_COLORS)]
+            curve = pg.PlotDataItem(pen=pg.mkPen(color))
+            bls_line = pg.PlotDataItem(pen=pg.mkPen('r' if not self._series_items else color, style=Qt.PenStyle.DashLine, width=2))
+            budget_line = pg.PlotDataItem(pen=pg.mkPen('g' if not self._series_items else color, style=Qt.PenStyle.DashLine, width=2))
+            for item in (curve, bls_line, budget_line):
+                self.plot_widget.addItem(item)
+            self._series_items.append((curve, bls_line, budget_line))
+            lower = pg.PlotDataItem(pen=None)
+            upper = pg.PlotDataItem(pen=None)
+            fill = pg.FillBetweenItem(lower, upper, brush=pg.mkBrush(color).color().lighter(170))
+            fill.setZValue(-1)
+            self.plot_widget.addItem(fill)
+            self._envelopes.append((lower, upper, fill))
+        return self._series_items[index]
+
+    def show_series(self, week_days, series, title, daily=False):
+        """
+        Updates the plot to show the given series, reusing existing plot items.
+
+        Args:
+            week_days (list[int]): Day ordinal on which each week starts.
+            series (list[TrendSeries]): Series to draw; the first is the selected category.
+            title (str): Plot title.
+            daily (bool): Draw each series' daily pyramid instead of its weekly values.
+        """
+        self.legend.clear()
+        self._daily_series = []
+        if not series or not len(week_days):
+            self._hide_slots(0)
+            self.plot_widget.setTitle("No data available.")
+            return
+
+        x_vals = to_timestamp(week_days)
+        if daily:
+            start_day = series[0].pyramid.start_day
+            end_day = start_day + int(series[0].pyramid.levels[0].lengths.sum()) - 1
+            line_x = to_timestamp([start_day, end_day + 1])
+        else:
+            line_x = [x_vals[0], x_vals[-1]]
+        symbol = 'o' if len(week_days) <= MAX_SYMBOL_POINTS and not daily else None
+        overlay = len(series) > 1
+        # Reference lines are weekly amounts; daily mode plots spending per day
+        scale = 1 / 7 if daily else 1
+        y_max = 0
+        for index, entry in enumerate(series):
+            curve, bls_line, budget_line = self._series_slot(index)
+            color = SERIES_COLORS[index % len(SERIES_COLORS)]
+            if daily:
+                curve.setData([], [], symbol=None)
+            else:
+                values = np.asarray(entry.values, dtype=float)
+                curve.setData(x_vals, values, symbol=symbol, symbolBrush=color, symbolPen=color)
+                y_max = max(y_max, float(values.max()) if values.size else 0)
+                for item in self._envelopes[index]:
+                    item.setVisible(False)
+            curve.setVisible(True)
+            self.legend.addItem(curve, entry.name if overlay else 'User Spending')
+            for line, value, label in ((bls_line, entry.bls_weekly, 'BLS Avg'), (budget_line, entry.budget, 'Budget')):
+                line.setVisible(value is not None)
+                if value is not None:
+                    line.setData(line_x, [value * scale, value * scale])
+                    self.legend.addItem(line, f"{entry.name} {label}" if overlay else label)
+                    y_max = max(y_max, value * scale)
+        self._hide_slots(len(series))
+
+        self.plot_widget.setTitle(title)
+        if daily:
+            self._daily_series = series
+            self._reference_max = y_max
+            self._rendering = True
+            self.plot_widget.setXRange(line_x[0], line_x[1], padding=0)
+            self._rendering = False
+            self._render_daily()
+        else:
+            self.plot_widget.setLabel('bottom', 'Week Starting')
+            self.plot_widget.setXRange(x_vals[0], x_vals[-1], padding=0)
+            self.plot_widget.setYRange(0, (y_max or 1) * 1.1, padding=0)
+
+    def _hide_slots(self, first):
+        """Hides the plot items of every series slot from `first` on."""
+        for items, envelope in zip(self._series_items[first:], self._envelopes[first:]):
+            for item in items + envelope:
+                item.setVisible(False)
+
+    def _on_x_range_changed(self, view_box, x_range):
+        """Re-picks the pyramid level of the daily series after a pan or zoom."""
+        if self._daily_series and not self._rendering:
+            self._render_daily()
+
+    def _render_daily(self):
+        """
+        Draws each daily series from the pyramid level that fits the visible range,
+        with one bucket of margin on each side so the curve reaches the plot edges.
+        """
+        x_min, x_max = self.plot_widget.getPlotItem().getViewBox().viewRange()[0]
+        start_day = from_timestamp(x_min)
+        end_day = from_timestamp(x_max)
+        y_max = self._reference_max
+        level_name = None
+        self._rendering = True
+        for index, entry in enumerate(self._daily_series):
+            curve = self._series_items[index][0]
+            lower, upper, fill = self._envelopes[index]
+            level = entry.pyramid.level_for(start_day, end_day, MAX_DAILY_BUCKETS)
+            level_name = level_name or level.name
+            lo, hi = level.bounds(start_day, end_day)
+            lo, hi = max(lo - 1, 0), min(hi + 1, len(level))
+            lengths = level.lengths[lo:hi]
+            # Each bucket is drawn at its midpoint; a day is drawn at its own timestamp
+            x_vals = to_timestamp(level.starts[lo:hi] + (lengths - 1) / 2)
+            means = level.sums[lo:hi] / lengths
+            curve.setData(x_vals, means)
+            show_envelope = level.name != 'day'
+            for item in (lower, upper, fill):
+                item.setVisible(show_envelope)
+            if show_envelope:
+                lower.setData(x_vals, level.mins[lo:hi])
+                upper.setData(x_vals, level.maxs[lo:hi])
+            peaks = level.maxs[lo:hi] if show_envelope else means
+            y_max = max(y_max, float(peaks.max()) if peaks.size else 0)
+        self.plot_widget.setLabel('bottom', LEVEL_LABELS.get(level_name, 'Date'))
+        self.plot_widget.setYRange(0, (y_max or 1) * 1.1, padding=0)
+        self._rendering = False
+
     def apply_category_grouping_to_trends(self, categories_data):
         """Apply category grouping to trends data"""
         return self.category_manager.apply_grouping_to_data(categories_data)
@@ -0,0 +1,255 @@
+import threading
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from budgeting.csv_ingestion import IngestCancelled
+from budgeting.deduplication import find_duplicates
+from budgeting.parallel_ingestion import load_processors
+from budgeting.portfolio import PortfolioAggregate
+
+
+class WorkerSignals(QObject):
+    """
+    Signals a background worker uses to talk to the GUI thread.
+
+    Signals are emitted from the worker thread and delivered through queued
+    connections, so connected slots always run on the GUI thread.
+
+    Signals:
+        progress (str): Human-readable progress, e.g. for the status bar.
+        finished (object): The worker's immutable result.
+        failed (str): Error message if the worker raised.
+        cancelled (): Emitted instead of finished when the worker was cancelled.
+    """
+    progress = pyqtSignal(str)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class CancellableWorker(QRunnable):
+    """
+    Base class for QThreadPool workers that can be cancelled cooperatively.
+
+    Subclasses implement work(), calling check_cancelled() between steps. The
+    worker only computes; everything it hands back goes through
+    signals.finished and is applied by the GUI thread.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.signals = WorkerSignals()
+        self._cancel_event = threading.Event()
+        # The Python wrapper owns the signals object, so keep it alive after run().
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        """Asks the worker to stop at its next cancellation check."""
+        self._cancel_event.set()
+
+    @property
+    def is_cancelled(self):
+        """bool: True once cancel() has been called."""
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        """
+        Raises:
+            IngestCancelled: If the worker has been cancelled.
+        """
+        if self._cancel_event.is_set():
+            raise IngestCancelled()
+
+    def work(self):
+        """
+        Performs the background task.
+
+        Returns:
+            object: The result emitted through signals.finished.
+        """
+        raise NotImplementedError("Subclasses must implement work()")
+
+    def run(self):
+        try:
+            result = self.work()
+        except IngestCancelled:
+            self.signals.cancelled.emit()
+            return
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        if self.is_cancelled:
+            self.signals.cancelled.emit()
+        else:
+            self.signals.finished.emit(result)
+
+
+class ImportResult:
+    """
+    Outcome of an IngestWorker.
+
+    Attributes:
+        processors (list[BankActProc]): One processor per imported file.
+        failures (list[tuple[str, Exception]]): (path, error) for files that failed to load.
+    """
+
+    def __init__(self, processors, failures):
+        self.processors = processors
+        self.failures = failures
+
+
+class IngestWorker(CancellableWorker):
+    """
+    Parses statement files off the GUI thread and builds their processors.
+    """
+
+    def __init__(self, paths, bls_comparator=None):
+        """
+        Args:
+            paths (str or list[str]): CSV files and/or a directory of CSV files.
+            bls_comparator (optional): Comparator handed to each processor.
+        """
+        super().__init__()
+        self.paths = paths
+        self.bls_comparator = bls_comparator
+
+    def _report(self, files_done, total_files, rows_read):
+        self.check_cancelled()
+        self.signals.progress.emit(f"Importing: {rows_read:,} rows parsed ({files_done}/{total_files} files)")
+
+    def work(self):
+        processors, failures = load_processors(self.paths, bls_comparator=self.bls_comparator, progress=self._report)
+        return ImportResult(processors, failures)
+
+
+class RefreshResult:
+    """
+    Outcome of a RefreshWorker.
+
+    Attributes:
+        updates (list[tuple[BankActProc, StatementUpdate or None]]): Per refreshed
+            processor, the update to install with apply_refresh.
+        failures (list[tuple[str, Exception]]): (path, error) for files that could not be read.
+    """
+
+    def __init__(self, updates, failures):
+        self.updates = updates
+        self.failures = failures
+
+
+class RefreshWorker(CancellableWorker):
+    """
+    Reads and parses what changed in loaded statement files off the GUI thread.
+
+    Processors are only read here; the updates are installed by the GUI thread
+    when the result arrives.
+    """
+
+    def __init__(self, processors):
+        """
+        Args:
+            processors (list[BankActProc]): Processors whose files to re-read.
+        """
+        super().__init__()
+        self.processors = list(processors)
+
+    def work(self):
+        updates = []
+        failures = []
+        total = len(self.processors)
+        for index, proc in enumerate(self.processors):
+            self.check_cancelled()
+            self.signals.progress.emit(f"Refreshing: {index}/{total} files")
+            try:
+                update = proc.read_refresh(on_chunk=lambda rows: self.check_cancelled())
+            except IngestCancelled:
+                raise
+            except Exception as e:
+                failures.append((proc.file_name, e))
+                continue
+            updates.append((proc, update))
+        return RefreshResult(updates, failures)
+
+
+class AnalysisBatch:
+    """
+    Outcome of an AnalysisWorker, applied to the processors on the GUI thread.
+
+    Attributes:
+        processors (list[BankActProc]): The analyzed processors, in selector order.
+        start_date (datetime): First day of the analysis window.
+        end_date (datetime): Last day of the analysis window.
+        report (DeduplicationReport): Duplicates dropped per processor.
+        dedup_key (tuple): Content hashes the report was computed for.
+        views (list[tuple or None]): Per processor, (keep, store) to install
+            with set_view, or None if its current view already matches.
+        results (list[AnalysisResult or None]): Per processor, the analysis result.
+        portfolio (PortfolioAggregate): The results merged across processors.
+    """
+
+    def __init__(self, processors, start_date, end_date, report, dedup_key, views, results, portfolio):
+        self.processors = processors
+        self.start_date = start_date
+        self.end_date = end_date
+        self.report = report
+        self.dedup_key = dedup_key
+        self.views = views
+        self.results = results
+        self.portfolio = portfolio
+
+
+class AnalysisWorker(CancellableWorker):
+    """
+    De-duplicates and analyzes the checked statements off the GUI thread.
+
+    Processors are only read here; filtered views and analysis results are
+    built as new objects and installed by the GUI thread when the batch arrives.
+    """
+
+    def __init__(self, processors, start_date, end_date, cache=None, group_version=0, report=None, dedup_key=None,
+                 group_mapping=None):
+        """
+        Args:
+            processors (list[BankActProc]): Processors to analyze, in selector order.
+            start_date (datetime): First day of the analysis window.
+            end_date (datetime): Last day of the analysis window.
+            cache (AnalysisCache, optional): Shared cache of immutable analysis results.
+            group_version (int): Version of the category grouping, part of the cache key.
+            report (DeduplicationReport, optional): A report to reuse for these processors.
+            dedup_key (tuple, optional): Content hashes `report` was computed for.
+            group_mapping (dict, optional): Category -> group name for the portfolio rollups.
+        """
+        super().__init__()
+        self.processors = list(processors)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.cache = cache
+        self.group_version = group_version
+        self.report = report
+        self.dedup_key = dedup_key
+        self.group_mapping = dict(group_mapping or {})
+
+    def work(self):
+        processors = self.processors
+        key = tuple(proc.source_store.content_hash() for proc in processors)
+        report = self.report
+        if report is None or key != self.dedup_key:
+            self.signals.progress.emit("Finding duplicate transactions...")
+            report = find_duplicates([proc.source_store for proc in processors])
+
+        views = []
+        results = []
+        stores = []
+        weeks = 0
+        for index, (proc, keep) in enumerate(zip(processors, report.keep_masks), 1):
+            self.check_cancelled()
+            view = None if proc.view_matches(keep) else (keep, proc.duplicate_view(keep))
+            store = view[1] if view is not None else proc.store
+            result = proc.compute_analysis(self.start_date, self.end_date, self.cache, self.group_version, store=store)
+            views.append(view)
+            results.append(result)
+            stores.append(store)
+            if result is not None:
+                weeks += result.aggregate.num_weeks
+            self.signals.progress.emit(f"Analyzing: {weeks:,} weeks aggregated ({index}/{len(processors)} files)")
+        self.check_cancelled()
+        portfolio = PortfolioAggregate(results, self.group_mapping, stores)
+        return AnalysisBatch(processors, self.start_date, self.end_date, report, key, views, results, portfolio)
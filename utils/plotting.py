@@ -35,9 +35,9 @@ def plot_spending_summary(proc):
         avg = proc.average_spending_by_category.get(category, 0)
         axs[idx].axhline(y=avg, color='red', linestyle='--', label='User Avg')
         if proc.bls_comparator:
-            bls_avg = proc.bls_comparator.get_bls_avg_for_user_category(category)
-            if bls_avg:
-                axs[idx].axhline(y=bls_avg / 52, color='green', linestyle=':', label='BLS Avg')
+            bls_weekly = proc.bls_comparator.resolve(category).weekly_average
+            if bls_weekly:
+                axs[idx].axhline(y=bls_weekly, color='green', linestyle=':', label='BLS Avg')
         axs[idx].set_title(f"Weekly Spending - {category}")
         axs[idx].set_xlabel("Week Start")
         axs[idx].set_ylabel("Spending ($)")